@@ -0,0 +1,453 @@
+"""
+Deep Blue Pool Chemistry - Alert Store
+Copyright (c) 2024 Michael Hayes. All rights reserved.
+
+This module keeps alert history in two tiers. The hot tier (alerts.json
+plus a JSONL journal) holds recent and unresolved alerts in memory,
+indexed by alert_id with secondary indexes by pool, status and severity.
+New alerts and status changes are appended to the journal as small
+records; alerts.json is only rewritten on compaction.
+
+On compaction, closed alerts older than hot_days move to the cold tier:
+gzip-compressed monthly JSONL segments (alerts_archive/YYYY-MM.jsonl.gz),
+keyed by the month of the alert's timestamp. Range queries read only the
+segments whose month overlaps the requested window.
+"""
+
+import gzip
+import json
+import os
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from data_manager import normalize_timestamp
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+INDEXED_FIELDS = ('pool_id', 'status', 'severity')
+OPEN_STATUSES = ('unacknowledged', 'snoozed')
+
+
+def alert_time(alert: Dict[str, Any]) -> Optional[datetime]:
+    """Parse an alert's timestamp, or None if it has no usable timestamp."""
+    try:
+        return datetime.fromisoformat(normalize_timestamp(alert))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_open(alert: Dict[str, Any]) -> bool:
+    """An alert stays in the hot tier while it still needs attention."""
+    return (not alert.get('resolved') and not alert.get('dismissed')
+            and alert.get('status', 'unacknowledged') in OPEN_STATUSES)
+
+
+class AlertStore:
+    """
+    Indexed hot alert tier (snapshot plus journal) over compressed monthly archives.
+    """
+
+    def __init__(self, snapshot_path, journal_path=None, archive_dir=None,
+                 hot_days: int = 30, max_hot: int = 1000, compact_threshold: int = 500):
+        """
+        Initialize the alert store.
+
+        Args:
+            snapshot_path: Path to the alerts.json snapshot
+            journal_path: Path to the JSONL journal (defaults to <snapshot>.journal.jsonl)
+            archive_dir: Directory for monthly archive segments (defaults to alerts_archive/)
+            hot_days: Closed alerts older than this many days are archived on compaction
+            max_hot: Hot tier size above which adding alerts triggers compaction
+            compact_threshold: Journal size (records) at which load() compacts automatically;
+                               above max_hot, also how much the hot tier must grow between
+                               compactions (open alerts never archive, so it can stay large)
+        """
+        self.snapshot_path = Path(snapshot_path)
+        if journal_path is None:
+            journal_path = self.snapshot_path.with_name(self.snapshot_path.stem + ".journal.jsonl")
+        self.journal_path = Path(journal_path)
+        if archive_dir is None:
+            archive_dir = self.snapshot_path.with_name("alerts_archive")
+        self.archive_dir = Path(archive_dir)
+        self.hot_days = hot_days
+        self.max_hot = max_hot
+        self.compact_threshold = compact_threshold
+        self.pending = 0
+        # Hot tier size after the last compaction (or load)
+        self._compacted_size = 0
+        self._clear()
+
+    def _clear(self):
+        self._alerts: Dict[str, Dict[str, Any]] = {}
+        self._seq: Dict[str, int] = {}
+        self._next_seq = 0
+        self._index: Dict[str, Dict[Any, Set[str]]] = {field: {} for field in INDEXED_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self._alerts)
+
+    # ==================== INDEXES ====================
+
+    def _index_alert(self, alert: Dict[str, Any]):
+        alert_id = alert['alert_id']
+        for field in INDEXED_FIELDS:
+            self._index[field].setdefault(alert.get(field), set()).add(alert_id)
+
+    def _unindex_alert(self, alert: Dict[str, Any]):
+        alert_id = alert['alert_id']
+        for field in INDEXED_FIELDS:
+            ids = self._index[field].get(alert.get(field))
+            if ids is not None:
+                ids.discard(alert_id)
+                if not ids:
+                    del self._index[field][alert.get(field)]
+
+    def _insert(self, alert: Dict[str, Any]):
+        previous = self._alerts.pop(alert['alert_id'], None)
+        if previous is not None:
+            self._unindex_alert(previous)
+        self._alerts[alert['alert_id']] = alert
+        self._seq[alert['alert_id']] = self._next_seq
+        self._next_seq += 1
+        self._index_alert(alert)
+
+    def _remove(self, alert_id: str):
+        self._unindex_alert(self._alerts.pop(alert_id))
+        del self._seq[alert_id]
+
+    def _apply_update(self, alert_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        alert = self._alerts.get(alert_id)
+        if alert is None:
+            return None
+        self._unindex_alert(alert)
+        alert.update(changes)
+        self._index_alert(alert)
+        return alert
+
+    # ==================== LOADING ====================
+
+    def load(self) -> int:
+        """
+        Load the snapshot, replay the journal and rebuild the indexes.
+
+        Returns:
+            Number of alerts loaded
+        """
+        self._clear()
+        for alert in self._read_snapshot():
+            self._insert(alert)
+
+        replayed = 0
+        for record in self._read_journal():
+            op = record.get('op')
+            if op == 'add' and isinstance(record.get('alert'), dict):
+                self._insert(record['alert'])
+            elif op == 'update':
+                self._apply_update(record.get('alert_id'), record.get('changes', {}))
+            else:
+                continue
+            replayed += 1
+        self.pending = replayed
+
+        self._compacted_size = len(self._alerts)
+        if self.pending >= self.compact_threshold:
+            self.compact()
+
+        logger.info(f"Loaded {len(self._alerts)} alerts ({replayed} journal records replayed)")
+        return len(self._alerts)
+
+    def _read_snapshot(self) -> List[Dict[str, Any]]:
+        """Read alerts.json, accepting a list, an {'alerts': [...]} document or a pool-keyed dict."""
+        if not self.snapshot_path.exists():
+            return []
+        try:
+            with open(self.snapshot_path, 'r') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, PermissionError, IOError) as e:
+            logger.error(f"Error reading alerts snapshot {self.snapshot_path}: {e}")
+            return []
+
+        if isinstance(data, dict):
+            if 'alerts' in data:
+                data = data['alerts']
+            else:
+                # Older layout keyed by pool_id
+                alerts = []
+                for pool_id, pool_alerts in data.items():
+                    if isinstance(pool_alerts, list):
+                        for alert in pool_alerts:
+                            if isinstance(alert, dict):
+                                alert.setdefault('pool_id', pool_id)
+                                alerts.append(alert)
+                data = alerts
+        if not isinstance(data, list):
+            return []
+        return [a for a in data if isinstance(a, dict) and a.get('alert_id')]
+
+    def _read_journal(self) -> List[Dict[str, Any]]:
+        """Read journal records, ignoring a torn final line from an interrupted write."""
+        if not self.journal_path.exists():
+            return []
+
+        records = []
+        with open(self.journal_path, 'r') as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping corrupt journal record at {self.journal_path}:{line_no}")
+                    continue
+                if isinstance(record, dict):
+                    records.append(record)
+        return records
+
+    # ==================== QUERIES ====================
+
+    def get(self, alert_id: str) -> Optional[Dict[str, Any]]:
+        """Return an alert by id."""
+        return self._alerts.get(alert_id)
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Return every hot alert, oldest first."""
+        return list(self._alerts.values())
+
+    def find(self, pool_id: Optional[str] = None, status: Optional[str] = None,
+             severity: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Return hot alerts matching every given field, using the secondary indexes.
+
+        Args:
+            pool_id: Restrict to one pool
+            status: Restrict to one status
+            severity: Restrict to one severity level
+
+        Returns:
+            Matching alerts, oldest first
+        """
+        criteria = {'pool_id': pool_id, 'status': status, 'severity': severity}
+        id_sets = [self._index[field].get(value, set())
+                   for field, value in criteria.items() if value is not None]
+        if not id_sets:
+            return self.all()
+
+        ids = set.intersection(*sorted(id_sets, key=len))
+        return [self._alerts[alert_id] for alert_id in sorted(ids, key=self._seq.__getitem__)]
+
+    def find_range(self, pool_id: Optional[str] = None, start: Optional[datetime] = None,
+                   end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Return alerts from both tiers with start <= timestamp <= end.
+
+        Only archive segments whose month overlaps the window are read.
+
+        Args:
+            pool_id: Restrict to one pool (None for all pools)
+            start: Earliest timestamp (None for unbounded)
+            end: Latest timestamp (None for unbounded)
+
+        Returns:
+            Matching alerts, oldest first
+        """
+        def in_window(alert):
+            if pool_id is not None and alert.get('pool_id') != pool_id:
+                return False
+            ts = alert_time(alert)
+            if ts is None:
+                return start is None and end is None
+            return (start is None or ts >= start) and (end is None or ts <= end)
+
+        hot = [a for a in self.find(pool_id=pool_id) if in_window(a)]
+        cold = []
+        for month in self.segments(start, end):
+            for alert in self._read_segment(month):
+                if alert['alert_id'] not in self._alerts and in_window(alert):
+                    cold.append(alert)
+
+        results = cold + hot
+        results.sort(key=lambda a: normalize_timestamp(a))
+        return results
+
+    # ==================== ARCHIVE ====================
+
+    def _segment_path(self, month: str) -> Path:
+        return self.archive_dir / f"{month}.jsonl.gz"
+
+    def segments(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[str]:
+        """
+        List archived months (YYYY-MM) overlapping a window.
+
+        Args:
+            start: Earliest timestamp (None for unbounded)
+            end: Latest timestamp (None for unbounded)
+        """
+        if not self.archive_dir.exists():
+            return []
+        first = start.strftime('%Y-%m') if start else None
+        last = end.strftime('%Y-%m') if end else None
+        months = []
+        for path in self.archive_dir.glob("*.jsonl.gz"):
+            month = path.name[:-len(".jsonl.gz")]
+            if (first is None or month >= first) and (last is None or month <= last):
+                months.append(month)
+        return sorted(months)
+
+    def _read_segment(self, month: str) -> List[Dict[str, Any]]:
+        """Read one monthly segment; later copies of an alert replace earlier ones."""
+        alerts: Dict[str, Dict[str, Any]] = {}
+        try:
+            with gzip.open(self._segment_path(month), 'rt') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        alert = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if isinstance(alert, dict) and alert.get('alert_id'):
+                        alerts[alert['alert_id']] = alert
+        except (OSError, EOFError) as e:
+            # A torn final gzip member from an interrupted append
+            logger.warning(f"Alert archive segment {month} ended early: {e}")
+        return list(alerts.values())
+
+    def _find_archived(self, alert_id: str) -> Optional[Dict[str, Any]]:
+        """Look an alert up in the archive, newest segment first."""
+        for month in reversed(self.segments()):
+            for alert in self._read_segment(month):
+                if alert['alert_id'] == alert_id:
+                    return alert
+        return None
+
+    def _append_segment(self, month: str, alerts: Iterable[Dict[str, Any]]):
+        """Append alerts to a segment as a new gzip member."""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        payload = "".join(json.dumps(a, separators=(',', ':'), default=str) + "\n" for a in alerts)
+        with open(self._segment_path(month), 'ab') as f:
+            f.write(gzip.compress(payload.encode('utf-8')))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def archive(self, now: Optional[datetime] = None) -> int:
+        """
+        Move closed alerts older than hot_days from the hot tier to monthly segments.
+
+        Returns:
+            Number of alerts archived
+        """
+        cutoff = (now or datetime.now()) - timedelta(days=self.hot_days)
+        by_month: Dict[str, List[Dict[str, Any]]] = {}
+        for alert in self._alerts.values():
+            ts = alert_time(alert)
+            if ts is not None and ts < cutoff and not is_open(alert):
+                by_month.setdefault(ts.strftime('%Y-%m'), []).append(alert)
+
+        archived = 0
+        for month, alerts in sorted(by_month.items()):
+            self._append_segment(month, alerts)
+            for alert in alerts:
+                self._remove(alert['alert_id'])
+            archived += len(alerts)
+        if archived:
+            logger.info(f"Archived {archived} alerts into {len(by_month)} monthly segments")
+        return archived
+
+    # ==================== UPDATES ====================
+
+    def _append(self, record: Dict[str, Any]) -> bool:
+        try:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            line = json.dumps(record, separators=(',', ':'), default=str)
+            with open(self.journal_path, 'a') as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.pending += 1
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Error appending to alert journal: {e}")
+            return False
+
+    def add(self, alert: Dict[str, Any]) -> bool:
+        """
+        Store a new alert.
+
+        Returns:
+            True if the alert was journaled
+        """
+        if not alert.get('alert_id'):
+            return False
+        if not self._append({'op': 'add', 'alert': alert}):
+            return False
+        self._insert(alert)
+        # Hysteresis: a hot tier held above max_hot by open alerts is not recompacted on every add
+        if (len(self._alerts) > self.max_hot
+                and len(self._alerts) - self._compacted_size >= self.compact_threshold):
+            self.compact()
+        return True
+
+    def _promote(self, alert: Dict[str, Any]) -> bool:
+        """Bring an archived alert back into the hot tier."""
+        if not self._append({'op': 'add', 'alert': alert}):
+            return False
+        self._insert(alert)
+        return True
+
+    def update(self, alert_id: str, **changes) -> Optional[Dict[str, Any]]:
+        """
+        Apply field changes to one alert and journal only those fields.
+
+        An archived alert is brought back into the hot tier first.
+
+        Returns:
+            The updated alert, or None if it does not exist or could not be journaled
+        """
+        if alert_id not in self._alerts:
+            archived = self._find_archived(alert_id)
+            if archived is None or not self._promote(archived):
+                return None
+        if not self._append({'op': 'update', 'alert_id': alert_id, 'changes': changes}):
+            return None
+        return self._apply_update(alert_id, changes)
+
+    # ==================== COMPACTION ====================
+
+    def compact(self) -> bool:
+        """
+        Archive old closed alerts, rewrite alerts.json from memory and truncate the journal.
+
+        Segments are appended before the snapshot is replaced, so a crash in
+        between leaves an alert in both tiers (the hot copy wins) rather than in neither.
+
+        Returns:
+            True if compaction succeeded
+        """
+        try:
+            self.archive()
+
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(self.all(), f, indent=2, default=str)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+
+            # Snapshot now contains every journaled change
+            with open(self.journal_path, 'w') as f:
+                f.flush()
+                os.fsync(f.fileno())
+
+            logger.info(f"Compacted {self.pending} alert journal records into {self.snapshot_path}")
+            self.pending = 0
+            self._compacted_size = len(self._alerts)
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Error compacting alert journal: {e}")
+            return False
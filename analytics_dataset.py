@@ -0,0 +1,107 @@
+"""
+Deep Blue Pool Chemistry - Prepared Analytics Datasets
+Copyright (c) 2024 Michael Hayes. All rights reserved.
+
+This module holds the cleaned form of a reading history that every
+analytics method works from. A PreparedDataset is built once per data
+version: the readings are validated, and each parameter becomes one
+float64 column (NaN where a value is missing or out of range). The dataset
+is identified by a hash of that matrix, and ResultMemo caches each
+analytics method's result under (method, dataset hash, arguments), so
+refreshing a tab whose data has not changed costs a hash, not a rerun.
+"""
+
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List
+
+import numpy as np
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+
+class PreparedDataset:
+    """
+    Cleaned readings with their parameter matrix and a content hash.
+    """
+
+    def __init__(self, data, values: np.ndarray, parameters: List[str]):
+        """
+        Initialize the dataset.
+
+        Args:
+            data: Cleaned readings (ColumnView or list), oldest first
+            values: (readings x parameters) float64 matrix, NaN where invalid or missing
+            parameters: Parameter name of each column
+        """
+        self.data = data
+        self.values = values
+        self.parameters = list(parameters)
+        self._index = {param: i for i, param in enumerate(self.parameters)}
+        self._series: Dict[str, np.ndarray] = {}
+
+        digest = hashlib.sha256(np.ascontiguousarray(values).tobytes())
+        digest.update(repr((values.shape, self.parameters)).encode())
+        self.key = digest.hexdigest()
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def column(self, param: str) -> np.ndarray:
+        """Return one parameter for every row (NaN where invalid or missing)."""
+        return self.values[:, self._index[param]]
+
+    def series(self, param: str) -> np.ndarray:
+        """Return the valid values of one parameter, oldest first."""
+        if param not in self._series:
+            col = self.column(param)
+            self._series[param] = col[np.isfinite(col)]
+        return self._series[param]
+
+    def features(self, missing: float = 0.0) -> np.ndarray:
+        """Return the matrix with invalid or missing values replaced by missing."""
+        return np.where(np.isfinite(self.values), self.values, missing)
+
+
+class ResultMemo:
+    """
+    Bounded LRU cache of analytics results keyed by (method, dataset hash, arguments).
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._results: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, method: str, dataset: PreparedDataset, args: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached result, computing and storing it on a miss.
+
+        Args:
+            method: Name of the analytics method
+            dataset: Dataset the result was computed from
+            args: Any other inputs the result depends on (must be hashable)
+            compute: Called without arguments on a miss
+        """
+        key = (method, dataset.key, args)
+        if key in self._results:
+            self._results.move_to_end(key)
+            self.hits += 1
+            return self._results[key]
+        self.misses += 1
+        result = compute()
+        self._results[key] = result
+        if len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+        return result
+
+    def clear(self):
+        """Drop every cached result."""
+        self._results.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache size, hits and misses."""
+        return {'entries': len(self._results), 'hits': self.hits, 'misses': self.misses}
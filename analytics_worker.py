@@ -0,0 +1,176 @@
+"""
+Deep Blue Pool Chemistry - Background Analytics Worker
+Copyright (c) 2024 Michael Hayes. All rights reserved.
+
+This module runs analytics engine calls (ARIMA forecasts, IsolationForest
+training and scoring, trend fits) on one worker thread so they no longer
+freeze the Tk mainloop. The UI submits a job with the work to run and a
+callback for its result; the worker runs jobs one at a time, in order,
+and the Tk thread collects finished jobs from deliver_ready(), which the
+application calls from self.after(), so callbacks always run on the Tk
+thread and never touch widgets from the worker.
+
+Jobs are keyed (e.g. 'predictions'): submitting a job cancels the earlier
+job with the same key, and cancel_all() drops everything when the pool or
+the date range changes. A cancelled job that has not started is skipped;
+one that is already running finishes, but its result is discarded.
+"""
+
+import queue
+import threading
+import time
+import logging
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsJob:
+    """
+    One unit of analytics work and the callbacks for its outcome.
+    """
+
+    def __init__(self, key: str, work: Callable[[], Any], on_result: Callable[[Any], None],
+                 on_error: Optional[Callable[[Exception], None]] = None):
+        self.key = key
+        self.work = work
+        self.on_result = on_result
+        self.on_error = on_error
+        self.result = None
+        self.error: Optional[Exception] = None
+        self.seconds = 0.0
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Skip the job if it has not started, and discard its result if it has."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+
+class AnalyticsWorker:
+    """
+    Single background thread serving analytics jobs in submission order.
+    """
+
+    def __init__(self, name: str = "analytics-worker"):
+        """
+        Initialize the worker (its thread starts with the first job).
+
+        Args:
+            name: Thread name, shown in logs and debuggers
+        """
+        self.name = name
+        self._jobs: "queue.Queue[Optional[AnalyticsJob]]" = queue.Queue()
+        self._finished = deque()
+        self._latest: Dict[str, AnalyticsJob] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.completed = 0
+        self.discarded = 0
+        self.failed = 0
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            if job.cancelled:
+                continue
+            started = time.perf_counter()
+            try:
+                job.result = job.work()
+            except Exception as e:
+                logger.error(f"Analytics job '{job.key}' failed: {e}")
+                job.error = e
+            job.seconds = time.perf_counter() - started
+            logger.debug(f"Analytics job '{job.key}' finished in {job.seconds:.2f}s")
+            self._finished.append(job)
+
+    def submit(self, key: str, work: Callable[[], Any], on_result: Callable[[Any], None],
+               on_error: Optional[Callable[[Exception], None]] = None) -> AnalyticsJob:
+        """
+        Queue work, superseding any earlier job with the same key.
+
+        Args:
+            key: What the job refreshes (one job per key is kept)
+            work: Runs on the worker thread; must not touch Tk widgets
+            on_result: Called with work()'s return value on the Tk thread
+            on_error: Called with the exception on the Tk thread if work() raised
+
+        Returns:
+            The queued job
+        """
+        job = AnalyticsJob(key, work, on_result, on_error)
+        with self._lock:
+            previous = self._latest.get(key)
+            if previous is not None:
+                previous.cancel()
+            self._latest[key] = job
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+        self._jobs.put(job)
+        return job
+
+    def cancel_all(self) -> List[str]:
+        """
+        Cancel every queued and running job (e.g. after a pool or range change).
+
+        Returns:
+            Keys of the jobs that were cancelled
+        """
+        with self._lock:
+            keys = [key for key, job in self._latest.items() if not job.cancelled]
+            for job in self._latest.values():
+                job.cancel()
+            self._latest = {}
+        return keys
+
+    def pending(self) -> bool:
+        """Return True while any submitted job has not been delivered or cancelled."""
+        with self._lock:
+            return any(not job.cancelled for job in self._latest.values())
+
+    def deliver_ready(self) -> bool:
+        """
+        Run the callbacks of finished jobs; call this on the Tk thread.
+
+        Returns:
+            True if jobs are still outstanding (keep polling)
+        """
+        while self._finished:
+            job = self._finished.popleft()
+            with self._lock:
+                current = self._latest.get(job.key) is job and not job.cancelled
+                if current:
+                    del self._latest[job.key]
+            if not current:
+                self.discarded += 1
+                logger.debug(f"Discarded superseded analytics job '{job.key}'")
+                continue
+            try:
+                if job.error is None:
+                    self.completed += 1
+                    job.on_result(job.result)
+                else:
+                    self.failed += 1
+                    if job.on_error is not None:
+                        job.on_error(job.error)
+            except Exception as e:
+                logger.error(f"Error delivering analytics job '{job.key}': {e}")
+        return self.pending()
+
+    def shutdown(self):
+        """Cancel outstanding jobs and let the thread exit after its current job."""
+        self.cancel_all()
+        if self._thread is not None:
+            self._jobs.put(None)
+
+    def stats(self) -> Dict[str, int]:
+        """Return counts of delivered jobs, finished jobs discarded as superseded, and failed jobs."""
+        return {'completed': self.completed, 'discarded': self.discarded, 'failed': self.failed}
@@ -0,0 +1,206 @@
+"""
+Deep Blue Pool Chemistry - Persisted Anomaly Detectors
+Copyright (c) 2024 Michael Hayes. All rights reserved.
+
+This module keeps one trained Isolation Forest per pool instead of training
+a new forest every time anomalies are checked. A detector is trained on the
+most recent `window` readings and remembers a fingerprint of that training
+window, its training score distribution and the tail of the history it saw.
+On the next call with the same pool:
+
+- an identical training window reuses the detector as is;
+- a history that only grew is scored against the stored detector, and the
+  detector is retrained only when retrain_every new readings have arrived
+  or the new readings' anomaly scores drift away from the training scores;
+- anything else (edited, restored or back-dated history) retrains.
+
+Detectors are kept in the model registry under (pool_id, 'all',
+'isolation_forest'), so they survive restarts and are loaded on demand.
+
+rolling_zscores() gives the per-parameter z-score of every reading against
+the readings before it, for a whole history in one vectorized pass.
+"""
+
+import hashlib
+import time
+import logging
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import ml_stack
+from model_registry import ModelRegistry
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Rows compared to recognise that a history still extends the training data
+TAIL_CHECK = 5
+
+MODEL_TYPE = 'isolation_forest'
+# Registry parameter of a detector trained on every parameter at once
+ALL_PARAMETERS = 'all'
+
+
+def rolling_zscores(X: np.ndarray, window: int = 30, min_periods: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Z-score every value against the rolling mean/std of the values before it.
+
+    Args:
+        X: (readings x parameters) matrix, oldest first, NaN where a value is missing
+        window: Preceding readings in the rolling window
+        min_periods: Fewest preceding values needed for a z-score
+
+    Returns:
+        (z_scores, expected): signed z-scores (NaN without enough history,
+        0.0 where the window has no spread) and the rolling means, both
+        shaped like X
+    """
+    frame = pd.DataFrame(np.asarray(X, dtype=np.float64))
+    prior = frame.shift(1).rolling(window, min_periods=min_periods)
+    mean = prior.mean().to_numpy()
+    std = prior.std().to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = (frame.to_numpy() - mean) / std
+    z[(std == 0) & np.isfinite(frame.to_numpy())] = 0.0
+    return z, mean
+
+
+class AnomalyModelStore:
+    """
+    Per-pool Isolation Forests with fingerprint reuse and drift-triggered retraining.
+    """
+
+    def __init__(self, registry: ModelRegistry, window: int = 1000, retrain_every: int = 100,
+                 drift_z: float = 4.0, min_drift_samples: int = 10,
+                 contamination: float = 0.1, n_estimators: int = 100, random_state: int = 42):
+        """
+        Initialize the store.
+
+        Args:
+            registry: Model registry the detectors are stored in
+            window: Most recent readings used for training
+            retrain_every: New readings scored before a scheduled retrain
+            drift_z: Shift of the new readings' mean score, in standard errors, that signals drift
+            min_drift_samples: Fewest new readings before the drift test applies
+            contamination: Expected share of anomalies (IsolationForest setting)
+            n_estimators: Trees per forest
+            random_state: Seed, so a retrain on the same window gives the same forest
+        """
+        self.registry = registry
+        self.window = window
+        self.retrain_every = retrain_every
+        self.drift_z = drift_z
+        self.min_drift_samples = min_drift_samples
+        self.contamination = contamination
+        self.n_estimators = n_estimators
+        self.random_state = random_state
+        self.trains = 0
+        self.reuses = 0
+
+    # ==================== STATE ====================
+
+    def fingerprint(self, X: np.ndarray) -> str:
+        """Hash a training window together with the forest settings."""
+        digest = hashlib.sha256(np.ascontiguousarray(X, dtype=np.float64).tobytes())
+        digest.update(repr((X.shape, self.contamination, self.n_estimators, self.random_state)).encode())
+        return digest.hexdigest()
+
+    def _train(self, X: np.ndarray, reason: str) -> Dict[str, Any]:
+        training = X[-self.window:]
+        ml_stack.load()
+        clf = ml_stack.IsolationForest(contamination=self.contamination, random_state=self.random_state,
+                                       n_estimators=self.n_estimators)
+        clf.fit(training)
+        scores = clf.score_samples(training)
+        self.trains += 1
+        logger.info(f"Isolation Forest trained on {len(training)} readings ({reason})")
+        return {
+            'model': clf,
+            'fingerprint': self.fingerprint(training),
+            'window': len(training),
+            'n': len(X),
+            'tail': X[-TAIL_CHECK:].copy(),
+            'score_mean': float(scores.mean()),
+            'score_std': float(scores.std()),
+            'trained_at': time.time(),
+            'new_scores': []
+        }
+
+    def _load(self, pool_id: Hashable) -> Optional[Dict[str, Any]]:
+        return self.registry.get(pool_id, ALL_PARAMETERS, MODEL_TYPE)
+
+    def _save(self, pool_id: Hashable, state: Dict[str, Any]) -> Dict[str, Any]:
+        return self.registry.put(pool_id, ALL_PARAMETERS, MODEL_TYPE, state['fingerprint'], state)
+
+    def _retrain_reason(self, state: Optional[Dict[str, Any]], X: np.ndarray) -> Optional[str]:
+        """Return why the stored detector cannot be reused for this history, or None."""
+        if state is None:
+            return "initial training"
+        n = state['n']
+        if len(X) < n or X.shape[1] != state['tail'].shape[1] \
+                or not np.array_equal(X[max(0, n - TAIL_CHECK):n], state['tail'][-min(n, TAIL_CHECK):]):
+            if state['fingerprint'] == self.fingerprint(X[-self.window:]):
+                # Only readings older than the training window changed
+                state['n'] = len(X)
+                state['tail'] = X[-TAIL_CHECK:].copy()
+                return None
+            return "history changed"
+        if len(X) == n:
+            return None
+
+        # Score only the readings that arrived since the last call
+        new_scores = state['model'].score_samples(X[n:])
+        state['new_scores'].extend(float(s) for s in new_scores)
+        state['n'] = len(X)
+        state['tail'] = X[-TAIL_CHECK:].copy()
+        if len(state['new_scores']) >= self.retrain_every:
+            return "scheduled retrain"
+        if self._drifted(state):
+            return "score drift"
+        return None
+
+    def _drifted(self, state: Dict[str, Any]) -> bool:
+        """Test whether the new readings' mean anomaly score left the training distribution."""
+        scores = np.asarray(state['new_scores'])
+        if len(scores) < self.min_drift_samples or state['score_std'] <= 0:
+            return False
+        z = abs(scores.mean() - state['score_mean']) / (state['score_std'] / np.sqrt(len(scores)))
+        return z > self.drift_z
+
+    # ==================== DETECTORS ====================
+
+    def detector(self, pool_id: Optional[Hashable], X: np.ndarray):
+        """
+        Return an Isolation Forest for a pool's history, training only when needed.
+
+        Args:
+            pool_id: Pool the history belongs to (None trains once without caching)
+            X: (readings x parameters) feature matrix, oldest first
+
+        Returns:
+            Fitted IsolationForest
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if pool_id is None:
+            return self._train(X, "uncached")['model']
+
+        state = self._load(pool_id)
+        reason = self._retrain_reason(state, X)
+        if reason is None:
+            self.reuses += 1
+            return state['model']
+
+        if reason == "score drift":
+            logger.info(f"Anomaly score drift detected for {pool_id}; retraining")
+        state = self._save(pool_id, self._train(X, reason))
+        return state['model']
+
+    def reset(self, pool_id: Optional[Hashable] = None):
+        """Forget (and delete) the detector of one pool, or of every pool."""
+        self.registry.remove(pool_id, MODEL_TYPE)
+
+    def stats(self) -> Dict[str, int]:
+        """Return counts of trainings and reuses."""
+        return {'trains': self.trains, 'reuses': self.reuses}
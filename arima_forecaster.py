@@ -0,0 +1,345 @@
+"""
+Deep Blue Pool Chemistry - Incremental ARIMA Forecaster
+Copyright (c) 2024 Michael Hayes. All rights reserved.
+
+This module keeps one fitted ARIMA state per (pool, parameter). When the
+series has grown since the last call, only the new observations are fed
+through the Kalman filter with ARIMAResults.extend (the estimated
+coefficients are kept), which costs milliseconds instead of a full maximum
+likelihood fit. A full refit happens only when:
+
+- the model has absorbed refit_every new observations, or is older than
+  refit_interval seconds (the schedule);
+- the standardized one-step forecast errors of the new observations fail
+  the drift test (one error beyond max_abs_z, or a mean squared error above
+  drift_threshold over the last drift_window observations);
+- the fingerprint of the series it absorbed no longer matches the start of
+  the series (readings were edited, restored or back-dated).
+
+States live in a ModelRegistry under (pool_id, parameter, 'arima') and
+hold only what forecasting and appending need: the estimated
+coefficients and the Kalman filter's predicted state and covariance after
+the last observation. Appending filters the new observations from that
+state; a forecast filters one missing observation from it.
+
+forecast_many() handles many series at once (every parameter of a pool, or
+of every pool). The full fits it needs are independent and CPU-bound, so
+with workers > 1 they run in a process pool: each worker receives only the
+value array and returns only the estimated coefficients, and the parent
+rebuilds the fitted state by filtering the series with those coefficients.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
+
+import numpy as np
+
+import ml_stack
+from model_registry import ModelRegistry
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+MODEL_TYPE = 'arima'
+
+
+def _fit_params(order: Tuple[int, int, int], values: np.ndarray) -> np.ndarray:
+    """Process-pool entry point: fit one series and return only its coefficients."""
+    import warnings
+    ml_stack.load()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return np.asarray(ml_stack.ARIMA(values, order=order).fit().params)
+
+
+class IncrementalForecaster:
+    """
+    One-step-ahead ARIMA forecasts with cached, incrementally extended fits.
+    """
+
+    def __init__(self, order: Tuple[int, int, int] = (1, 1, 1), refit_every: int = 50,
+                 refit_interval: float = 7 * 24 * 3600, drift_window: int = 10,
+                 drift_threshold: float = 3.0, max_abs_z: float = 4.0,
+                 workers: Optional[int] = None, min_parallel: int = 2,
+                 registry: Optional[ModelRegistry] = None):
+        """
+        Initialize the forecaster.
+
+        Args:
+            order: ARIMA (p, d, q) order
+            refit_every: New observations absorbed before a scheduled refit
+            refit_interval: Seconds after which a fit is re-estimated on next use
+            drift_window: Recent standardized errors used by the drift test
+            drift_threshold: Mean squared standardized error that signals drift
+            max_abs_z: A single standardized error beyond this signals drift
+            workers: Processes for full fits (None for one per CPU, 0 or 1 to fit in-process)
+            min_parallel: Fewest pending fits worth sending to the process pool
+            registry: Where states are kept (None for an in-memory registry)
+        """
+        self.order = order
+        self.refit_every = refit_every
+        self.refit_interval = refit_interval
+        self.drift_window = drift_window
+        self.drift_threshold = drift_threshold
+        self.max_abs_z = max_abs_z
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.min_parallel = min_parallel
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.registry = registry if registry is not None else ModelRegistry()
+        self.fits = 0
+        self.extends = 0
+        self.reuses = 0
+
+    # ==================== STATE ====================
+
+    @staticmethod
+    def _split(key: Hashable) -> Tuple[Optional[Hashable], str]:
+        """Registry (pool_id, parameter) of a state key."""
+        if isinstance(key, tuple) and len(key) == 2:
+            return key[0], str(key[1])
+        return None, str(key)
+
+    def fingerprint(self, values: np.ndarray) -> str:
+        """Hash the observations a state has absorbed, together with the order."""
+        digest = hashlib.sha256(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+        digest.update(repr(tuple(self.order)).encode())
+        return digest.hexdigest()
+
+    def _filter(self, values: np.ndarray, state: Dict[str, Any]):
+        """Run the Kalman filter over values, starting from a state's predicted state."""
+        ml_stack.load()
+        model = ml_stack.ARIMA(values, order=self.order)
+        model.ssm.initialize_known(state['state'], state['state_cov'])
+        return model.filter(state['params'])
+
+    @staticmethod
+    def _filter_state(results) -> Dict[str, np.ndarray]:
+        """The compact part of a state: coefficients plus the filter state after the last observation."""
+        return {
+            'params': np.asarray(results.params, dtype=np.float64),
+            'state': np.array(results.predicted_state[:, -1]),
+            'state_cov': np.array(results.predicted_state_cov[:, :, -1])
+        }
+
+    def _fit(self, values: np.ndarray, reason: str, params: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        ml_stack.load()
+        if params is None:
+            results = ml_stack.ARIMA(values, order=self.order).fit()
+        else:
+            # Coefficients estimated in a worker: one filtering pass rebuilds the filter state
+            results = ml_stack.ARIMA(values, order=self.order).filter(params)
+        self.fits += 1
+        logger.debug(f"ARIMA{self.order} fitted on {len(values)} values ({reason})")
+        return dict(
+            self._filter_state(results),
+            n=len(values),
+            fitted_at=time.time(),
+            appended=0,
+            errors=[]
+        )
+
+    def _refit_reason(self, state: Optional[Dict[str, Any]], values: np.ndarray) -> Optional[str]:
+        """Return why the stored state cannot be extended to this series, or None."""
+        if state is None:
+            return "initial fit"
+        n = state['n']
+        if len(values) < n or self.fingerprint(values[:n]) != state['fingerprint']:
+            return "history changed"
+        if time.time() - state['fitted_at'] > self.refit_interval:
+            return "scheduled refit"
+        return None
+
+    def _drifted(self, state: Dict[str, Any]) -> bool:
+        """Drift test on the standardized one-step errors since the last fit."""
+        errors = np.asarray(state['errors'][-self.drift_window:])
+        if not len(errors):
+            return False
+        if np.abs(errors).max() > self.max_abs_z:
+            return True
+        return len(errors) >= self.drift_window and float(np.mean(errors ** 2)) > self.drift_threshold
+
+    def _extend(self, state: Dict[str, Any], new: np.ndarray) -> Dict[str, Any]:
+        """Filter new observations from the stored state without re-estimating the model."""
+        results = self._filter(new, state)
+        variance = results.forecasts_error_cov[0, 0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = results.forecasts_error[0] / np.sqrt(variance)
+        errors = state['errors'] + [float(v) for v in z if np.isfinite(v)]
+        self.extends += 1
+        return dict(
+            state,
+            **self._filter_state(results),
+            n=state['n'] + len(new),
+            appended=state['appended'] + len(new),
+            errors=errors[-self.drift_window:]
+        )
+
+    def _advance(self, key: Hashable, values: np.ndarray) -> Tuple[Optional[str], str, Optional[Dict[str, Any]]]:
+        """
+        Bring a stored state up to date with the series.
+
+        Returns:
+            (reason a full refit is needed or None, update label, current state)
+        """
+        pool_id, parameter = self._split(key)
+        state = self.registry.get(pool_id, parameter, MODEL_TYPE)
+        reason = self._refit_reason(state, values)
+        if reason:
+            return reason, 'refit', None
+        if len(values) == state['n']:
+            self.reuses += 1
+            return None, 'reused', state
+        state = self._extend(state, values[state['n']:])
+        if state['appended'] >= self.refit_every:
+            return "scheduled refit", 'refit', None
+        if self._drifted(state):
+            logger.info(f"ARIMA drift detected for {key}; refitting")
+            return "drift", 'refit', None
+        state = self.registry.put(pool_id, parameter, MODEL_TYPE, self.fingerprint(values), state)
+        return None, 'extended', state
+
+    def _fit_all(self, pending: Dict[Hashable, Tuple[np.ndarray, str]]) -> Dict[Hashable, Union[Dict, Exception]]:
+        """Run the full fits, in the process pool when there are enough of them."""
+        fitted: Dict[Hashable, Union[Dict, Exception]] = {}
+        if self.parallel(len(pending)):
+            try:
+                executor = self.executor()
+                futures = {key: executor.submit(_fit_params, self.order, values)
+                           for key, (values, _) in pending.items()}
+            except (OSError, RuntimeError) as e:
+                logger.warning(f"Process pool unavailable, fitting in-process: {e}")
+                self.shutdown()
+                futures = {}
+            for key, future in futures.items():
+                values, reason = pending[key]
+                try:
+                    fitted[key] = self._fit(values, reason, params=future.result())
+                except Exception as e:
+                    fitted[key] = e
+        for key, (values, reason) in pending.items():
+            if key not in fitted:
+                try:
+                    fitted[key] = self._fit(values, reason)
+                except Exception as e:
+                    fitted[key] = e
+        return fitted
+
+    def _forecast_state(self, state: Dict[str, Any], alpha: float, update: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        from scipy.stats import norm
+        # A missing observation is predicted from the state without updating it
+        results = self._filter(np.array([np.nan]), state)
+        mean = float(results.forecasts[0, 0])
+        half_width = norm.ppf(1 - alpha / 2) * float(np.sqrt(results.forecasts_error_cov[0, 0, 0]))
+        return {
+            'value': mean,
+            'lower_bound': mean - half_width,
+            'upper_bound': mean + half_width,
+            'update': update
+        }, state
+
+    # ==================== FORECASTING ====================
+
+    def forecast_many(self, series: Dict[Hashable, Any], alpha: float = 0.05,
+                      cache: bool = True) -> Dict[Hashable, Union[Tuple[Dict[str, Any], Any], Exception]]:
+        """
+        Forecast the next value of many series, fitting whatever needs fitting in parallel.
+
+        Args:
+            series: Full series (oldest first) keyed by e.g. (pool_id, parameter)
+            alpha: Significance level of the returned intervals
+            cache: False to fit every series from scratch and keep nothing
+
+        Returns:
+            For each key, ({'value', 'lower_bound', 'upper_bound', 'update'}, state)
+            as returned by forecast(), or the exception raised while fitting that series
+        """
+        updates: Dict[Hashable, str] = {}
+        pending: Dict[Hashable, Tuple[np.ndarray, str]] = {}
+        states: Dict[Hashable, Dict[str, Any]] = {}
+        arrays = {key: np.asarray(values, dtype=np.float64) for key, values in series.items()}
+        for key, values in arrays.items():
+            if not cache:
+                pending[key] = (values, "uncached")
+                continue
+            try:
+                reason, updates[key], state = self._advance(key, values)
+            except Exception as e:
+                logger.warning(f"Could not extend ARIMA state for {key}, refitting: {e}")
+                reason = "extend failed"
+            if reason:
+                pending[key] = (values, reason)
+            else:
+                states[key] = state
+
+        outcomes: Dict[Hashable, Union[Tuple[Dict[str, Any], Any], Exception]] = {}
+        for key, state in self._fit_all(pending).items():
+            if isinstance(state, Exception):
+                outcomes[key] = state
+                continue
+            if cache:
+                pool_id, parameter = self._split(key)
+                state = self.registry.put(pool_id, parameter, MODEL_TYPE, self.fingerprint(arrays[key]), state)
+            states[key] = state
+            updates[key] = 'refit'
+
+        for key, state in states.items():
+            try:
+                outcomes[key] = self._forecast_state(state, alpha, updates[key])
+            except Exception as e:
+                outcomes[key] = e
+        return {key: outcomes[key] for key in arrays}
+
+    def forecast(self, key: Optional[Hashable], values, alpha: float = 0.05) -> Tuple[Dict[str, Any], Any]:
+        """
+        Forecast the next value of one series.
+
+        Args:
+            key: State key such as (pool_id, parameter); None fits once without caching
+            values: Full series, oldest first
+            alpha: Significance level of the returned interval
+
+        Returns:
+            ({'value', 'lower_bound', 'upper_bound', 'update'}, state), where update is
+            'refit', 'extended' or 'reused' and state holds the coefficients ('params')
+            and filter state ('state', 'state_cov') after the last value
+        """
+        outcome = self.forecast_many({key: values}, alpha, cache=key is not None)[key]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    # ==================== PROCESS POOL ====================
+
+    def parallel(self, jobs: int) -> bool:
+        """Return True if this many independent fits should go to the process pool."""
+        return self.workers > 1 and jobs >= self.min_parallel
+
+    def executor(self) -> ProcessPoolExecutor:
+        """Return the shared worker pool, starting it on first use."""
+        if self._executor is None:
+            # Never fork: the parent runs Tk and the analytics worker thread, and a
+            # forked child would inherit their locks. The forkserver (spawn where
+            # it is unavailable) starts workers from a clean process instead.
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context(method))
+        return self._executor
+
+    def shutdown(self):
+        """Stop the worker processes (they are started again on the next parallel fit)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def reset(self, pool_id: Optional[str] = None):
+        """Forget (and delete) the stored fits of one pool (keys are (pool_id, parameter)), or of every pool."""
+        self.registry.remove(pool_id, MODEL_TYPE)
+
+    def stats(self) -> Dict[str, int]:
+        """Return counts of full fits, incremental extensions and reused forecasts."""
+        return {'fits': self.fits, 'extends': self.extends, 'reuses': self.reuses}
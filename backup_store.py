@@ -0,0 +1,271 @@
+"""
+Deep Blue Pool Chemistry - Backup Store
+Copyright (c) 2024 Michael Hayes. All rights reserved.
+
+This module provides incremental, content-addressed backups of the data
+directory. Files are split into chunks, each chunk is stored once as a
+compressed blob named by its SHA-256, and every snapshot is a small JSON
+manifest listing the chunks of each file. Files whose size and mtime match
+the previous snapshot are not even read, so a backup costs time and disk in
+proportion to what changed.
+
+Layout under <data>/backups/:
+    objects/<ab>/<sha256>        zlib-compressed chunk
+    snapshots/<snapshot_id>.json manifest
+
+Command line:
+    python backup_store.py backup
+    python backup_store.py list
+    python backup_store.py restore <snapshot_id> [--target DIR]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import zlib
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+# Temp files are never complete; the SQLite database is an index rebuilt from the JSON stores
+EXCLUDED_SUFFIXES = ('.tmp', '.db', '.db-wal', '.db-shm', '.db-journal')
+
+
+class BackupStore:
+    """
+    Deduplicated snapshot store for a data directory.
+    """
+
+    def __init__(self, data_dir, backup_dir=None, chunk_size: int = CHUNK_SIZE):
+        """
+        Initialize the backup store.
+
+        Args:
+            data_dir: Directory to back up
+            backup_dir: Where objects and manifests live (defaults to <data_dir>/backups)
+            chunk_size: Chunk size in bytes; appends to large files only add new chunks
+        """
+        self.data_dir = Path(data_dir)
+        self.backup_dir = Path(backup_dir) if backup_dir else self.data_dir / "backups"
+        self.objects_dir = self.backup_dir / "objects"
+        self.snapshots_dir = self.backup_dir / "snapshots"
+        self.chunk_size = chunk_size
+
+    # ==================== HELPERS ====================
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def _write_atomic(self, path: Path, data: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _iter_files(self) -> List[Path]:
+        """Files to back up: everything under data_dir except the backups and excluded files."""
+        backup_root = self.backup_dir.resolve()
+        files = []
+        for root, dirs, names in os.walk(self.data_dir):
+            root_path = Path(root)
+            dirs[:] = [d for d in dirs if (root_path / d).resolve() != backup_root]
+            for name in names:
+                if name.endswith(EXCLUDED_SUFFIXES):
+                    continue
+                files.append(root_path / name)
+        return sorted(files)
+
+    def _store_chunks(self, path: Path, stats: Dict[str, int]) -> List[str]:
+        """Hash a file chunk by chunk, writing only blobs not already stored."""
+        digests = []
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                digest = hashlib.sha256(chunk).hexdigest()
+                object_path = self._object_path(digest)
+                if not object_path.exists():
+                    blob = zlib.compress(chunk)
+                    self._write_atomic(object_path, blob)
+                    stats['new_blobs'] += 1
+                    stats['bytes_written'] += len(blob)
+                digests.append(digest)
+        return digests
+
+    # ==================== SNAPSHOTS ====================
+
+    def list_snapshots(self) -> List[str]:
+        """Return snapshot ids, oldest first."""
+        if not self.snapshots_dir.exists():
+            return []
+        return sorted(p.stem for p in self.snapshots_dir.glob("*.json"))
+
+    def load_manifest(self, snapshot_id: str) -> Dict[str, Any]:
+        """Read one snapshot manifest."""
+        with open(self.snapshots_dir / f"{snapshot_id}.json", 'r') as f:
+            return json.load(f)
+
+    def restores_legacy_readings(self, snapshot_id: str) -> bool:
+        """Return True for a snapshot taken before readings were partitioned (it has readings.json but no readings/)."""
+        files = self.load_manifest(snapshot_id)['files']
+        return 'readings.json' in files and not any(rel.startswith('readings/') for rel in files)
+
+    def backup(self) -> Dict[str, Any]:
+        """
+        Take a snapshot of the data directory.
+
+        Returns:
+            The snapshot manifest (its 'stats' entry reports files read and bytes written)
+        """
+        started = time.perf_counter()
+        snapshots = self.list_snapshots()
+        previous = self.load_manifest(snapshots[-1])['files'] if snapshots else {}
+
+        stats = {'files': 0, 'files_read': 0, 'new_blobs': 0, 'bytes_written': 0}
+        files: Dict[str, Dict[str, Any]] = {}
+        for path in self._iter_files():
+            rel = path.relative_to(self.data_dir).as_posix()
+            try:
+                st = path.stat()
+                entry = previous.get(rel)
+                if (entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns
+                        and all(self._object_path(d).exists() for d in entry['chunks'])):
+                    chunks = entry['chunks']
+                else:
+                    chunks = self._store_chunks(path, stats)
+                    stats['files_read'] += 1
+            except OSError as e:
+                # File vanished or is locked; keep the previous copy if there is one
+                logger.warning(f"Backup skipped {rel}: {e}")
+                if rel in previous:
+                    files[rel] = previous[rel]
+                continue
+            files[rel] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'chunks': chunks}
+            stats['files'] += 1
+
+        snapshot_id = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+        if snapshot_id in snapshots:
+            snapshot_id += f"_{len(snapshots)}"
+        stats['seconds'] = round(time.perf_counter() - started, 3)
+        manifest = {
+            'id': snapshot_id,
+            'created': datetime.now().isoformat(),
+            'files': files,
+            'stats': stats
+        }
+        self._write_atomic(self.snapshots_dir / f"{snapshot_id}.json",
+                           json.dumps(manifest, indent=1).encode('utf-8'))
+        logger.info(f"Backup {snapshot_id}: {stats['files']} files, {stats['files_read']} read, "
+                    f"{stats['new_blobs']} new blobs ({stats['bytes_written']} bytes) in {stats['seconds']}s")
+        return manifest
+
+    def restore(self, snapshot_id: str, target_dir=None) -> int:
+        """
+        Restore every file in a snapshot.
+
+        Files are written atomically and given their original mtime. JSONL
+        journals that did not exist at snapshot time are removed (otherwise
+        they would be replayed over the restored snapshots); other files
+        created after the snapshot are left in place.
+
+        Args:
+            snapshot_id: Snapshot to restore
+            target_dir: Destination (defaults to the data directory itself)
+
+        Returns:
+            Number of files restored
+
+        Raises:
+            ValueError: If a stored chunk is missing or fails its hash check
+        """
+        target = Path(target_dir) if target_dir else self.data_dir
+        manifest = self.load_manifest(snapshot_id)
+        for rel, entry in manifest['files'].items():
+            parts = []
+            for digest in entry['chunks']:
+                object_path = self._object_path(digest)
+                if not object_path.exists():
+                    raise ValueError(f"Backup object missing for {rel}: {digest}")
+                with open(object_path, 'rb') as f:
+                    chunk = zlib.decompress(f.read())
+                if hashlib.sha256(chunk).hexdigest() != digest:
+                    raise ValueError(f"Backup object corrupt for {rel}: {digest}")
+                parts.append(chunk)
+            path = target / rel
+            self._write_atomic(path, b"".join(parts))
+            os.utime(path, ns=(entry['mtime_ns'], entry['mtime_ns']))
+
+        if target.resolve() == self.data_dir.resolve():
+            for path in self._iter_files():
+                if path.suffix == ".jsonl" and path.relative_to(self.data_dir).as_posix() not in manifest['files']:
+                    path.unlink()
+        logger.info(f"Restored {len(manifest['files'])} files from backup {snapshot_id} to {target}")
+        return len(manifest['files'])
+
+    def prune(self, keep: int) -> int:
+        """
+        Delete all but the newest `keep` snapshots and any blobs they no longer reference.
+
+        Returns:
+            Number of blobs removed
+        """
+        snapshots = self.list_snapshots()
+        for snapshot_id in snapshots[:-keep] if keep else snapshots:
+            (self.snapshots_dir / f"{snapshot_id}.json").unlink()
+
+        referenced = set()
+        for snapshot_id in self.list_snapshots():
+            for entry in self.load_manifest(snapshot_id)['files'].values():
+                referenced.update(entry['chunks'])
+
+        removed = 0
+        if self.objects_dir.exists():
+            for object_path in self.objects_dir.glob("*/*"):
+                if object_path.name not in referenced:
+                    object_path.unlink()
+                    removed += 1
+        return removed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point for backup, list and restore."""
+    parser = argparse.ArgumentParser(description="Deep Blue Pool Chemistry data backups")
+    parser.add_argument("--data-dir", default="data", help="Data directory (default: data)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("backup", help="Take an incremental snapshot")
+    commands.add_parser("list", help="List snapshots")
+    restore_parser = commands.add_parser("restore", help="Restore a snapshot")
+    restore_parser.add_argument("snapshot_id")
+    restore_parser.add_argument("--target", help="Restore into this directory instead of the data directory")
+    args = parser.parse_args(argv)
+
+    store = BackupStore(args.data_dir)
+    if args.command == "backup":
+        manifest = store.backup()
+        print(f"{manifest['id']}: {manifest['stats']}")
+    elif args.command == "list":
+        for snapshot_id in store.list_snapshots():
+            stats = store.load_manifest(snapshot_id).get('stats', {})
+            print(f"{snapshot_id}  files={stats.get('files')}  new_bytes={stats.get('bytes_written')}")
+    elif args.command == "restore":
+        count = store.restore(args.snapshot_id, args.target)
+        print(f"Restored {count} files from {args.snapshot_id}")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
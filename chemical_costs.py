@@ -0,0 +1,210 @@
+"""
+Deep Blue Pool Chemistry - Chemical Cost Catalog
+Copyright (c) 2024 Michael Hayes. All rights reserved.
+
+This module prices chemical adjustments from one compiled table instead of
+a chain of substring checks per adjustment. The catalog maps chemical names
+(by the same keywords, checked in the same order, as before) to a cost key
+and the number of ounces in the unit that key is priced in, and resolves
+each distinct name once. cost_batch() then prices any number of
+adjustments with array arithmetic.
+
+DOSE_RULES holds the dosing rules of the Chemistry tab's adjustment
+calculation as data, so history_doses() can work out the adjustments every
+past reading called for in one vectorized pass over a pool's columns, and
+monthly_costs() turns those into a monthly cost curve.
+"""
+
+import logging
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Cost key -> (name keywords, ounces per priced unit); the first matching entry wins
+CATALOG: List[Tuple[str, Tuple[str, ...], float]] = [
+    ('soda_ash', ('soda ash', 'ph up'), 16),
+    ('muriatic_acid', ('muriatic acid', 'ph down'), 128),
+    ('chlorine', ('chlorine',), 16),
+    ('baking_soda', ('baking soda', 'bicarbonate', 'alkalinity'), 16),
+    ('calcium_chloride', ('calcium',), 16),
+    ('stabilizer', ('stabilizer', 'cyanuric'), 16),
+    ('bromine', ('bromine',), 16),
+    ('salt', ('salt',), 16)
+]
+
+# Ounces per adjustment unit (amounts without a unit are in ounces)
+UNIT_OUNCES = {
+    '': 1.0, 'oz': 1.0, 'fl oz': 1.0,
+    'lb': 16.0, 'lbs': 16.0,
+    'gal': 128.0, 'gallon': 128.0, 'gallons': 128.0
+}
+
+# Chemistry tab dosing: (parameter, 'below'/'above', target, oz per unit of difference per 10,000 gal, chemical)
+DOSE_RULES = [
+    ('free_chlorine', 'below', 3.0, 1.0, 'chlorine'),
+    ('ph', 'below', 7.2, 2.0, 'soda ash'),
+    ('ph', 'above', 7.6, 3.0, 'muriatic acid'),
+    ('alkalinity', 'below', 80, 1.5, 'sodium bicarbonate'),
+    ('alkalinity', 'above', 120, 2.0, 'muriatic acid')
+]
+
+
+@lru_cache(maxsize=256)
+def catalog_index(chemical: str) -> int:
+    """
+    Resolve a chemical name to its CATALOG row.
+
+    Returns:
+        Row index, or -1 for chemicals the catalog does not price
+    """
+    name = chemical.lower()
+    for i, (_, keywords, _) in enumerate(CATALOG):
+        if any(keyword in name for keyword in keywords):
+            return i
+    return -1
+
+
+def _month_starts(first_epoch: float, last_epoch: float) -> List[date]:
+    """First day of every local calendar month from first_epoch's through last_epoch's, plus the next."""
+    day = datetime.fromtimestamp(first_epoch).date().replace(day=1)
+    last = datetime.fromtimestamp(last_epoch).date()
+    months = [day]
+    while day <= last:
+        day = date(day.year + day.month // 12, day.month % 12 + 1, 1)
+        months.append(day)
+    return months
+
+
+class ChemicalCatalog:
+    """
+    Compiled chemical -> price table over a (user-configurable) price dict.
+    """
+
+    def __init__(self, prices: Dict[str, float]):
+        """
+        Initialize the catalog.
+
+        Args:
+            prices: Cost key -> price per pound (per gallon for muriatic acid);
+                    read on every call, so later edits to the dict apply
+        """
+        self.prices = prices
+        self.keys = [key for key, _, _ in CATALOG]
+        self.ounces = np.array([ounces for _, _, ounces in CATALOG])
+
+    def _price_per_ounce(self) -> np.ndarray:
+        # Trailing 0 is the price of chemicals the catalog does not know (index -1)
+        prices = np.array([self.prices.get(key, 0.0) for key in self.keys])
+        return np.append(prices / self.ounces, 0.0)
+
+    def cost_batch(self, chemicals: Sequence[str], amounts: Union[Sequence[float], np.ndarray],
+                   units: Optional[Sequence[str]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Price many adjustments at once.
+
+        Args:
+            chemicals: Chemical name of each adjustment
+            amounts: Amount of each adjustment
+            units: Unit of each amount (default ounces)
+
+        Returns:
+            (cost of each adjustment, catalog index of each chemical or -1)
+        """
+        codes = np.fromiter((catalog_index(chemical or '') for chemical in chemicals), dtype=np.int64,
+                            count=len(chemicals))
+        amounts = np.asarray(amounts, dtype=np.float64)
+        if units is not None:
+            amounts = amounts * np.array([UNIT_OUNCES.get((unit or '').lower(), 1.0) for unit in units])
+        costs = np.where(amounts > 0, amounts, 0.0) * self._price_per_ounce()[codes]
+        return costs, codes
+
+    def price(self, code: int) -> float:
+        """Return the configured price of a catalog row (0 for unknown chemicals)."""
+        return self.prices.get(self.keys[code], 0.0) if code >= 0 else 0.0
+
+    def history_doses(self, columns: Dict[str, np.ndarray], pool_size: Union[float, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Work out the doses each past reading called for, by DOSE_RULES.
+
+        Args:
+            columns: Parameter -> float64 values per reading (NaN where missing)
+            pool_size: Pool volume in gallons (scalar or per reading)
+
+        Returns:
+            Chemical -> ounces per reading (0 where no dose was needed)
+        """
+        scale = np.asarray(pool_size, dtype=np.float64) / 10000
+        doses: Dict[str, np.ndarray] = {}
+        for param, side, target, rate, chemical in DOSE_RULES:
+            values = columns.get(param)
+            if values is None:
+                continue
+            gap = target - values if side == 'below' else values - target
+            # NaN gaps (missing values) compare False, so they get no dose
+            amount = np.where(gap > 0, np.round(gap * scale * rate, 2), 0.0)
+            doses[chemical] = doses[chemical] + amount if chemical in doses else amount
+        return doses
+
+    def history_costs(self, columns: Dict[str, np.ndarray], pool_size: Union[float, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Price every dose of history_doses in one pass.
+
+        Returns:
+            Cost key -> cost per reading
+        """
+        doses = self.history_doses(columns, pool_size)
+        chemicals = list(doses)
+        if not chemicals:
+            return {}
+        amounts = np.vstack([doses[chemical] for chemical in chemicals])
+        _, codes = self.cost_batch(chemicals, np.ones(len(chemicals)))
+        costs = amounts * self._price_per_ounce()[codes][:, None]
+        result: Dict[str, np.ndarray] = {}
+        for chemical, code, row in zip(chemicals, codes, costs):
+            if code < 0:
+                continue
+            key = self.keys[code]
+            result[key] = result[key] + row if key in result else row
+        return result
+
+    def monthly_costs(self, timestamps: np.ndarray, columns: Dict[str, np.ndarray],
+                      pool_size: Union[float, np.ndarray]) -> List[Dict]:
+        """
+        Total the cost of every past dose per local calendar month.
+
+        Args:
+            timestamps: Epoch seconds of each reading, ascending
+            columns: Parameter -> float64 values per reading
+            pool_size: Pool volume in gallons
+
+        Returns:
+            [{'month': 'YYYY-MM', 'cost', 'doses', 'readings', 'by_chemical': {key: cost}}]
+            for every month with readings, oldest first
+        """
+        if not len(timestamps):
+            return []
+        costs = self.history_costs(columns, pool_size)
+        months = _month_starts(timestamps[0], timestamps[-1])
+        edges = np.array([datetime.combine(month, datetime.min.time()).timestamp() for month in months])
+        month_of = np.searchsorted(edges, timestamps, side='right') - 1
+        size = len(months) - 1
+        totals = np.zeros(size)
+        doses = np.zeros(size, dtype=np.int64)
+        readings = np.bincount(month_of, minlength=size)
+        by_chemical = {}
+        for key, cost in costs.items():
+            by_chemical[key] = np.bincount(month_of, weights=cost, minlength=size)
+            totals += by_chemical[key]
+            doses += np.bincount(month_of, weights=cost > 0, minlength=size).astype(np.int64)
+        return [{
+            'month': months[i].strftime('%Y-%m'),
+            'cost': round(float(totals[i]), 2),
+            'doses': int(doses[i]),
+            'readings': int(readings[i]),
+            'by_chemical': {key: round(float(values[i]), 2) for key, values in by_chemical.items() if values[i] > 0}
+        } for i in range(size) if readings[i]]
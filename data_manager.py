@@ -0,0 +1,41 @@
+"""
+Deep Blue Pool Chemistry - Data Manager
+Copyright (c) 2024 Michael Hayes. All rights reserved.
+
+This module provides the timestamp helpers shared by the reading and
+alert stores. Readings live in the reading partitions (see
+reading_partitions) and alerts in the alert store (see alert_store),
+which index them by pool and time themselves.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+
+def normalize_timestamp(record: Dict[str, Any]) -> str:
+    """
+    Build a sortable ISO timestamp for a reading or alert record.
+
+    Accepts 'timestamp' in ISO or 'YYYY-MM-DD HH:MM:SS' form, falling back
+    to the separate 'date' and 'time' fields used by older readings.
+    """
+    ts = record.get('timestamp')
+    if not ts:
+        date = record.get('date', '')
+        time_part = record.get('time')
+        ts = f"{date}T{time_part}" if time_part else date
+    ts = str(ts)
+    if len(ts) > 10 and ts[10] == ' ':
+        ts = ts[:10] + 'T' + ts[11:]
+    return ts
+
+
+def _day_bounds(start_date, end_date):
+    """Convert an inclusive date range into [start, end) ISO bounds."""
+    start = start_date.date() if isinstance(start_date, datetime) else start_date
+    end = end_date.date() if isinstance(end_date, datetime) else end_date
+    return start.isoformat(), (end + timedelta(days=1)).isoformat()
@@ -0,0 +1,230 @@
+"""
+Deep Blue Pool Chemistry - Forecast Backtesting
+Copyright (c) 2024 Michael Hayes. All rights reserved.
+
+This module measures one-step-ahead ARIMA accuracy with a rolling-origin
+backtest. The last test_fraction of each parameter's series is cut into
+consecutive folds. The model is fitted once per parameter, on everything
+before the first fold, then walked forward fold by fold: each fold's
+one-step forecasts come from extending the fitted state through it, and
+its observations are then appended to the state (no re-estimation), so a
+parameter costs one fit instead of one per test point.
+
+Parameters are independent and run on the forecaster's process pool. Each
+series' latest result is cached under its scope (e.g. the pool) and name
+together with a fingerprint of its values and the backtest settings, so
+re-running on unchanged data is free and the cache holds one entry per
+pool and parameter.
+"""
+
+import hashlib
+import json
+import math
+import os
+import time
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+import ml_stack
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+
+def _run_series(order: Tuple[int, int, int], values: np.ndarray,
+                bounds: List[Tuple[int, int]]) -> Tuple[List[Tuple[np.ndarray, float]], float]:
+    """
+    Process-pool entry point: fit once before the first fold, then walk forward through every fold.
+
+    Args:
+        order: ARIMA (p, d, q)
+        values: Whole series, oldest first
+        bounds: [origin, end) of each fold, consecutive
+
+    Returns:
+        ([(one-step predictions, wall-clock seconds) per fold], seconds of the fit)
+    """
+    import warnings
+    started = time.perf_counter()
+    ml_stack.load()
+    folds = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        state = ml_stack.ARIMA(values[:bounds[0][0]], order=order).fit()
+        fit_seconds = time.perf_counter() - started
+        for origin, end in bounds:
+            fold_started = time.perf_counter()
+            # Each forecast uses the observations before it, with the coefficients fixed at the fit
+            walked = state.extend(values[origin:end])
+            predictions = np.asarray(walked.forecasts[0], dtype=np.float64)
+            state = state.append(values[origin:end])
+            folds.append((predictions, time.perf_counter() - fold_started))
+    return folds, fit_seconds
+
+
+def _finite(value: float) -> Optional[float]:
+    """Return value, or None where it is undefined (so the JSON cache never holds NaN)."""
+    return float(value) if np.isfinite(value) else None
+
+
+def _metrics(actual: np.ndarray, predicted: np.ndarray) -> Dict[str, Optional[float]]:
+    """RMSE and MAPE (%) of one-step forecasts; MAPE is None when every actual value is zero."""
+    errors = predicted - actual
+    rmse = _finite(np.sqrt(np.mean(errors ** 2)))
+    nonzero = actual != 0
+    mape = _finite(np.mean(np.abs(errors[nonzero] / actual[nonzero])) * 100) if nonzero.any() else None
+    return {'rmse': rmse, 'mape': mape}
+
+
+class Backtester:
+    """
+    Rolling-origin backtests of one-step ARIMA forecasts, cached per series by data fingerprint.
+    """
+
+    def __init__(self, forecaster, folds: int = 4, test_fraction: float = 0.2,
+                 min_train: int = 20, cache_path=None):
+        """
+        Initialize the backtester.
+
+        Args:
+            forecaster: IncrementalForecaster providing the ARIMA order and process pool
+            folds: Number of consecutive test folds
+            test_fraction: Share of each series (from the end) used for testing
+            min_train: Fewest observations before the first origin
+            cache_path: Optional JSON file that keeps results between sessions
+        """
+        self.forecaster = forecaster
+        self.folds = folds
+        self.test_fraction = test_fraction
+        self.min_train = min_train
+        self.cache_path = Path(cache_path) if cache_path else None
+        self._cache: Dict[str, Dict[str, Any]] = self._load_cache()
+        self.hits = 0
+
+    # ==================== CACHE ====================
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+        try:
+            with open(self.cache_path, 'r') as f:
+                cache = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Ignoring unreadable backtest cache {self.cache_path}: {e}")
+            return {}
+        # Entries of the older fingerprint-keyed layout are dropped (they are recomputed on demand)
+        return {key: entry for key, entry in cache.items()
+                if isinstance(entry, dict) and 'fingerprint' in entry and 'result' in entry}
+
+    def _save_cache(self):
+        if self.cache_path is None:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(self._cache, f, allow_nan=False)
+            os.replace(tmp_path, self.cache_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not write backtest cache {self.cache_path}: {e}")
+
+    def fingerprint(self, values: np.ndarray) -> str:
+        """Hash the series together with every setting that affects the result."""
+        digest = hashlib.sha256(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+        # 'single-fit' marks results of the one-fit-per-series walk (earlier caches fitted every fold)
+        digest.update(repr((tuple(self.forecaster.order), self.folds, self.test_fraction, self.min_train,
+                            'single-fit')).encode())
+        return digest.hexdigest()
+
+    # ==================== BACKTESTING ====================
+
+    def fold_bounds(self, n: int) -> List[Tuple[int, int]]:
+        """Return the [origin, end) index range of each fold for a series of length n."""
+        test_len = min(int(n * self.test_fraction), n - self.min_train)
+        if test_len < self.folds:
+            return []
+        size = math.ceil(test_len / self.folds)
+        first = n - test_len
+        return [(origin, min(origin + size, n)) for origin in range(first, n, size)]
+
+    def run(self, series: Dict[str, Any], scope: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Backtest several series (e.g. one per parameter).
+
+        Args:
+            series: Values (oldest first) keyed by name
+            scope: What the series belong to (e.g. a pool id); the cache keeps
+                   the latest result per scope and name
+
+        Returns:
+            Per name: overall 'rmse', 'mape', 'points', 'fit_seconds' and
+            'seconds' (fit plus folds), plus 'folds' with each fold's origin,
+            size, rmse, mape and seconds.
+            rmse and mape are None where undefined (mape when every actual
+            value is zero). Series too short for the configured folds are left out.
+        """
+        started = time.perf_counter()
+        arrays = {name: np.asarray(values, dtype=np.float64) for name, values in series.items()}
+        results: Dict[str, Dict[str, Any]] = {}
+        jobs: Dict[str, List[Tuple[int, int]]] = {}
+        fingerprints: Dict[str, str] = {}
+
+        for name, values in arrays.items():
+            key = self.fingerprint(values)
+            cached = self._cache.get(f"{scope or ''}/{name}")
+            if cached is not None and cached['fingerprint'] == key:
+                results[name] = cached['result']
+                self.hits += 1
+                continue
+            bounds = self.fold_bounds(len(values))
+            if bounds:
+                fingerprints[name] = key
+                jobs[name] = bounds
+
+        outcomes: Dict[str, Any] = {}
+        if self.forecaster.parallel(len(jobs)):
+            executor = self.forecaster.executor()
+            futures = {name: executor.submit(_run_series, self.forecaster.order, arrays[name], bounds)
+                       for name, bounds in jobs.items()}
+            for name, future in futures.items():
+                try:
+                    outcomes[name] = future.result()
+                except Exception as e:
+                    outcomes[name] = e
+        else:
+            for name, bounds in jobs.items():
+                try:
+                    outcomes[name] = _run_series(self.forecaster.order, arrays[name], bounds)
+                except Exception as e:
+                    outcomes[name] = e
+
+        for name, key in fingerprints.items():
+            outcome = outcomes[name]
+            if isinstance(outcome, Exception):
+                logger.error(f"Backtest failed for {name}: {outcome}")
+                continue
+            values = arrays[name]
+            fold_results, fit_seconds = outcome
+            folds = []
+            for (origin, end), (predictions, seconds) in zip(jobs[name], fold_results):
+                folds.append(dict(_metrics(values[origin:end], predictions), origin=origin, size=end - origin,
+                                  seconds=round(seconds, 4)))
+            first, last = jobs[name][0][0], jobs[name][-1][1]
+            predicted = np.concatenate([predictions for predictions, _ in fold_results])
+            result = dict(_metrics(values[first:last], predicted),
+                          points=last - first,
+                          fit_seconds=round(fit_seconds, 4),
+                          seconds=round(fit_seconds + sum(f['seconds'] for f in folds), 4),
+                          folds=folds)
+            results[name] = result
+            # Replaces the previous result of this series, so the cache does not grow with every new reading
+            self._cache[f"{scope or ''}/{name}"] = {'fingerprint': key, 'result': result}
+
+        if fingerprints:
+            self._save_cache()
+        logger.info(f"Backtested {len(results)} series ({len(jobs)} fitted, {self.hits} cached) "
+                    f"in {time.perf_counter() - started:.2f}s")
+        return results
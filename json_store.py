@@ -0,0 +1,300 @@
+"""
+Deep Blue Pool Chemistry - JSON Store
+Copyright (c) 2024 Michael Hayes. All rights reserved.
+
+This module provides a process-wide cache for the application's JSON data
+files (inventory, shopping lists, alerts, schedules, ...). Parsed objects
+are kept per path and revalidated against the file's mtime and size, so
+repeated loads within one user action cost a stat() instead of a parse.
+Saves go through the cache (write-through) and are written behind by a
+background thread: repeated saves of the same file within a short window
+coalesce into one write, and every write goes to a temporary file that is
+swapped in with os.replace, so a crash never leaves a half-written file.
+Call flush() before exit; it is also registered with atexit.
+
+save() serializes the object on the caller's thread, so the writer only
+ever sees a snapshot taken at save time. A write that fails stays pending
+(loads keep returning the saved object) and is retried every retry_delay
+seconds; take_failures() reports failed files to the UI, and save(...,
+defer=False) raises the error for callers that check the result.
+
+Cached objects are shared: callers that change a loaded object should
+deep-copy it first and save the copy, so an unsaved (or failed, or
+discarded) change never shows up in other callers' loads.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+
+class JsonCache:
+    """
+    Parsed JSON files keyed by absolute path, validated by (mtime, size).
+    """
+
+    def __init__(self, write_delay: float = 0.5, retry_delay: float = 5.0):
+        """
+        Initialize an empty cache.
+
+        Args:
+            write_delay: Seconds a save waits for further saves of the same file
+            retry_delay: Seconds before a failed write is tried again
+        """
+        self.write_delay = write_delay
+        self.retry_delay = retry_delay
+        self._entries: Dict[str, Tuple[Optional[Tuple[int, int]], Any]] = {}
+        self._lock = threading.RLock()
+        self._cond = threading.Condition(self._lock)
+        # Path -> (saved object, its JSON text, due time)
+        self._pending: Dict[str, Tuple[Any, str, float]] = {}
+        self._writing: Set[str] = set()
+        self._failed: Dict[str, str] = {}
+        self._unreported: Dict[str, str] = {}
+        self._writer: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+        self.saves = 0
+        self.writes = 0
+        atexit.register(self.flush)
+
+    @staticmethod
+    def _key(path) -> str:
+        return os.path.abspath(os.fspath(path))
+
+    @staticmethod
+    def _signature(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    # ==================== LOADING ====================
+
+    def load(self, path, default: Any = None) -> Any:
+        """
+        Load a JSON file, reusing the parsed object if the file is unchanged.
+
+        Args:
+            path: File path
+            default: Value returned when the file does not exist
+
+        Returns:
+            Parsed JSON (shared with other callers), or default
+
+        Raises:
+            json.JSONDecodeError, OSError: If the file exists but cannot be read
+        """
+        key = self._key(path)
+        with self._lock:
+            if key in self._pending or key in self._writing:
+                # Memory is ahead of disk until the write-behind lands
+                self.hits += 1
+                return self._entries[key][1]
+
+        signature = self._signature(key)
+        if signature is None:
+            with self._lock:
+                self._entries.pop(key, None)
+                self.misses += 1
+            return default
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                return entry[1]
+
+        # Parse outside the lock; a concurrent change just leaves a stale
+        # signature that fails validation on the next load
+        with open(key, 'r') as f:
+            data = json.load(f)
+
+        with self._lock:
+            self._entries[key] = (signature, data)
+            self.misses += 1
+        return data
+
+    # ==================== SAVING ====================
+
+    def save(self, path, data: Any, indent: Optional[int] = 4, defer: bool = True) -> None:
+        """
+        Store a JSON object and schedule it to be written to disk.
+
+        The object is serialized now and the cache is updated immediately.
+        Saves of the same file within write_delay seconds are coalesced into
+        a single write of the latest snapshot.
+
+        Args:
+            path: File path
+            data: JSON-serializable object
+            indent: Indentation passed to json.dumps
+            defer: False to write (and wait for) the file before returning
+
+        Raises:
+            TypeError, ValueError: If data is not JSON-serializable
+            OSError: With defer=False, if the file could not be written (the
+                     save stays pending and is retried)
+        """
+        key = self._key(path)
+        text = json.dumps(data, indent=indent)
+        with self._cond:
+            self._entries[key] = (None, data)
+            previous = self._pending.get(key)
+            due = previous[2] if previous else time.monotonic() + self.write_delay
+            self._pending[key] = (data, text, due)
+            self.saves += 1
+            self._ensure_writer()
+            self._cond.notify_all()
+        if not defer:
+            self.flush()
+            with self._lock:
+                error = self._failed.get(key) if key in self._pending else None
+                self._unreported.pop(key, None)
+            if error is not None:
+                raise OSError(f"Could not write {key}: {error}")
+
+    def flush(self) -> bool:
+        """
+        Write every pending file now and wait for in-flight writes.
+
+        Each file is tried once; failed files stay pending for the writer's retry.
+
+        Returns:
+            True if nothing is left pending
+        """
+        tried: Set[str] = set()
+        while True:
+            with self._cond:
+                batch = self._take(lambda due: True, skip=tried)
+                if not batch:
+                    if not self._writing:
+                        return not self._pending
+                    self._cond.wait(0.1)
+                    continue
+            tried.update(batch)
+            self._write_batch(batch)
+
+    # ==================== WRITER ====================
+
+    def _ensure_writer(self):
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._run, name="json-writer", daemon=True)
+            self._writer.start()
+
+    def _take(self, is_due: Callable[[float], bool],
+              skip: Set[str] = frozenset()) -> Dict[str, Tuple[Any, str, float]]:
+        """Move due files that are not already being written into the writing set (lock held)."""
+        batch = {
+            key: entry for key, entry in self._pending.items()
+            if key not in self._writing and key not in skip and is_due(entry[2])
+        }
+        for key in batch:
+            del self._pending[key]
+            self._writing.add(key)
+        return batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                now = time.monotonic()
+                batch = self._take(lambda due: due <= now)
+                if not batch:
+                    waiting = [due for key, (_, _, due) in self._pending.items() if key not in self._writing]
+                    self._cond.wait(max(0.0, min(waiting) - now) if waiting else None)
+                    continue
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: Dict[str, Tuple[Any, str, float]]):
+        for key, (data, text, _) in batch.items():
+            error = None
+            try:
+                self._write_file(key, text)
+            except OSError as e:
+                error = str(e)
+                logger.error(f"Error writing {key} (retrying in {self.retry_delay:.0f}s): {e}")
+
+            with self._cond:
+                self._writing.discard(key)
+                if error is not None:
+                    # Keep the snapshot pending (a newer save replaces it) so it is not lost
+                    if key not in self._pending:
+                        self._pending[key] = (data, text, time.monotonic() + self.retry_delay)
+                    if key not in self._failed:
+                        self._unreported[key] = error
+                    self._failed[key] = error
+                else:
+                    if self._failed.pop(key, None) is not None:
+                        logger.info(f"Wrote {key} after earlier failures")
+                    self._unreported.pop(key, None)
+                    if key not in self._pending:
+                        entry = self._entries.get(key)
+                        if entry is not None and entry[1] is data:
+                            self._entries[key] = (self._signature(key), data)
+                self._cond.notify_all()
+
+    def _write_file(self, key: str, text: str):
+        """Write to a temporary file and swap it in, so readers never see a partial file."""
+        os.makedirs(os.path.dirname(key), exist_ok=True)
+        tmp_path = key + ".tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, key)
+        self.writes += 1
+
+    # ==================== MAINTENANCE ====================
+
+    def invalidate(self, path=None) -> None:
+        """Drop one cached file, or every file when path is None."""
+        with self._lock:
+            if path is None:
+                self._entries = {k: v for k, v in self._entries.items()
+                                 if k in self._pending or k in self._writing}
+            elif self._key(path) not in self._pending and self._key(path) not in self._writing:
+                self._entries.pop(self._key(path), None)
+
+    def discard_pending(self) -> None:
+        """Drop every write not yet started, e.g. before files are restored from a backup."""
+        with self._cond:
+            if self._pending:
+                logger.warning(f"Discarding {len(self._pending)} unwritten JSON saves")
+            self._pending.clear()
+            self._failed.clear()
+            self._unreported.clear()
+            self._cond.notify_all()
+
+    def take_failures(self) -> Dict[str, str]:
+        """
+        Return files whose write has started failing since the last call.
+
+        Returns:
+            Path -> error message (each failure is reported once until the file is written)
+        """
+        with self._lock:
+            failures, self._unreported = self._unreported, {}
+            return failures
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss and save/write counters and the number of cached files."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'saves': self.saves,
+                'writes': self.writes,
+                'pending': len(self._pending),
+                'failed': len(self._failed)
+            }
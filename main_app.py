@@ -18,8 +18,10 @@ Version 3.8.2 - Critical Health Score &amp; ORP Fixes
 
 import os
 import sys
+import copy
 import json
 import time
+_STARTUP_STARTED = time.perf_counter()  # Reference point for the startup timing report
 import logging
 import threading
 from datetime import datetime, timedelta
@@ -43,7 +45,6 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
 from email.utils import formatdate
-import openpyxl
 from reportlab.lib.pagesizes import letter, inch
 from reportlab.pdfgen import canvas
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image
@@ -293,6 +294,7 @@ CHEMICAL_THRESHOLDS = {
 
 DEFAULT_WINDOW_SIZE = (1400, 1000)
 MIN_WINDOW_SIZE = (800, 600)
+MIN_BACKTEST_READINGS = 30  # Valid readings a parameter needs before its forecasts are backtested
 WEATHER_API_KEY_NAME = os.environ.get("WEATHER_API_KEY")
 COLOR_SCHEME = {
     'primary': "#2196F3",
@@ -390,24 +392,25 @@ def decrypt_data(data, key):
         logger.error(f"Decryption failed: {e}")
         return data  # Ultimate fallback
 
-def save_json(data, file_path):
-    """Fallback JSON save function"""
+# Parsed data/*.json files, revalidated by mtime and size and saved write-behind
+from json_store import JsonCache
+json_cache = JsonCache()
+
+def save_json(data, file_path, indent=4):
+    """Save JSON through the shared cache, writing it before returning"""
     try:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=4)
+        json_cache.save(file_path, data, indent=indent, defer=False)
         return True
     except Exception as e:
         logger.error(f"Error saving JSON: {e}")
         return False
 
 def load_json(file_path, default=None):
-    """Fallback JSON load function"""
+    """Load JSON through the shared cache"""
     try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError, PermissionError, IOError):
-        return default or {}
+        return json_cache.load(file_path, {} if default is None else default)
+    except (json.JSONDecodeError, PermissionError, IOError):
+        return {} if default is None else default
 
 def create_backup(source_path, backup_dir):
     """Fallback backup function"""
@@ -424,44 +427,8 @@ def create_backup(source_path, backup_dir):
 # Import other modules (with fallbacks)
 
 # ==================== ML LIBRARY IMPORTS ====================
-# Try to import ML libraries with fallback
-ML_AVAILABLE = False
-try:
-    from sklearn.preprocessing import StandardScaler
-    from sklearn.ensemble import IsolationForest
-    from sklearn.linear_model import LinearRegression
-    from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-    from statsmodels.tsa.arima.model import ARIMA
-    import joblib
-    ML_AVAILABLE = True
-    print("ML libraries loaded successfully")
-except ImportError as e:
-    print(f"ML libraries not available: {e}")
-    print("ML Analytics will use fallback mode")
-    # Define dummy classes for fallback
-    class StandardScaler:
-        def fit_transform(self, X): return X
-        def transform(self, X): return X
-    class IsolationForest:
-        def __init__(self, **kwargs): pass
-        def fit(self, X): pass
-        def predict(self, X): return [1] * len(X)
-    class LinearRegression:
-        def __init__(self): pass
-        def fit(self, X, y): pass
-        def predict(self, X): return [0] * len(X)
-    class ARIMA:
-        def __init__(self, *args, **kwargs): pass
-        def fit(self): return self
-        def forecast(self, steps): return [0] * steps
-    def mean_squared_error(y_true, y_pred): return 0.0
-    def mean_absolute_error(y_true, y_pred): return 0.0
-    def r2_score(y_true, y_pred): return 0.0
-    class joblib:
-        @staticmethod
-        def dump(*args, **kwargs): pass
-        @staticmethod
-        def load(*args, **kwargs): return None
+# scikit-learn, statsmodels and joblib are imported on first use (see ml_stack)
+import ml_stack
 
 
 
@@ -481,20 +448,23 @@ class PoolAnalyticsEngineV2:
     - Comprehensive data validation
     """
     
-    def __init__(self, models_dir: str = "models"):
+    def __init__(self, models_dir: str = "models", forecast_workers: Optional[int] = None):
         """
         Initialize the ML Analytics Engine
         
         Args:
             models_dir: Directory to save/load trained models
+            forecast_workers: Processes used for ARIMA fits (None for one per CPU, 1 for in-process)
         """
         self.models_dir = Path(models_dir)
         self.models_dir.mkdir(exist_ok=True)
         
-        # ML models and scalers
-        self.arima_models = {}
-        self.anomaly_detector = None
-        self.scaler = StandardScaler() if ML_AVAILABLE else None
+        # ML models, stored per (pool, parameter, model type) and loaded on demand
+        self.registry = ModelRegistry(self.models_dir / "registry")
+        self.forecaster = IncrementalForecaster(order=(1, 1, 1), workers=forecast_workers,
+                                                registry=self.registry)  # ARIMA state per (pool, parameter)
+        self.backtester = Backtester(self.forecaster, cache_path=self.models_dir / "backtests.json")
+        self.anomaly_models = AnomalyModelStore(self.registry)  # Trained Isolation Forest per pool
         
         # Configuration
         self.parameters = [
@@ -527,13 +497,17 @@ class PoolAnalyticsEngineV2:
             'bromine': 18.00,
             'salt': 0.50
         }
+        self.cost_catalog = ChemicalCatalog(self.chemical_costs)
+        
+        # Results memoized per (method, prepared dataset hash, arguments)
+        self.results = ResultMemo()
         
         # Performance tracking
         self.prediction_accuracy = {}
         self.model_performance = {}
         
-        # Load existing models if available
-        self.load_models()
+        # The model registry is indexed by warm_up(), not at startup
+        self._models_loaded = False
         
         logger.info("ML Analytics Engine V2 initialized")
     
@@ -600,6 +574,9 @@ class PoolAnalyticsEngineV2:
         """
         Clean and validate a list of readings
         
+        All readings are checked in one vectorized pass (validate_batch);
+        the error strings are only formatted when the returned list is read.
+        
         Args:
             readings: List of reading dictionaries
             
@@ -612,16 +589,9 @@ class PoolAnalyticsEngineV2:
         if not isinstance(readings, list):
             return [], ["Readings must be a list"]
         
-        cleaned = []
-        all_errors = []
-        
-        for i, reading in enumerate(readings):
-            is_valid, errors = self.validate_reading(reading)
-            
-            if is_valid:
-                cleaned.append(reading)
-            else:
-                all_errors.append(f"Reading {i+1}: {', '.join(errors)}")
+        valid, codes, _ = validate_batch(readings)
+        cleaned = [readings[i] for i in np.flatnonzero(valid)]
+        all_errors = ValidationErrors(codes)
         
         logger.info(f"Validated {len(readings)} readings: {len(cleaned)} valid, {len(all_errors)} errors")
         
@@ -661,89 +631,193 @@ class PoolAnalyticsEngineV2:
             logger.warning(f"Could not convert {param} value '{value}': {e}")
             return None
     
+    def _clean_view(self, view: 'ColumnView') -> 'ColumnView':
+        """
+        Drop rows of a column view that fail validate_reading
+        
+        Args:
+            view: Column view of readings
+            
+        Returns:
+            Column view containing only valid rows
+        """
+        # Error codes are computed once when the pool's columns are built
+        valid = view.valid_mask()
+        if valid.all():
+            return view
+        return view.take(np.flatnonzero(valid))
+    
+    def prepare(self, historical_data) -> 'PreparedDataset':
+        """
+        Clean a history once and extract every parameter as an array
+        
+        Every analytics method accepts the returned dataset in place of raw
+        readings, and memoizes its result under the dataset's hash.
+        
+        Args:
+            historical_data: Historical readings (list of readings, ColumnView or PreparedDataset)
+            
+        Returns:
+            PreparedDataset of the valid readings
+        """
+        if isinstance(historical_data, PreparedDataset):
+            return historical_data
+        if isinstance(historical_data, ColumnView):
+            cleaned_data = self._clean_view(historical_data)
+        else:
+            cleaned_data, _ = self.clean_and_validate_data(historical_data)
+        return PreparedDataset(cleaned_data, self._feature_matrix(cleaned_data, missing=np.nan), self.parameters)
+    
+    def _parameter_series(self, data, param: str) -> np.ndarray:
+        """
+        Extract sanitized values for one parameter
+        
+        Args:
+            data: Prepared dataset, cleaned column view or list of cleaned readings
+            param: Parameter name
+            
+        Returns:
+            Array of valid values (same rules as sanitize_value), oldest first
+        """
+        if isinstance(data, PreparedDataset):
+            return data.series(param)
+        
+        if isinstance(data, ColumnView):
+            col = data.column(param)
+            return col[np.isfinite(col) & (col >= 0) & (col <= 10000)]
+        
+        values = [self.sanitize_value(reading.get(param), param) for reading in data]
+        return np.array([v for v in values if v is not None], dtype=float)
+    
+    def _feature_matrix(self, data, missing: float = 0.0) -> np.ndarray:
+        """
+        Build the (readings x parameters) matrix used for anomaly detection
+        
+        Args:
+            data: Prepared dataset, cleaned column view or list of cleaned readings
+            missing: Value used for invalid or missing values (NaN for statistics)
+            
+        Returns:
+            2-D array with invalid or missing values replaced by missing
+        """
+        if isinstance(data, PreparedDataset):
+            return data.features(missing)
+        
+        if isinstance(data, ColumnView):
+            columns = []
+            for param in self.parameters:
+                col = data.column(param)
+                ok = np.isfinite(col) & (col >= 0) & (col <= 10000)
+                columns.append(np.where(ok, col, missing))
+            return np.column_stack(columns) if columns else np.empty((len(data), 0))
+        
+        X = []
+        for reading in data:
+            row = []
+            for param in self.parameters:
+                val = self.sanitize_value(reading.get(param), param)
+                row.append(val if val is not None else missing)
+            X.append(row)
+        return np.array(X)
+    
     # ==================== PREDICTIONS (ARIMA) ====================
     
-    def predict_next_readings(self, historical_data: List[Dict]) -> Dict[str, Any]:
+    def predict_next_readings(self, historical_data: List[Dict], pool_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Predict next readings using ARIMA time series forecasting
         
+        With a pool_id, fitted models are kept per (pool, parameter) and only
+        extended with readings added since the previous call; they are
+        re-estimated on a schedule or when a drift test fails.
+        
         Args:
-            historical_data: List of historical readings
+            historical_data: Historical readings (list of readings or ColumnView)
+            pool_id: Pool the history belongs to (None fits from scratch without caching)
             
         Returns:
             Dictionary with predictions and confidence intervals
         """
-        if not ML_AVAILABLE:
-            logger.warning("ML libraries not available - using fallback method")
-            return self._predict_fallback(historical_data)
+        if not ml_stack.available():
+            return self.predict_pools({pool_id: historical_data}, cache=pool_id is not None)[pool_id]
+        dataset = self.prepare(historical_data)
+        return self.results.get(
+            'predict_next_readings', dataset, pool_id,
+            lambda: self.predict_pools({pool_id: dataset}, cache=pool_id is not None)[pool_id]
+        )
+    
+    def predict_pools(self, histories: Dict[Optional[str], Any], cache: bool = True) -> Dict[Optional[str], Dict[str, Any]]:
+        """
+        Predict next readings for several pools at once
         
-        # Validate and clean data
-        cleaned_data, errors = self.clean_and_validate_data(historical_data)
+        The ARIMA fits of every parameter of every pool are independent, so
+        the ones that need a full fit run together on the forecaster's
+        process pool (see forecast_workers).
         
-        if len(cleaned_data) < 20:
-            logger.warning(f"Insufficient data for ARIMA: {len(cleaned_data)} readings (need 20+)")
-            return self._predict_fallback(cleaned_data)
+        Args:
+            histories: Historical readings (list of readings or ColumnView) keyed by pool_id
+            cache: Keep and extend fitted models per (pool, parameter)
+            
+        Returns:
+            Predictions keyed by pool_id, each in predict_next_readings' format
+        """
+        if not ml_stack.available():
+            logger.warning("ML libraries not available - using fallback method")
+            return {pool_id: self._predict_fallback(data) for pool_id, data in histories.items()}
         
-        predictions = {}
+        # Validate and clean data
+        cleaned = {pool_id: self.prepare(historical_data) for pool_id, historical_data in histories.items()}
         
-        for param in self.parameters:
-            try:
-                # Extract time series
-                values = []
-                for reading in cleaned_data:
-                    val = self.sanitize_value(reading.get(param), param)
-                    if val is not None:
-                        values.append(val)
-                
+        # Extract time series
+        series = {}
+        for pool_id, cleaned_data in cleaned.items():
+            if len(cleaned_data) < 20:
+                logger.warning(f"Insufficient data for ARIMA: {len(cleaned_data)} readings (need 20+)")
+                continue
+            for param in self.parameters:
+                values = self._parameter_series(cleaned_data, param)
                 if len(values) < 20:
                     logger.debug(f"Skipping {param}: insufficient data ({len(values)} values)")
                     continue
+                series[(pool_id, param)] = values
+        
+        # ARIMA(1,1,1) forecasts with 95% confidence intervals
+        outcomes = self.forecaster.forecast_many(series, alpha=0.05, cache=cache)
+        
+        results = {}
+        for pool_id, cleaned_data in cleaned.items():
+            predictions = {}
+            for param in self.parameters:
+                outcome = outcomes.get((pool_id, param))
+                if outcome is None:
+                    continue
+                if isinstance(outcome, Exception):
+                    logger.error(f"ARIMA failed for {param}: {outcome}")
+                    # Fallback to simple method for this parameter
+                    fallback = self._predict_single_param_fallback(cleaned_data.data, param)
+                    if fallback:
+                        predictions[param] = fallback
+                    continue
                 
-                # Fit ARIMA model (1,1,1) - can be tuned
-                model = ARIMA(values, order=(1, 1, 1))
-                fitted = model.fit()
-                
-                # Forecast next value with 95% confidence interval
-                forecast = fitted.forecast(steps=1)
-                forecast_obj = fitted.get_forecast(steps=1)
-                conf_int = forecast_obj.conf_int()
-                
-                # Handle both DataFrame and array returns
-                if hasattr(conf_int, 'iloc'):
-                    lower = float(conf_int.iloc[0, 0])
-                    upper = float(conf_int.iloc[0, 1])
-                else:
-                    lower = float(conf_int[0][0])
-                    upper = float(conf_int[0][1])
-                
+                forecast, _ = outcome
                 predictions[param] = {
-                    'value': float(forecast[0]),
-                    'lower_bound': lower,
-                    'upper_bound': upper,
+                    'value': forecast['value'],
+                    'lower_bound': forecast['lower_bound'],
+                    'upper_bound': forecast['upper_bound'],
                     'confidence': 0.95,
                     'method': 'ARIMA(1,1,1)',
-                    'data_points': len(values)
+                    'data_points': len(series[(pool_id, param)])
                 }
-                
-                # Store model for later use
-                self.arima_models[param] = fitted
-                
-                logger.debug(f"ARIMA prediction for {param}: {forecast[0]:.2f}")
-                
-            except Exception as e:
-                logger.error(f"ARIMA failed for {param}: {e}")
-                # Fallback to simple method for this parameter
-                fallback = self._predict_single_param_fallback(cleaned_data, param)
-                if fallback:
-                    predictions[param] = fallback
-        
-        if predictions:
-            logger.info(f"Generated ARIMA predictions for {len(predictions)} parameters")
-        else:
-            logger.warning("No ARIMA predictions generated - using fallback")
-            return self._predict_fallback(cleaned_data)
+                logger.debug(f"ARIMA prediction for {param}: {forecast['value']:.2f} ({forecast['update']})")
+            
+            if predictions:
+                logger.info(f"Generated ARIMA predictions for {len(predictions)} parameters")
+            else:
+                logger.warning("No ARIMA predictions generated - using fallback")
+                predictions = self._predict_fallback(cleaned_data.data)
+            results[pool_id] = predictions
         
-        return predictions
+        logger.info(f"ARIMA forecaster: {self.forecaster.stats()}")
+        return results
     
     def _predict_fallback(self, historical_data: List[Dict]) -> Dict[str, Any]:
         """
@@ -780,13 +854,11 @@ class PoolAnalyticsEngineV2:
         """
         try:
             # Extract values
-            values = []
-            recent_data = historical_data[-10:] if len(historical_data) >= 10 else historical_data
-            
-            for reading in recent_data:
-                val = self.sanitize_value(reading.get(param), param)
-                if val is not None:
-                    values.append(val)
+            if isinstance(historical_data, ColumnView):
+                recent_data = historical_data.tail(10)
+            else:
+                recent_data = historical_data[-10:] if len(historical_data) >= 10 else historical_data
+            values = self._parameter_series(recent_data, param)
             
             if len(values) < 3:
                 return None
@@ -813,23 +885,38 @@ class PoolAnalyticsEngineV2:
     
     # ==================== ANOMALY DETECTION ====================
     
-    def detect_anomalies(self, readings: Dict[str, Any], historical_data: List[Dict]) -> List[Dict]:
+    def detect_anomalies(self, readings: Dict[str, Any], historical_data: List[Dict],
+                         pool_id: Optional[str] = None) -> List[Dict]:
         """
         Detect anomalies using Isolation Forest ML algorithm
         
+        With a pool_id, the trained forest is kept per pool (and on disk) and
+        reused until enough new readings arrive or their scores drift; see
+        AnomalyModelStore.
+        
         Args:
             readings: Current readings to check
-            historical_data: Historical data for training
+            historical_data: Historical data for training (list of readings, ColumnView or PreparedDataset)
+            pool_id: Pool the history belongs to (None trains a fresh forest without caching)
             
         Returns:
             List of detected anomalies with details
         """
-        if not ML_AVAILABLE:
-            logger.warning("ML libraries not available - using fallback method")
-            return self._detect_anomalies_fallback(readings, historical_data)
+        dataset = self.prepare(historical_data)
+        current = tuple(self.sanitize_value(readings.get(param), param) for param in self.parameters)
+        return self.results.get(
+            'detect_anomalies', dataset, (pool_id, current),
+            lambda: self._detect_anomalies(readings, dataset, pool_id)
+        )
+    
+    def _detect_anomalies(self, readings: Dict[str, Any], dataset: 'PreparedDataset',
+                          pool_id: Optional[str]) -> List[Dict]:
+        """Isolation Forest check of one reading against a prepared history"""
+        cleaned_data = dataset.data
         
-        # Validate data
-        cleaned_data, _ = self.clean_and_validate_data(historical_data)
+        if not ml_stack.available():
+            logger.warning("ML libraries not available - using fallback method")
+            return self._detect_anomalies_fallback(readings, cleaned_data)
         
         if len(cleaned_data) < 30:
             logger.warning(f"Insufficient data for Isolation Forest: {len(cleaned_data)} readings (need 30+)")
@@ -837,26 +924,10 @@ class PoolAnalyticsEngineV2:
         
         try:
             # Prepare feature matrix
-            X = []
-            for reading in cleaned_data:
-                row = []
-                for param in self.parameters:
-                    val = self.sanitize_value(reading.get(param), param)
-                    row.append(val if val is not None else 0.0)
-                X.append(row)
-            
-            X = np.array(X)
-            
-            # Train Isolation Forest
-            clf = IsolationForest(
-                contamination=0.1,  # Expect 10% anomalies
-                random_state=42,
-                n_estimators=100
-            )
-            clf.fit(X)
+            X = dataset.features()
             
-            # Store model
-            self.anomaly_detector = clf
+            # Isolation Forest (10% expected anomalies), retrained only when needed
+            clf = self.anomaly_models.detector(pool_id, X)
             
             # Check current reading
             current_row = []
@@ -918,6 +989,83 @@ class PoolAnalyticsEngineV2:
             logger.error(f"Isolation Forest failed: {e}")
             return self._detect_anomalies_fallback(readings, cleaned_data)
     
+    def score_history(self, historical_data, pool_id: Optional[str] = None,
+                      window: int = 30, z_threshold: float = 3.0, training=None) -> Dict[str, Any]:
+        """
+        Score every reading of a history for anomalies in one pass
+        
+        The pool's Isolation Forest (see detect_anomalies) scores all rows
+        with a single score_samples call; per-parameter z-scores compare each
+        reading with the rolling mean/std of the window readings before it.
+        A row is flagged only when the forest puts it below its offset and at
+        least one of its parameters is also beyond z_threshold, so a history
+        without real outliers comes back with no flags (the forest alone
+        marks its contamination share of the training rows by construction).
+        
+        Args:
+            historical_data: Historical readings, oldest first (list of readings, ColumnView or PreparedDataset)
+            pool_id: Pool the history belongs to (reuses its trained detector)
+            window: Preceding readings used for the rolling z-scores
+            z_threshold: |z| above which a parameter counts as anomalous
+            training: The pool's full history to train the detector on when
+                      historical_data is only part of it (default historical_data),
+                      so scoring a date range reuses the same detector
+            
+        Returns:
+            Dictionary with 'data' (the cleaned readings the rows refer to),
+            'parameters', 'scores' (Isolation Forest score per row, lower is
+            more anomalous, or None), 'flags' (anomalous rows), 'values',
+            'z_scores' and 'expected' (rows x parameters, NaN where missing),
+            'z_flags' (|z| > z_threshold) and 'method'
+        """
+        dataset = self.prepare(historical_data)
+        training = dataset if training is None else self.prepare(training)
+        return self.results.get(
+            'score_history', dataset, (pool_id, window, z_threshold, training.key),
+            lambda: self._score_history(dataset, pool_id, window, z_threshold, training)
+        )
+    
+    def _score_history(self, dataset: 'PreparedDataset', pool_id: Optional[str],
+                       window: int, z_threshold: float, training: 'PreparedDataset') -> Dict[str, Any]:
+        """Batch anomaly scores of a prepared history"""
+        cleaned_data = dataset.data
+        values = dataset.values
+        if values.size:
+            z_scores, expected = rolling_zscores(values, window=window)
+        else:
+            z_scores = expected = np.empty((len(cleaned_data), len(self.parameters)))
+        with np.errstate(invalid='ignore'):
+            z_flags = np.abs(z_scores) > z_threshold
+        
+        result = {
+            'data': cleaned_data,
+            'parameters': list(self.parameters),
+            'values': values,
+            'scores': None,
+            'flags': z_flags.any(axis=1),
+            'z_scores': z_scores,
+            'expected': expected,
+            'z_flags': z_flags,
+            'method': 'Rolling Z-Score'
+        }
+        
+        if not ml_stack.available() or len(training) < 30 or not len(cleaned_data):
+            return result
+        
+        try:
+            X = dataset.features()
+            clf = self.anomaly_models.detector(pool_id, training.features())
+            scores = clf.score_samples(X)
+            # Below the fitted offset (IsolationForest.predict's -1) and confirmed by a z-score
+            result['scores'] = scores
+            result['flags'] = (scores < clf.offset_) & z_flags.any(axis=1)
+            result['method'] = 'Isolation Forest'
+            logger.info(f"Scored {len(X)} readings: {int(result['flags'].sum())} anomalous")
+        except Exception as e:
+            logger.error(f"Isolation Forest scoring failed: {e}")
+        
+        return result
+    
     def _detect_anomalies_fallback(self, readings: Dict[str, Any], historical_data: List[Dict]) -> List[Dict]:
         """
         Fallback anomaly detection using z-scores
@@ -929,9 +1077,14 @@ class PoolAnalyticsEngineV2:
         Returns:
             List of anomalies
         """
-        if not historical_data or len(historical_data) < 5:
+        if historical_data is None or len(historical_data) < 5:
             return []
         
+        if isinstance(historical_data, ColumnView):
+            recent_data = historical_data.tail(30)  # Last 30 readings
+        else:
+            recent_data = historical_data[-30:]
+        
         anomalies = []
         
         try:
@@ -942,11 +1095,7 @@ class PoolAnalyticsEngineV2:
                     continue
                 
                 # Get historical values
-                historical_values = []
-                for reading in historical_data[-30:]:  # Last 30 readings
-                    val = self.sanitize_value(reading.get(param), param)
-                    if val is not None:
-                        historical_values.append(val)
+                historical_values = self._parameter_series(recent_data, param)
                 
                 if len(historical_values) < 5:
                     continue
@@ -993,89 +1142,69 @@ class PoolAnalyticsEngineV2:
         Analyze trends using polynomial regression
         
         Args:
-            historical_data: Historical readings
+            historical_data: Historical readings (list of readings, ColumnView or PreparedDataset)
             
         Returns:
             Dictionary of trend analysis for each parameter
         """
-        # Validate data
-        cleaned_data, _ = self.clean_and_validate_data(historical_data)
-        
+        dataset = self.prepare(historical_data)
+        return self.results.get('analyze_trends', dataset, None, lambda: self._analyze_trends(dataset))
+    
+    def _analyze_trends(self, cleaned_data: 'PreparedDataset') -> Dict[str, Dict]:
+        """Linear trend of every parameter of a prepared history"""
         if len(cleaned_data) < 7:
             logger.warning(f"Insufficient data for trend analysis: {len(cleaned_data)} readings (need 7+)")
             return {}
         
+        # Closed-form least squares for every parameter at once (NaN values masked)
+        fit = fit_trends(cleaned_data.values, horizon=7)
+        
         trends = {}
         
-        for param in self.parameters:
-            try:
-                # Extract time series
-                values = []
-                for reading in cleaned_data:
-                    val = self.sanitize_value(reading.get(param), param)
-                    if val is not None:
-                        values.append(val)
-                
-                if len(values) < 7:
-                    continue
-                
-                # Prepare data for regression
-                X = np.arange(len(values)).reshape(-1, 1)
-                y = np.array(values)
-                
-                # Fit linear regression
-                model = LinearRegression()
-                model.fit(X, y)
-                
-                # Calculate predictions and R²
-                y_pred = model.predict(X)
-                r_squared = r2_score(y, y_pred)
-                slope = model.coef_[0]
-                
-                # Determine direction and strength
-                # Use more sensitive threshold for trend detection
-                if abs(slope) < 0.005:
-                    direction = 'stable'
-                    strength = 'weak'
-                elif slope > 0:
-                    direction = 'increasing'
-                    strength = 'strong' if abs(slope) > 0.05 else 'moderate'
-                else:
-                    direction = 'decreasing'
-                    strength = 'strong' if abs(slope) > 0.05 else 'moderate'
-                
-                # Forecast next 7 days
-                future_X = np.arange(len(values), len(values) + 7).reshape(-1, 1)
-                forecast = model.predict(future_X)
-                
-                trends[param] = {
-                    'direction': direction,
-                    'rate': float(slope),
-                    'confidence': float(max(0, min(1, r_squared))),
-                    'strength': strength,
-                    'forecast_7d': [float(v) for v in forecast],
-                    'current_value': float(values[-1]),
-                    'data_points': len(values)
-                }
-                
-                logger.debug(f"Trend analysis for {param}: {direction} ({strength})")
-                
-            except Exception as e:
-                logger.error(f"Trend analysis failed for {param}: {e}")
+        for i, param in enumerate(cleaned_data.parameters):
+            if fit['n'][i] < 7:
                 continue
+            
+            slope = fit['slope'][i]
+            
+            # Determine direction and strength
+            # Use more sensitive threshold for trend detection
+            if abs(slope) < 0.005:
+                direction = 'stable'
+                strength = 'weak'
+            elif slope > 0:
+                direction = 'increasing'
+                strength = 'strong' if abs(slope) > 0.05 else 'moderate'
+            else:
+                direction = 'decreasing'
+                strength = 'strong' if abs(slope) > 0.05 else 'moderate'
+            
+            trends[param] = {
+                'direction': direction,
+                'rate': float(slope),
+                'confidence': float(max(0, min(1, fit['r2'][i]))),
+                'strength': strength,
+                'forecast_7d': [float(v) for v in fit['forecast'][:, i]],
+                'current_value': float(fit['current'][i]),
+                'data_points': int(fit['n'][i])
+            }
+            
+            logger.debug(f"Trend analysis for {param}: {direction} ({strength})")
         
         logger.info(f"Trend analysis complete for {len(trends)} parameters")
         return trends
     
     # ==================== INSIGHTS GENERATION ====================
     
-    def get_insights(self, readings: Dict[str, Any], historical_data: List[Dict]) -> List[Dict]:
+    def get_insights(self, readings: Dict[str, Any], historical_data: List[Dict],
+                     pool_id: Optional[str] = None) -> List[Dict]:
         """
         Generate AI-powered insights from data
         
         Args:
             readings: Current readings
             historical_data: Historical data
+            pool_id: Pool the history belongs to (reuses its trained anomaly detector)
             
         Returns:
             List of insights with priorities and actions
@@ -1083,9 +1212,12 @@ class PoolAnalyticsEngineV2:
         insights = []
         
         try:
+            # Clean the history once for both analyses
+            dataset = self.prepare(historical_data)
+            
             # Get trends and anomalies
-            trends = self.analyze_trends(historical_data)
-            anomalies = self.detect_anomalies(readings, historical_data)
+            trends = self.analyze_trends(dataset)
+            anomalies = self.detect_anomalies(readings, dataset, pool_id)
             
             # Add anomaly insights (highest priority)
             for anomaly in anomalies:
@@ -1192,13 +1324,18 @@ class PoolAnalyticsEngineV2:
     
     # ==================== COST OPTIMIZATION ====================
     
-    def optimize_chemical_usage(self, current_readings: Dict, adjustments: List[Dict]) -> Dict[str, Any]:
+    def optimize_chemical_usage(self, current_readings: Dict, adjustments: List[Dict],
+                                history: "Optional[ColumnView]" = None,
+                                pool_size: Optional[float] = None) -> Dict[str, Any]:
         """
         Analyze chemical usage and provide cost optimization recommendations
         
         Args:
             current_readings: Current pool readings
             adjustments: Calculated chemical adjustments
+            history: Pool's past readings; when given, the monthly estimate and
+                     savings come from the cost of the doses they called for
+            pool_size: Pool volume in gallons (for costing the history)
             
         Returns:
             Dictionary with cost analysis and optimization recommendations
@@ -1213,65 +1350,46 @@ class PoolAnalyticsEngineV2:
             }
         
         try:
-            total_cost = 0.0
-            breakdown = []
-            
-            # Calculate costs for each adjustment
-            for adjustment in adjustments:
-                chemical = adjustment.get('chemical', '').lower()
-                amount = adjustment.get('amount', 0)
-                
-                if amount <= 0:
-                    continue
-                
-                # Map chemical names to cost keys
-                cost = 0.0
-                chemical_key = None
-                
-                if 'soda ash' in chemical or 'ph up' in chemical:
-                    cost = (amount / 16) * self.chemical_costs['soda_ash']
-                    chemical_key = 'soda_ash'
-                elif 'muriatic acid' in chemical or 'ph down' in chemical:
-                    cost = (amount / 128) * self.chemical_costs['muriatic_acid']
-                    chemical_key = 'muriatic_acid'
-                elif 'chlorine' in chemical:
-                    cost = (amount / 16) * self.chemical_costs['chlorine']
-                    chemical_key = 'chlorine'
-                elif 'baking soda' in chemical or 'alkalinity' in chemical:
-                    cost = (amount / 16) * self.chemical_costs['baking_soda']
-                    chemical_key = 'baking_soda'
-                elif 'calcium' in chemical:
-                    cost = (amount / 16) * self.chemical_costs['calcium_chloride']
-                    chemical_key = 'calcium_chloride'
-                elif 'stabilizer' in chemical or 'cyanuric' in chemical:
-                    cost = (amount / 16) * self.chemical_costs['stabilizer']
-                    chemical_key = 'stabilizer'
-                elif 'bromine' in chemical:
-                    cost = (amount / 16) * self.chemical_costs['bromine']
-                    chemical_key = 'bromine'
-                elif 'salt' in chemical:
-                    cost = (amount / 16) * self.chemical_costs['salt']
-                    chemical_key = 'salt'
-                
-                if cost > 0:
-                    total_cost += cost
-                    breakdown.append({
-                        'chemical': chemical,
-                        'amount': amount,
-                        'cost': round(cost, 2),
-                        'unit_price': self.chemical_costs.get(chemical_key, 0)
-                    })
-            
-            # Estimate monthly cost (assuming adjustments every 3 days)
-            monthly_estimate = total_cost * 10  # ~10 adjustments per month
+            # Price every adjustment in one pass of the compiled catalog
+            chemicals = [adjustment.get('chemical', '').lower() for adjustment in adjustments]
+            amounts = [adjustment.get('amount', 0) or 0 for adjustment in adjustments]
+            costs, codes = self.cost_catalog.cost_batch(chemicals, amounts, [a.get('unit', '') for a in adjustments])
+            
+            breakdown = [{
+                'chemical': chemical,
+                'amount': amount,
+                'cost': round(float(cost), 2),
+                'unit_price': self.cost_catalog.price(code)
+            } for chemical, amount, cost, code in zip(chemicals, amounts, costs, codes) if cost > 0]
+            total_cost = float(costs.sum())
+            
+            # Monthly cost from the doses the pool's history called for (recent months),
+            # falling back to ~10 adjustments like this one per month
+            monthly_costs = []
+            if history is not None and len(history):
+                monthly_costs = self.cost_catalog.monthly_costs(
+                    history.timestamps, history.columns, pool_size or 10000
+                )
+            recent = monthly_costs[-6:]
+            if recent:
+                monthly_estimate = float(np.mean([month['cost'] for month in recent]))
+                chlorine_cost = float(np.mean([month['by_chemical'].get('chlorine', 0.0) for month in recent]))
+                ph_cost = float(np.mean([month['by_chemical'].get('soda_ash', 0.0) +
+                                         month['by_chemical'].get('muriatic_acid', 0.0) for month in recent]))
+                purchase_cost = monthly_estimate
+            else:
+                monthly_estimate = total_cost * 10  # ~10 adjustments per month
+                chlorine_cost = sum(b['cost'] for b in breakdown if 'chlorine' in b['chemical'].lower())
+                ph_cost = sum(b['cost'] for b in breakdown if 'ph' in b['chemical'].lower() or 'acid' in b['chemical'].lower())
+                purchase_cost = total_cost
             
             # Calculate savings potential
             savings_potential = 0.0
             recommendations = []
             
             # Bulk purchase savings (15-20% for orders over $50)
-            if total_cost > 50:
-                bulk_savings = total_cost * 0.175
+            if purchase_cost > 50:
+                bulk_savings = purchase_cost * 0.175
                 savings_potential += bulk_savings
                 recommendations.append({
                     'category': 'Bulk Purchase',
@@ -1280,7 +1398,6 @@ class PoolAnalyticsEngineV2:
                 })
             
             # Stabilizer optimization
-            chlorine_cost = sum(b['cost'] for b in breakdown if 'chlorine' in b['chemical'].lower())
             if chlorine_cost > 10:
                 stabilizer_savings = chlorine_cost * 0.30
                 savings_potential += stabilizer_savings
@@ -1291,7 +1408,6 @@ class PoolAnalyticsEngineV2:
                 })
             
             # pH adjustment optimization
-            ph_cost = sum(b['cost'] for b in breakdown if 'ph' in b['chemical'].lower() or 'acid' in b['chemical'].lower())
             if ph_cost > 5:
                 ph_savings = ph_cost * 0.25
                 savings_potential += ph_savings
@@ -1321,7 +1437,9 @@ class PoolAnalyticsEngineV2:
                 'annual_savings': round(savings_potential * 12, 2),
                 'breakdown': breakdown,
                 'recommendations': recommendations,
-                'cost_per_adjustment': round(total_cost, 2)
+                'cost_per_adjustment': round(total_cost, 2),
+                'monthly_costs': monthly_costs,
+                'estimate_source': 'history' if recent else 'heuristic'
             }
             
         except Exception as e:
@@ -1339,29 +1457,29 @@ class PoolAnalyticsEngineV2:
     
     # ==================== MODEL PERSISTENCE ====================
     
+    def warm_up(self):
+        """
+        Import the ML libraries and index the model registry ahead of first use
+        
+        Called from a background thread once the main window is shown, so
+        neither cost is paid during startup.
+        """
+        if ml_stack.load():
+            self.load_models()
+    
     def save_models(self):
-        """Save trained models to disk"""
+        """
+        Record what the model registry holds in models/metadata.json
+        
+        Models themselves are written to the registry whenever they are
+        fitted or extended, one file per (pool, parameter, model type).
+        """
         try:
-            # Save ARIMA models
-            for param, model in self.arima_models.items():
-                model_path = self.models_dir / f"{param}_arima.pkl"
-                joblib.dump(model, model_path)
-            
-            # Save anomaly detector
-            if self.anomaly_detector:
-                detector_path = self.models_dir / "anomaly_detector.pkl"
-                joblib.dump(self.anomaly_detector, detector_path)
-            
-            # Save scaler
-            if self.scaler:
-                scaler_path = self.models_dir / "scaler.pkl"
-                joblib.dump(self.scaler, scaler_path)
-            
-            # Save metadata
+            stored = self.registry.stored()
             metadata = {
                 'saved_at': datetime.now().isoformat(),
-                'models': list(self.arima_models.keys()),
-                'has_anomaly_detector': self.anomaly_detector is not None,
+                'models': [{'pool_id': pool_id, 'parameter': parameter, 'type': model_type}
+                           for pool_id, parameter, model_type in stored],
                 'parameters': self.parameters
             }
             
@@ -1369,112 +1487,92 @@ class PoolAnalyticsEngineV2:
             with open(metadata_path, 'w') as f:
                 json.dump(metadata, f, indent=2)
             
-            logger.info(f"Models saved to {self.models_dir}")
+            logger.info(f"Model registry in {self.registry.root} holds {len(stored)} models")
             
         except Exception as e:
             logger.error(f"Error saving models: {e}")
     
     def load_models(self):
-        """Load trained models from disk"""
+        """
+        Index the model registry (once)
+        
+        Entries are only listed here; each one is read from disk the first
+        time its pool and parameter are forecast or checked for anomalies.
+        """
+        if self._models_loaded:
+            return
+        self._models_loaded = True
         try:
-            # Check if models directory exists
-            if not self.models_dir.exists():
-                logger.info("No saved models found")
-                return
+            stored = self.registry.stored()
+            pools = {pool_id for pool_id, _, _ in stored}
+            logger.info(f"Model registry: {len(stored)} saved models for {len(pools)} pools")
             
-            # Load metadata
-            metadata_path = self.models_dir / "metadata.json"
-            if metadata_path.exists():
-                with open(metadata_path, 'r') as f:
-                    metadata = json.load(f)
-                logger.info(f"Found models saved at {metadata.get('saved_at')}")
-            
-            # Load ARIMA models
-            for model_file in self.models_dir.glob("*_arima.pkl"):
-                param = model_file.stem.replace("_arima", "")
-                self.arima_models[param] = joblib.load(model_file)
-                logger.debug(f"Loaded ARIMA model for {param}")
-            
-            # Load anomaly detector
-            detector_path = self.models_dir / "anomaly_detector.pkl"
-            if detector_path.exists():
-                self.anomaly_detector = joblib.load(detector_path)
-                logger.debug("Loaded anomaly detector")
-            
-            # Load scaler
-            scaler_path = self.models_dir / "scaler.pkl"
-            if scaler_path.exists():
-                self.scaler = joblib.load(scaler_path)
-                logger.debug("Loaded scaler")
-            
-            if self.arima_models:
-                logger.info(f"Loaded {len(self.arima_models)} models from disk")
+            # Flat files from before the registry belonged to no particular pool
+            legacy = list(self.models_dir.glob("*_arima.pkl")) + list(self.models_dir.glob("anomaly_detector.pkl"))
+            if legacy:
+                logger.info(f"Ignoring {len(legacy)} legacy model files in {self.models_dir} (superseded by the registry)")
             
         except Exception as e:
             logger.error(f"Error loading models: {e}")
     
     # ==================== MODEL EVALUATION ====================
     
-    def evaluate_prediction_accuracy(self, historical_data: List[Dict]) -> Dict[str, float]:
+    def evaluate_prediction_accuracy(self, historical_data: List[Dict],
+                                     pool_id: Optional[str] = None) -> Dict[str, float]:
         """
-        Evaluate prediction accuracy using train/test split
+        Evaluate one-step prediction accuracy with a rolling-origin backtest
+        
+        The last 20% of each parameter's series is split into folds; each
+        parameter is fitted once before its first fold and walked forward
+        through the folds by extending the fitted state (see forecast_backtest). The latest result per pool and
+        parameter is cached with a fingerprint of the data, so unchanged
+        histories are not re-evaluated.
         
         Args:
-            historical_data: Historical readings
+            historical_data: Historical readings (list of readings or ColumnView)
+            pool_id: Pool the history belongs to (scopes the cached results)
             
         Returns:
-            Dictionary of accuracy metrics per parameter
+            Dictionary of accuracy metrics per parameter with at least
+            MIN_BACKTEST_READINGS valid readings ('mape' is None when undefined)
         """
-        if len(historical_data) < 30:
+        if len(historical_data) < MIN_BACKTEST_READINGS:
             logger.warning("Insufficient data for evaluation")
             return {}
         
+        if not ml_stack.available():
+            logger.warning("ML libraries not available - cannot evaluate ARIMA accuracy")
+            return {}
+        
         accuracy = {}
         
         try:
-            # Use 80/20 train/test split
-            split_idx = int(len(historical_data) * 0.8)
-            train_data = historical_data[:split_idx]
-            test_data = historical_data[split_idx:]
+            cleaned = self.prepare(historical_data)
             
+            series = {}
             for param in self.parameters:
-                # Extract values
-                train_values = [self.sanitize_value(r.get(param), param) for r in train_data]
-                test_values = [self.sanitize_value(r.get(param), param) for r in test_data]
-                
-                train_values = [v for v in train_values if v is not None]
-                test_values = [v for v in test_values if v is not None]
-                
-                if len(train_values) < 20 or len(test_values) < 5:
-                    continue
-                
-                # Make predictions for test set
-                predictions = []
-                for i in range(len(test_values)):
-                    # Use data up to this point
-                    data_subset = train_data + test_data[:i]
-                    pred = self.predict_next_readings(data_subset)
-                    
-                    if param in pred:
-                        predictions.append(pred[param]['value'])
-                    else:
-                        predictions.append(train_values[-1])  # Fallback
-                
-                # Calculate metrics
-                if len(predictions) == len(test_values):
-                    mse = mean_squared_error(test_values, predictions)
-                    rmse = np.sqrt(mse)
-                    
-                    # Calculate percentage error
-                    mean_val = np.mean(test_values)
-                    percentage_error = (rmse / mean_val) * 100 if mean_val > 0 else 100
-                    
-                    accuracy[param] = {
-                        'rmse': float(rmse),
-                        'percentage_error': float(percentage_error),
-                        'accuracy': float(max(0, 100 - percentage_error))
-                    }
+                values = self._parameter_series(cleaned, param)
+                if len(values) >= MIN_BACKTEST_READINGS:
+                    series[param] = values
+            
+            for param, result in self.backtester.run(series, scope=pool_id).items():
+                # The readings the folds actually forecast
+                test_values = np.concatenate([series[param][fold['origin']:fold['origin'] + fold['size']]
+                                              for fold in result['folds']])
+                mean_val = np.mean(test_values)
+                percentage_error = (result['rmse'] / mean_val) * 100 if mean_val > 0 and result['rmse'] is not None else 100
+                
+                accuracy[param] = {
+                    'rmse': result['rmse'],
+                    'mape': result['mape'],
+                    'percentage_error': float(percentage_error),
+                    'accuracy': float(max(0, 100 - percentage_error)),
+                    'test_points': result['points'],
+                    'seconds': result['seconds'],
+                    'folds': result['folds']
+                }
             
+            self.prediction_accuracy = accuracy
             logger.info(f"Evaluated accuracy for {len(accuracy)} parameters")
             
         except Exception as e:
@@ -1730,16 +1828,6 @@ class WaterTester:  # Fallback WaterTester
                 "dosage": "No adjustment needed"
             }
 
-class DataManager:  # Fallback DataManager
-    def __init__(self, database_name):
-        self.database_name = database_name
-
-    def insert_reading(self, temperature, potential_hydrogen, chlorine):
-        logger.info(f"Inserting reading: temp={temperature}, pH={potential_hydrogen}, chlorine={chlorine}")
-
-    def close_connection(self):
-        pass
-
 class WeatherAPI:
     def __init__(self, api_key):
         self.api_key = api_key
@@ -1916,6 +2004,30 @@ except ImportError as e:
             return None
         def analyze_strip(self, image):
             return {}
+
+# Partitioned reading persistence and columnar reading cache
+from reading_journal import ReadingJournal
+from reading_partitions import ReadingPartitions
+from reading_import import ReadingImporter
+from reading_columns import ReadingColumnStore, ColumnView, day_range_epochs
+from reading_validation import validate_batch, ValidationErrors
+from arima_forecaster import IncrementalForecaster
+from forecast_backtest import Backtester
+from anomaly_models import AnomalyModelStore, rolling_zscores
+from model_registry import ModelRegistry
+from analytics_dataset import PreparedDataset, ResultMemo
+from trend_regression import fit_trends, rolling_trends
+from running_stats import WINDOWS as RUNNING_WINDOWS, summarize_values
+from reading_rollups import REPORT_RANGES, choose_resolution
+from alert_store import AlertStore
+from backup_store import BackupStore
+from startup_timing import StartupTimer
+from analytics_worker import AnalyticsWorker
+from chemical_costs import ChemicalCatalog
+
+# Startup phases of this process (see _report_startup_timing)
+startup_timer = StartupTimer(started=_STARTUP_STARTED)
+
 class ConfigurationError(Exception): pass
 class APIError(Exception): pass
 
@@ -2230,7 +2342,6 @@ class PoolApp(tk.Tk):
 
             # Initialize core components
             self.water_tester = WaterTester()
-            self.data_manager = DataManager("pool_data.db")
             weather_api_key = os.environ.get("WEATHER_API_KEY")
             if weather_api_key:
                 self.weather_api = WeatherAPI(weather_api_key)
@@ -2254,6 +2365,7 @@ class PoolApp(tk.Tk):
             self._setup_arduino_communication()
             self._start_periodic_updates()
             self.protocol("WM_DELETE_WINDOW", self._on_close)
+            startup_timer.mark("main window ready")
 
             logger.info("PoolApp initialization completed successfully")
             logger.info("PoolApp initialization completed successfully")
@@ -2302,10 +2414,13 @@ class PoolApp(tk.Tk):
         # Ensure alerts.json exists
         alerts_file = self.data_dir / "alerts.json"
         if not alerts_file.exists():
-            with open(alerts_file, 'w') as f:
-                json.dump([], f)
+            json_cache.save(alerts_file, [], indent=None, defer=False)
             logger.info("Created empty alerts.json file")
         
+        # Indexed alert history (alerts.json snapshot plus journaled changes)
+        self.alert_store = AlertStore(alerts_file)
+        self.alert_store.load()
+        
         # Load alert configuration (Phase 1.2)
         self.alert_config = self._load_alert_config()
         logger.info("Alert configuration loaded")
@@ -2455,7 +2570,11 @@ class PoolApp(tk.Tk):
         # Initialize multi-pool system
         self._initialize_pools()
         self.customer_file = self.data_dir / "customer_info.json"
-        self.readings_file = self.data_dir / "readings.json"  # Use JSON file for readings
+        self.readings_file = self.data_dir / "readings.json"  # Legacy snapshot, migrated into partitions
+        self.reading_partitions = ReadingPartitions(self.data_dir / "readings")  # <pool_id>/<YYYY-MM>.jsonl
+        self._open_reading_partitions()
+        # Per-pool NumPy columns shared by analytics and reports, loaded from the pool's partitions on first use
+        self.reading_columns = ReadingColumnStore(source=self.reading_partitions.load)
         self.settings_file = self.data_dir / "settings.json"
         self._stop_threads = threading.Event()
         self.serial_conn = None
@@ -2474,7 +2593,15 @@ class PoolApp(tk.Tk):
         self.gui_initialized = False  # Flag to track GUI initialization status
         
         # Initialize ML and Weather Impact Analyzers
-        self.pool_analytics = PoolAnalyticsEngineV2()
+        settings = json_cache.load(self.settings_file, {})
+        self.pool_analytics = PoolAnalyticsEngineV2(forecast_workers=settings.get('forecast_workers'))
+        self._ml_warm_up = threading.Event()  # Set when the background ML warm-up has finished
+        self._anomalies_deferred = False
+        self.startup_report = None
+        # Engine calls from the analytics tabs run here instead of on the Tk thread
+        self.analytics_worker = AnalyticsWorker()
+        self._analytics_job_displays = {}
+        self._analytics_polling = False
         
         # Initialize test strip analyzer
         try:
@@ -2600,6 +2727,11 @@ class PoolApp(tk.Tk):
         # File Menu
         file_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="File", menu=file_menu)
+        file_menu.add_command(label="Import Readings...", command=self._import_readings)
+        file_menu.add_separator()
+        file_menu.add_command(label="Backup Now", command=self._backup_data)
+        file_menu.add_command(label="Restore Backup...", command=self._restore_backup)
+        file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self._on_close, accelerator="Alt+F4")
         
         # Help Menu
@@ -2608,6 +2740,7 @@ class PoolApp(tk.Tk):
         help_menu.add_command(label="User Guide", command=self._show_user_guide)
         help_menu.add_command(label="Quick Start", command=self._show_quick_start)
         help_menu.add_command(label="Chemical Ranges", command=self._show_chemical_ranges)
+        help_menu.add_command(label="Startup Timing", command=self._show_startup_timing)
         help_menu.add_separator()
         help_menu.add_command(label="About", command=self._show_about)
     
@@ -3039,6 +3172,70 @@ is strictly prohibited."""
         self.deiconify()  # Show main window
         self.lift()  # Bring to front
         self.focus_force()  # Give focus
+        startup_timer.mark("main window shown")
+        
+        # Import the ML stack and load saved models now that the window is up
+        self._start_ml_warm_up()
+        self.after(2000, self._poll_json_writes)
+    
+    def _poll_json_writes(self):
+        """Report data files whose background write failed (they stay pending and are retried)"""
+        try:
+            failures = json_cache.take_failures()
+            if failures:
+                names = ", ".join(os.path.basename(path) for path in failures)
+                self.status_var.set(f"Could not save {names}; retrying")
+                messagebox.showwarning(
+                    "Save Error",
+                    f"Could not write {names}:\n{next(iter(failures.values()))}\n\n"
+                    "Your changes are kept and the save will be retried."
+                )
+        except Exception as e:
+            logger.error(f"Error checking background saves: {e}")
+        self.after(2000, self._poll_json_writes)
+    
+    def _start_ml_warm_up(self):
+        """Warm up the analytics engine in a background thread"""
+        if not self.pool_analytics or self._ml_warm_up.is_set():
+            return
+        
+        def run():
+            started = time.perf_counter()
+            try:
+                self.pool_analytics.warm_up()
+            except Exception as e:
+                logger.error(f"ML warm-up failed: {e}")
+            import_seconds = ml_stack.status()['seconds'] or 0.0
+            startup_timer.defer("ML library import", import_seconds)
+            startup_timer.defer("model registry index", max(0.0, time.perf_counter() - started - import_seconds))
+            self._ml_warm_up.set()
+        
+        threading.Thread(target=run, name="ml-warm-up", daemon=True).start()
+        self.after(200, self._poll_ml_warm_up)
+    
+    def _poll_ml_warm_up(self):
+        """Finish the warm-up on the Tk thread once the background work is done"""
+        if not self._ml_warm_up.is_set():
+            self.after(200, self._poll_ml_warm_up)
+            return
+        self._report_startup_timing()
+        if self._anomalies_deferred:
+            # Anomaly scoring was skipped while the ML stack was loading
+            self._anomalies_deferred = False
+            self._refresh_analytics_dashboard()
+    
+    def _report_startup_timing(self):
+        """Log the startup timing report and append it to logs/startup_timing.json"""
+        self.startup_report = startup_timer.report("main window ready")
+        logger.info("\n" + StartupTimer.format(self.startup_report))
+        startup_timer.save(self.startup_report, Path("logs") / "startup_timing.json")
+    
+    def _show_startup_timing(self):
+        """Show the startup timing report"""
+        if self.startup_report is None:
+            messagebox.showinfo("Startup Timing", "Analytics are still warming up; try again in a moment.")
+            return
+        messagebox.showinfo("Startup Timing", StartupTimer.format(self.startup_report))
 
     
     def _create_dashboard_tab(self):
@@ -3532,7 +3729,7 @@ is strictly prohibited."""
             width=15
         )
         range_combo.pack(side="left", padx=5)
-        range_combo.bind("<<ComboboxSelected>>", lambda e: self._refresh_analytics_dashboard())
+        range_combo.bind("<<ComboboxSelected>>", lambda e: self._on_analytics_range_changed())
         
         # Refresh button
         refresh_btn = ttk.Button(
@@ -4024,18 +4221,13 @@ is strictly prohibited."""
             # Load existing purchases
             purchases_file = self.data_dir / "chemical_purchases.json"
             
-            if purchases_file.exists():
-                with open(purchases_file, 'r') as f:
-                    purchases = json.load(f)
-            else:
-                purchases = []
+            purchases = copy.deepcopy(json_cache.load(purchases_file, []))
             
             # Add new purchase
             purchases.append(purchase)
             
             # Save back to file
-            with open(purchases_file, 'w') as f:
-                json.dump(purchases, f, indent=4)
+            json_cache.save(purchases_file, purchases, indent=4)
             
             logger.info(f"Saved chemical purchase: {purchase['chemical_name']} - ${purchase['cost']}")
             
@@ -4057,11 +4249,10 @@ is strictly prohibited."""
                 self._update_cost_summary([])
                 return
             
-            with open(purchases_file, 'r') as f:
-                purchases = json.load(f)
+            purchases = json_cache.load(purchases_file, [])
             
             # Sort by date (newest first)
-            purchases.sort(key=lambda x: x.get('date', ''), reverse=True)
+            purchases = sorted(purchases, key=lambda x: x.get('date', ''), reverse=True)
             
             # Display purchases
             for purchase in purchases:
@@ -4152,8 +4343,7 @@ is strictly prohibited."""
             
             # Load purchases
             purchases_file = self.data_dir / "chemical_purchases.json"
-            with open(purchases_file, 'r') as f:
-                purchases = json.load(f)
+            purchases = copy.deepcopy(json_cache.load(purchases_file, []))
             
             # Find and remove purchase
             for i, purchase in enumerate(purchases):
@@ -4164,8 +4354,7 @@ is strictly prohibited."""
                     break
             
             # Save back
-            with open(purchases_file, 'w') as f:
-                json.dump(purchases, f, indent=4)
+            json_cache.save(purchases_file, purchases, indent=4)
             
             # Refresh display
             self._load_purchases()
@@ -4199,8 +4388,7 @@ is strictly prohibited."""
                 messagebox.showwarning("Warning", "No purchases to export")
                 return
             
-            with open(purchases_file, 'r') as f:
-                purchases = json.load(f)
+            purchases = json_cache.load(purchases_file, [])
             
             # Write to CSV
             with open(filename, 'w', newline='') as f:
@@ -4420,11 +4608,10 @@ is strictly prohibited."""
                 self._update_inventory_summary([])
                 return
             
-            with open(inventory_file, 'r') as f:
-                inventory = json.load(f)
+            inventory = json_cache.load(inventory_file, [])
             
             # Sort by chemical name
-            inventory.sort(key=lambda x: x.get('chemical', ''))
+            inventory = sorted(inventory, key=lambda x: x.get('chemical', ''))
             
             # Display inventory items
             for item in inventory:
@@ -4559,11 +4746,7 @@ is strictly prohibited."""
                 
                 # Load existing inventory
                 inventory_file = self.data_dir / "chemical_inventory.json"
-                if inventory_file.exists():
-                    with open(inventory_file, 'r') as f:
-                        inventory = json.load(f)
-                else:
-                    inventory = []
+                inventory = copy.deepcopy(json_cache.load(inventory_file, []))
                 
                 # Generate ID
                 max_id = 0
@@ -4592,8 +4775,7 @@ is strictly prohibited."""
                 inventory.append(new_item)
                 
                 # Save
-                with open(inventory_file, 'w') as f:
-                    json.dump(inventory, f, indent=2)
+                json_cache.save(inventory_file, inventory, indent=2)
                 
                 # Reload display
                 self._load_inventory()
@@ -4694,8 +4876,7 @@ is strictly prohibited."""
                 
                 # Load inventory
                 inventory_file = self.data_dir / "chemical_inventory.json"
-                with open(inventory_file, 'r') as f:
-                    inventory = json.load(f)
+                inventory = copy.deepcopy(json_cache.load(inventory_file, []))
                 
                 # Find and update item
                 for item in inventory:
@@ -4711,8 +4892,7 @@ is strictly prohibited."""
                         break
                 
                 # Save
-                with open(inventory_file, 'w') as f:
-                    json.dump(inventory, f, indent=2)
+                json_cache.save(inventory_file, inventory, indent=2)
                 
                 # Reload display
                 self._load_inventory()
@@ -4769,15 +4949,13 @@ is strictly prohibited."""
         try:
             # Load inventory
             inventory_file = self.data_dir / "chemical_inventory.json"
-            with open(inventory_file, 'r') as f:
-                inventory = json.load(f)
+            inventory = copy.deepcopy(json_cache.load(inventory_file, []))
             
             # Remove item
             inventory = [item for item in inventory if item['chemical'] != chemical_name]
             
             # Save
-            with open(inventory_file, 'w') as f:
-                json.dump(inventory, f, indent=2)
+            json_cache.save(inventory_file, inventory, indent=2)
             
             # Reload display
             self._load_inventory()
@@ -4804,8 +4982,7 @@ is strictly prohibited."""
             
             # Load inventory
             inventory_file = self.data_dir / "chemical_inventory.json"
-            with open(inventory_file, 'r') as f:
-                inventory = json.load(f)
+            inventory = json_cache.load(inventory_file, [])
             
             # Write CSV
             import csv
@@ -5090,12 +5267,11 @@ is strictly prohibited."""
                 self._update_shopping_summary([])
                 return
             
-            with open(shopping_file, 'r') as f:
-                shopping_list = json.load(f)
+            shopping_list = json_cache.load(shopping_file, [])
             
             # Sort by priority (HIGH, MEDIUM, LOW) then by item name
             priority_order = {'HIGH': 0, 'MEDIUM': 1, 'LOW': 2}
-            shopping_list.sort(key=lambda x: (priority_order.get(x.get('priority', 'LOW'), 3), x.get('item', '')))
+            shopping_list = sorted(shopping_list, key=lambda x: (priority_order.get(x.get('priority', 'LOW'), 3), x.get('item', '')))
             
             # Display shopping list items
             for item in shopping_list:
@@ -5160,16 +5336,11 @@ is strictly prohibited."""
                 messagebox.showwarning("No Inventory", "No inventory data found. Please add chemicals to inventory first.")
                 return
             
-            with open(inventory_file, 'r') as f:
-                inventory = json.load(f)
+            inventory = json_cache.load(inventory_file, [])
             
             # Load existing shopping list
             shopping_file = self.data_dir / "shopping_lists.json"
-            if shopping_file.exists():
-                with open(shopping_file, 'r') as f:
-                    shopping_list = json.load(f)
-            else:
-                shopping_list = []
+            shopping_list = copy.deepcopy(json_cache.load(shopping_file, []))
             
             # Find low stock and out of stock items
             added_count = 0
@@ -5228,8 +5399,7 @@ is strictly prohibited."""
                 added_count += 1
             
             # Save shopping list
-            with open(shopping_file, 'w') as f:
-                json.dump(shopping_list, f, indent=2)
+            json_cache.save(shopping_file, shopping_list, indent=2)
             
             # Reload display
             self._load_shopping_list()
@@ -5262,11 +5432,7 @@ is strictly prohibited."""
             
             # Load existing shopping list
             shopping_file = self.data_dir / "shopping_lists.json"
-            if shopping_file.exists():
-                with open(shopping_file, 'r') as f:
-                    shopping_list = json.load(f)
-            else:
-                shopping_list = []
+            shopping_list = copy.deepcopy(json_cache.load(shopping_file, []))
             
             added_count = 0
             for adj in adjustments:
@@ -5299,8 +5465,7 @@ is strictly prohibited."""
                 # Try to get cost from inventory
                 inventory_file = self.data_dir / "chemical_inventory.json"
                 if inventory_file.exists():
-                    with open(inventory_file, 'r') as f:
-                        inventory = json.load(f)
+                    inventory = json_cache.load(inventory_file, [])
                     for inv_item in inventory:
                         if inv_item.get('chemical', '') == chemical:
                             estimated_cost = amount * inv_item.get('cost_per_unit', 0)
@@ -5325,8 +5490,7 @@ is strictly prohibited."""
                 added_count += 1
             
             # Save shopping list
-            with open(shopping_file, 'w') as f:
-                json.dump(shopping_list, f, indent=2)
+            json_cache.save(shopping_file, shopping_list, indent=2)
             
             # Reload display
             self._load_shopping_list()
@@ -5415,11 +5579,7 @@ is strictly prohibited."""
                 
                 # Load existing shopping list
                 shopping_file = self.data_dir / "shopping_lists.json"
-                if shopping_file.exists():
-                    with open(shopping_file, 'r') as f:
-                        shopping_list = json.load(f)
-                else:
-                    shopping_list = []
+                shopping_list = copy.deepcopy(json_cache.load(shopping_file, []))
                 
                 # Generate ID
                 max_id = 0
@@ -5450,8 +5610,7 @@ is strictly prohibited."""
                 shopping_list.append(new_item)
                 
                 # Save
-                with open(shopping_file, 'w') as f:
-                    json.dump(shopping_list, f, indent=2)
+                json_cache.save(shopping_file, shopping_list, indent=2)
                 
                 # Reload display
                 self._load_shopping_list()
@@ -5504,8 +5663,7 @@ is strictly prohibited."""
         try:
             # Load shopping list
             shopping_file = self.data_dir / "shopping_lists.json"
-            with open(shopping_file, 'r') as f:
-                shopping_list = json.load(f)
+            shopping_list = copy.deepcopy(json_cache.load(shopping_file, []))
             
             # Find and mark item
             for item in shopping_list:
@@ -5514,8 +5672,7 @@ is strictly prohibited."""
                     break
             
             # Save
-            with open(shopping_file, 'w') as f:
-                json.dump(shopping_list, f, indent=2)
+            json_cache.save(shopping_file, shopping_list, indent=2)
             
             # Reload display
             self._load_shopping_list()
@@ -5543,15 +5700,13 @@ is strictly prohibited."""
         try:
             # Load shopping list
             shopping_file = self.data_dir / "shopping_lists.json"
-            with open(shopping_file, 'r') as f:
-                shopping_list = json.load(f)
+            shopping_list = copy.deepcopy(json_cache.load(shopping_file, []))
             
             # Remove item
             shopping_list = [item for item in shopping_list if item['item'] != item_name]
             
             # Save
-            with open(shopping_file, 'w') as f:
-                json.dump(shopping_list, f, indent=2)
+            json_cache.save(shopping_file, shopping_list, indent=2)
             
             # Reload display
             self._load_shopping_list()
@@ -5569,8 +5724,7 @@ is strictly prohibited."""
         try:
             # Load shopping list
             shopping_file = self.data_dir / "shopping_lists.json"
-            with open(shopping_file, 'r') as f:
-                shopping_list = json.load(f)
+            shopping_list = copy.deepcopy(json_cache.load(shopping_file, []))
             
             # Count purchased items
             purchased_count = sum(1 for item in shopping_list if item.get('purchased', False))
@@ -5579,8 +5733,7 @@ is strictly prohibited."""
             shopping_list = [item for item in shopping_list if not item.get('purchased', False)]
             
             # Save
-            with open(shopping_file, 'w') as f:
-                json.dump(shopping_list, f, indent=2)
+            json_cache.save(shopping_file, shopping_list, indent=2)
             
             # Reload display
             self._load_shopping_list()
@@ -5607,8 +5760,7 @@ is strictly prohibited."""
             
             # Load shopping list
             shopping_file = self.data_dir / "shopping_lists.json"
-            with open(shopping_file, 'r') as f:
-                shopping_list = json.load(f)
+            shopping_list = json_cache.load(shopping_file, [])
             
             # Filter out purchased items
             active_items = [item for item in shopping_list if not item.get('purchased', False)]
@@ -5667,8 +5819,7 @@ is strictly prohibited."""
             
             # Load shopping list
             shopping_file = self.data_dir / "shopping_lists.json"
-            with open(shopping_file, 'r') as f:
-                shopping_list = json.load(f)
+            shopping_list = json_cache.load(shopping_file, [])
             
             # Filter out purchased items
             active_items = [item for item in shopping_list if not item.get('purchased', False)]
@@ -5706,8 +5857,7 @@ is strictly prohibited."""
             # Load pool type specifications
             spec_file = Path("pool_type_specifications.json")
             if spec_file.exists():
-                with open(spec_file, 'r') as f:
-                    self.pool_type_specs = json.load(f)['pool_types']
+                self.pool_type_specs = json_cache.load(spec_file, {})['pool_types']
             else:
                 self.pool_type_specs = {}
             
@@ -5726,11 +5876,9 @@ is strictly prohibited."""
                     'is_active': True,
                     'notes': 'Default pool'
                 }
-                with open(pools_file, 'w') as f:
-                    json.dump([default_pool], f, indent=2)
+                json_cache.save(pools_file, [default_pool], indent=2)
             
-            with open(pools_file, 'r') as f:
-                self.pools = json.load(f)
+            self.pools = copy.deepcopy(json_cache.load(pools_file, []))
             
             # Set active pool (first active pool or first pool)
             self.current_pool = None
@@ -5765,8 +5913,7 @@ is strictly prohibited."""
         """Save pools to file"""
         try:
             pools_file = self.data_dir / "pools.json"
-            with open(pools_file, 'w') as f:
-                json.dump(self.pools, f, indent=2)
+            json_cache.save(pools_file, self.pools, indent=2)
         except Exception as e:
             logger.error(f"Error saving pools: {e}")
     
@@ -5892,15 +6039,11 @@ is strictly prohibited."""
     def _reload_all_data(self):
         """Reload all data for current pool"""
         try:
-            # Reload readings
-            if hasattr(self, '_load_readings'):
-                self.chemical_readings = []
-                readings_file = self.data_dir / "readings.json"
-                if readings_file.exists():
-                    with open(readings_file, 'r') as f:
-                        all_readings = json.load(f)
-                    # Filter by current pool
-                    self.chemical_readings = [r for r in all_readings if r.get('pool_id') == self.current_pool['id']]
+            # Results still being computed for the previous pool are no longer wanted
+            self._cancel_analytics_jobs()
+            
+            # Reload readings from the new pool's partitions only
+            self.chemical_readings = list(self._current_pool_columns().view().readings)
             
             # Reload inventory
             if hasattr(self, '_load_inventory'):
@@ -6424,31 +6567,32 @@ is strictly prohibited."""
                     logger.warning("No readings found")
                     return
             
-                # Filter by date range
-                filtered_readings = self._filter_readings_by_range(readings, self.analytics_range_var.get())
+                # Column view of the current pool for the selected date range
+                view = self._analytics_view()
             
-                if not filtered_readings:
+                if not len(view):
                     logger.warning("No readings in selected range")
                     return
+                filtered_readings = view.readings
             
                 # Update metric cards
-                self._update_metric_cards(filtered_readings)  # DISABLED: Pool Health Score removed from Analytics Dashboard
+                self._update_metric_cards(view)  # DISABLED: Pool Health Score removed from Analytics Dashboard
                 # 
             
                 # DISABLED: Pool Health Score removed from Analytics Dashboard
                 # self._update_health_score(filtered_readings)
             
                 # Update statistics table
-                self._update_statistics_table(filtered_readings)
+                self._update_statistics_table(view)
             
                 # Update chart
                 self._update_analytics_chart()
             
-                # Update anomalies
-                self._update_anomalies_alerts(filtered_readings)
+                # Update recent readings table (anomalous readings are highlighted once scoring finishes)
+                self._update_recent_readings_table(filtered_readings[-50:])  # Last 50 from filtered range
             
-                # Update recent readings table
-                self._update_recent_readings_table(filtered_readings[:50])  # Last 50 from filtered range
+                # Update anomalies (every reading in the range is scored at once, on the analytics worker)
+                self._update_anomalies_alerts(view)
             
                 logger.info("Analytics dashboard refreshed successfully")
                 self._hide_loading()
@@ -6460,55 +6604,71 @@ is strictly prohibited."""
                 traceback.print_exc()
 
 
-    def _filter_readings_by_range(self, readings, range_str):
-        """Filter readings by date range"""
-        from datetime import datetime, timedelta
+    def _current_pool_columns(self):
+        """Get the columnar reading cache for the current pool"""
+        pool_id = self.current_pool['id'] if self.current_pool else None
+        return self.reading_columns.pool(pool_id)
+
+    def _open_reading_partitions(self, replace_from_legacy=False):
+        """
+        Open the reading partitions, merging a legacy readings.json (and its journal) into them first
         
+        Args:
+            replace_from_legacy: Replace the partitions with the legacy file (restoring a pre-partition backup)
+        """
+        legacy = ReadingJournal(self.readings_file)
+        self.reading_partitions.open()
+        if self.reading_partitions.needs_migration([legacy.snapshot_path, legacy.journal_path]):
+            count = self.reading_partitions.migrate(legacy, replace=replace_from_legacy)
+            logger.info(f"Migrated {count} readings from {self.readings_file.name} into partitions")
+
+    def _range_bounds(self, range_str):
+        """Convert a dashboard range name to (start, end) epoch seconds, or None if the date picker is needed"""
+        now = datetime.now()
         if range_str == "All Time":
-            return readings
-        
-        # Handle Today
+            return None, None
         if range_str == "Today":
-            today = datetime.now().date()
-            filtered = []
-            for reading in readings:
-                try:
-                    reading_date = datetime.strptime(reading['date'], '%Y-%m-%d').date()
-                    if reading_date == today:
-                        filtered.append(reading)
-                except Exception as e:
-                    continue
-            return filtered
-        
-        # Handle Custom Range
-        if range_str == "Custom Range" or range_str.startswith("Custom:"):
-            return self._show_custom_date_picker(readings)
-        
-        # Parse days
+            return day_range_epochs(now.date(), None)
+        if range_str.startswith("Custom:"):
+            # "Custom: YYYY-MM-DD to YYYY-MM-DD" as set by the date picker
+            try:
+                start_str, end_str = range_str[len("Custom:"):].split(" to ")
+                return day_range_epochs(datetime.strptime(start_str.strip(), "%Y-%m-%d").date(),
+                                        datetime.strptime(end_str.strip(), "%Y-%m-%d").date())
+            except ValueError:
+                return None
+        if range_str == "Custom Range":
+            return None
         days_map = {
             "Last 7 Days": 7,
             "Last 30 Days": 30,
             "Last 90 Days": 90
         }
-        
         days = days_map.get(range_str, 30)
-        cutoff_date = datetime.now() - timedelta(days=days)
-        
-        filtered = []
-        for reading in readings:
-            try:
-                reading_date = datetime.strptime(reading['date'], '%Y-%m-%d')
-                if reading_date >= cutoff_date:
-                    filtered.append(reading)
-            except Exception as e:
-                continue
-        
-        return filtered
-
+        return int((now - timedelta(days=days)).timestamp()), None
 
+    def _on_analytics_range_changed(self):
+        """Drop analytics jobs for the old time period and refresh the dashboard"""
+        self._cancel_analytics_jobs()
+        self._refresh_analytics_dashboard()
 
-    def _show_custom_date_picker(self, readings):
-        """Show custom date range picker dialog"""
+    def _analytics_view(self):
+        """Column view of the current pool's readings for the selected analytics range"""
+        return self._filter_readings_by_range(self._current_pool_columns(), self.analytics_range_var.get())
+
+    def _filter_readings_by_range(self, columns, range_str):
+        """Slice a pool's timestamp-sorted columns to a date range with binary search"""
+        bounds = self._range_bounds(range_str)
+        if bounds is None:
+            dates = self._show_custom_date_picker()
+            if dates is None:
+                # Cancelled: keep showing all readings
+                return columns.view()
+            return columns.between_dates(*dates)
+        return columns.between(*bounds)
+
+    def _show_custom_date_picker(self):
+        """Show custom date range picker dialog, returning (start_date, end_date) or None if cancelled"""
         from datetime import datetime
         import tkinter as tk
         from tkinter import ttk, messagebox
@@ -6555,7 +6715,7 @@ is strictly prohibited."""
                 bg="white", fg="#7f8c8d").pack(side="left")
         
         # Result variable
-        result = {"filtered": readings}  # Default to all readings
+        result = {"range": None}  # Default to all readings
         
         def apply_filter():
             try:
@@ -6569,17 +6729,7 @@ is strictly prohibited."""
                     messagebox.showerror("Invalid Range", "Start date must be before end date")
                     return
                 
-                # Filter readings
-                filtered = []
-                for reading in readings:
-                    try:
-                        reading_date = datetime.strptime(reading['date'], '%Y-%m-%d').date()
-                        if start_date <= reading_date <= end_date:
-                            filtered.append(reading)
-                    except Exception as e:
-                        continue
-                
-                result["filtered"] = filtered
+                result["range"] = (start_date, end_date)
                 
                 # Update the range display
                 self.analytics_range_var.set(f"Custom: {start_str} to {end_str}")
@@ -6609,24 +6759,39 @@ is strictly prohibited."""
         # Wait for dialog to close
         dialog.wait_window()
         
-        return result["filtered"]
+        return result["range"]
 
-    def _update_metric_cards(self, readings):
-        """Update metric cards with current values and trends"""
-        import statistics
+    def _range_statistics(self, view):
+        """
+        Per-parameter count/current/min/max/mean/std for the analytics range
         
+        The fixed ranges (Today, Last 7/30/90 Days, All Time) come from the
+        pool's running accumulators, so they cost O(1) per parameter however
+        long the history is; custom date ranges are computed from the view.
+        """
+        range_str = self.analytics_range_var.get()
+        if range_str in RUNNING_WINDOWS:
+            return self._current_pool_columns().running_stats().summary(range_str)
+        return summarize_values(view.columns, list(view.columns))
+    
+    def _update_metric_cards(self, view):
+        """Update metric cards with current values and trends from a column view"""
         metrics = ['ph', 'free_chlorine', 'total_chlorine', 'alkalinity', 'calcium_hardness', 'cyanuric_acid', 'temperature', 'bromine', 'salt']
+        statistics = self._range_statistics(view)
+        recent_view = view.tail(64)
         
         for metric in metrics:
             try:
-                # Get values
-                values = [r[metric] for r in readings if metric in r and r[metric] is not None]
-                
-                if not values:
+                if metric not in statistics:
                     continue
                 
                 # Current value (most recent)
-                current = values[0]
+                current = statistics[metric]['current']
+                
+                # Last few values (oldest first) for the trend
+                values = recent_view.values(metric)
+                if len(values) < 6 and len(recent_view) < len(view):
+                    values = view.values(metric)
                 
                 # Define units
                 units = {
@@ -6644,8 +6809,8 @@ is strictly prohibited."""
                 
                 # Calculate trend (compare last 3 vs previous 3)
                 if len(values) >= 6:
-                    recent_avg = statistics.mean(values[:3])
-                    previous_avg = statistics.mean(values[3:6])
+                    recent_avg = values[-3:].mean()
+                    previous_avg = values[-6:-3].mean()
                     trend_pct = ((recent_avg - previous_avg) / previous_avg) * 100
                     
                     if abs(trend_pct) < 1:
@@ -6799,11 +6964,9 @@ is strictly prohibited."""
     # DISABLED:             logger.error(f"Error drawing health gauge: {e}")
 
 
-    def _update_statistics_table(self, readings):
-        """Update statistics summary table"""
+    def _update_statistics_table(self, view):
+        """Update statistics summary table from a column view"""
         try:
-            import statistics
-            
             # Clear existing items
             for item in self.stats_tree.get_children():
                 self.stats_tree.delete(item)
@@ -6820,17 +6983,18 @@ is strictly prohibited."""
                 ('Salt/TDS', 'salt', 2700, 3400)
             ]
             
+            statistics = self._range_statistics(view)
+            
             for name, key, min_ideal, max_ideal in metrics_config:
-                values = [r[key] for r in readings if key in r and r[key] is not None]
-                
-                if not values:
+                if key not in statistics:
                     continue
                 
-                current = values[0]
-                min_val = min(values)
-                max_val = max(values)
-                avg_val = statistics.mean(values)
-                std_val = statistics.stdev(values) if len(values) > 1 else 0
+                stats = statistics[key]
+                current = stats['current']
+                min_val = stats['min']
+                max_val = stats['max']
+                avg_val = stats['mean']
+                std_val = stats['std']
                 
                 # Determine status
                 if min_ideal <= current <= max_ideal:
@@ -6879,11 +7043,10 @@ is strictly prohibited."""
             for widget in self.chart_frame.winfo_children():
                 widget.destroy()
             
-            # Load and filter readings
-            readings = self.chemical_readings if hasattr(self, "chemical_readings") else []
-            filtered_readings = self._filter_readings_by_range(readings, self.analytics_range_var.get())
+            # Slice the current pool's columns to the selected range
+            view = self._analytics_view()
             
-            if not filtered_readings:
+            if not len(view):
                 tk.Label(
                     self.chart_frame,
                     text="No data available for selected range",
@@ -6892,6 +7055,13 @@ is strictly prohibited."""
                 ).pack(expand=True)
                 return
             
+            # Long ranges are drawn from daily or weekly rollups instead of every reading
+            resolution = choose_resolution(view.timestamps[0], view.timestamps[-1] + 1, len(view))
+            if resolution != 'raw':
+                view = self._current_pool_columns().rollup(resolution).table(view.timestamps[0], view.timestamps[-1] + 1)
+            resolution_label = f" ({resolution.title()} Mean)" if resolution != 'raw' else ""
+            marker = 'o' if resolution == 'raw' else None
+            
             # Create figure
             fig = Figure(figsize=(10, 4), dpi=100)
             ax = fig.add_subplot(111)
@@ -6904,25 +7074,13 @@ is strictly prohibited."""
                 colors = ['#3498db', '#27ae60', '#e67e22']
                 
                 for metric, color in zip(metrics, colors):
-                    values = []
-                    dates = []
-                    for r in filtered_readings:
-                        if metric in r and r[metric] is not None:
-                            try:
-                                date_obj = datetime.strptime(r['date'], '%Y-%m-%d')
-                                values.append(r[metric])
-                                dates.append(date_obj)
-                            except Exception as e:
-                                continue
+                    dates, _, values, _, _ = self._analytics_chart_series(view, metric)
                     
-                    if values and dates:
-                        # Reverse to show oldest to newest
-                        values.reverse()
-                        dates.reverse()
-                        ax.plot(dates, values, marker='o', label=metric.replace('_', ' ').title(), color=color, linewidth=2)
+                    if len(values) and dates:
+                        ax.plot(dates, values, marker=marker, label=metric.replace('_', ' ').title(), color=color, linewidth=2)
                 
                 ax.legend()
-                ax.set_title("Multi-Metric Trends", fontsize=14, fontweight='bold')
+                ax.set_title(f"Multi-Metric Trends{resolution_label}", fontsize=14, fontweight='bold')
                 
             else:
                 # Single metric
@@ -6940,24 +7098,10 @@ is strictly prohibited."""
                 
                 metric = metric_map.get(self.chart_metric_var.get(), "ph")
                 
-                # Extract values and dates with error handling
-                values = []
-                dates = []
-                for r in filtered_readings:
-                    if metric in r and r[metric] is not None:
-                        try:
-                            date_obj = datetime.strptime(r['date'], '%Y-%m-%d')
-                            values.append(r[metric])
-                            dates.append(date_obj)
-                        except Exception as e:
-                            logger.warning(f"Skipping reading with invalid date: {r.get('date')}")
-                            continue
-                
-                # Reverse to show oldest to newest (left to right)
-                values.reverse()
-                dates.reverse()
+                # Columns (and rollup buckets) are already oldest to newest (left to right)
+                dates, epochs, values, lows, highs = self._analytics_chart_series(view, metric)
                 
-                if not values or not dates:
+                if not len(values) or not dates:
                     tk.Label(
                         self.chart_frame,
                         text=f"No data available for {self.chart_metric_var.get()}",
@@ -6967,13 +7111,20 @@ is strictly prohibited."""
                     return
                 
                 if chart_type == "Line Chart":
-                    ax.plot(dates, values, marker='o', color='#3498db', linewidth=2, markersize=6)
+                    ax.plot(dates, values, marker=marker, color='#3498db', linewidth=2, markersize=6)
+                    if lows is not None:
+                        ax.fill_between(dates, lows, highs, color='#3498db', alpha=0.15, label=f"{resolution.title()} Range")
+                    if resolution != 'weekly':
+                        # 7-day rolling trend, every window from one pass of prefix sums
+                        trend = rolling_trends(values, x=epochs / 86400.0, span=7)['fitted']
+                        if np.isfinite(trend).any():
+                            ax.plot(dates, trend, color='#9b59b6', linewidth=1.5, alpha=0.8, label='7-Day Trend')
                 elif chart_type == "Bar Chart":
                     ax.bar(dates, values, color='#3498db', alpha=0.7)
                 elif chart_type == "Scatter Plot":
                     ax.scatter(dates, values, color='#3498db', s=100, alpha=0.6)
                 
-                ax.set_title(f"{self.chart_metric_var.get()} Over Time", fontsize=14, fontweight='bold')
+                ax.set_title(f"{self.chart_metric_var.get()} Over Time{resolution_label}", fontsize=14, fontweight='bold')
             
             ax.set_xlabel("Date", fontsize=10)
             ax.set_ylabel("Value", fontsize=10)
@@ -7013,54 +7164,122 @@ is strictly prohibited."""
             traceback.print_exc()
 
 
-    def _update_anomalies_alerts(self, readings):
-        """Detect and display anomalies"""
+    def _analytics_chart_series(self, view, metric):
+        """
+        Points of one metric for the analytics chart
+        
+        Args:
+            view: ColumnView of raw readings, or RollupTable of daily/weekly buckets
+            metric: Parameter name
+        
+        Returns:
+            (dates, epochs, values, lows, highs) for the points that have a value;
+            lows/highs are the bucket minimums/maximums, or None for raw readings
+        """
+        if isinstance(view, ColumnView):
+            column = view.column(metric)
+            present = np.flatnonzero(~np.isnan(column))
+            all_dates = view.datetimes()
+            return [all_dates[i] for i in present], view.timestamps[present], column[present], None, None
+        values = view.field(metric, 'mean')
+        present = np.flatnonzero(~np.isnan(values))
+        all_dates = view.datetimes()
+        return ([all_dates[i] for i in present], view.starts[present], values[present],
+                view.field(metric, 'min')[present], view.field(metric, 'max')[present])
+
+
+    def _update_anomalies_alerts(self, view):
+        """
+        Detect and display anomalies
+        
+        Every reading in the range is scored in one pass (score_history) on the
+        analytics worker; the recent readings table is then redrawn with the
+        anomalous readings highlighted.
+        """
+        self.alerts_text.delete(1.0, tk.END)
+        
+        if len(view) < 10:
+            self.alerts_text.insert(tk.END, "Need at least 10 readings to detect anomalies.\n")
+            return
+        
+        if not self.pool_analytics:
+            self.alerts_text.insert(tk.END, "ML Analytics Engine not available.\n")
+            return
+        
+        if not ml_stack.is_loaded():
+            # Scored when the background warm-up finishes (see _poll_ml_warm_up)
+            self._anomalies_deferred = True
+            self.alerts_text.insert(tk.END, "Loading anomaly models...\n")
+            return
+        
+        pool_id = self.current_pool['id'] if self.current_pool else None
+        view = view.copy()
+        # Train on the whole history (as the anomalies tab does) and score only the range
+        history = self._current_pool_columns().view().copy()
+        self._run_analytics_job(
+            'dashboard_anomalies', self.alerts_text,
+            lambda: self.pool_analytics.score_history(view, pool_id, training=history),
+            lambda batch: self._show_anomalies_alerts(batch, view.readings)
+        )
+    
+    def _show_anomalies_alerts(self, batch, readings):
+        """Render scored anomalies into the alerts panel and highlight them in the recent readings table"""
+        flagged = set()
         try:
-            import statistics
-            
             self.alerts_text.delete(1.0, tk.END)
-            
-            if len(readings) < 10:
-                self.alerts_text.insert(tk.END, "Need at least 10 readings to detect anomalies.\n")
+            rows = batch['data'].readings if isinstance(batch['data'], ColumnView) else batch['data']
+            if not len(rows):
+                self.alerts_text.insert(tk.END, "No valid readings to check.\n")
                 return
             
             anomalies_found = False
             
             metrics = ['ph', 'free_chlorine', 'total_chlorine', 'alkalinity', 'calcium_hardness', 'cyanuric_acid', 'bromine', 'salt']
             
+            # Check latest reading against the readings before it
+            latest = len(rows) - 1
             for metric in metrics:
-                values = [r[metric] for r in readings if metric in r and r[metric] is not None]
-                
-                if len(values) < 10:
+                i = batch['parameters'].index(metric)
+                if not batch['z_flags'][latest, i]:
                     continue
-                
-                mean = statistics.mean(values)
-                stdev = statistics.stdev(values)
-                
-                # Check latest reading
-                latest = values[0]
-                z_score = abs((latest - mean) / stdev) if stdev > 0 else 0
-                
-                if z_score > 3:  # 3 standard deviations (more conservative)
-                    anomalies_found = True
-                    self.alerts_text.insert(
-                        tk.END,
-                        f"ANOMALY DETECTED: {metric.replace('_', ' ').title()}\n"
-                    )
-                    self.alerts_text.insert(
-                        tk.END,
-                        f"   Current: {latest:.2f} | Average: {mean:.2f} | Deviation: {z_score:.2f}sigma\n\n"
-                    )
+                anomalies_found = True
+                self.alerts_text.insert(
+                    tk.END,
+                    f"ANOMALY DETECTED: {metric.replace('_', ' ').title()}\n"
+                )
+                self.alerts_text.insert(
+                    tk.END,
+                    f"   Current: {batch['values'][latest, i]:.2f} | Average: {batch['expected'][latest, i]:.2f} | "
+                    f"Deviation: {abs(batch['z_scores'][latest, i]):.2f}sigma\n\n"
+                )
+            
+            for row in np.flatnonzero(batch['flags']):
+                flagged.add((rows[row].get('date', ''), rows[row].get('time', '')))
+            if flagged:
+                anomalies_found = True
+                self.alerts_text.insert(
+                    tk.END,
+                    f"{len(flagged)} of {len(rows)} readings in this range look anomalous "
+                    f"({batch['method']}); they are highlighted below.\n"
+                )
             
             if not anomalies_found:
                 self.alerts_text.insert(tk.END, "No anomalies detected. All readings within normal range.\n")
             
+            self._update_recent_readings_table(readings[-50:], flagged)
         except Exception as e:
             logger.error(f"Error updating anomalies: {e}")
 
 
-    def _update_recent_readings_table(self, readings):
-        """Update recent readings table with sorted data and safe formatting"""
+    def _update_recent_readings_table(self, readings, anomalous=None):
+        """
+        Update recent readings table with sorted data and safe formatting
+        
+        Args:
+            readings: Readings to show (the newest 50 are listed)
+            anomalous: (date, time) of readings to highlight as anomalous
+        """
+        anomalous = anomalous or set()
         try:
             # Clear existing items
             for item in self.readings_tree.get_children():
@@ -7090,8 +7309,10 @@ is strictly prohibited."""
                         self._safe_format(reading.get('temperature'), 1),
                         self._safe_format(reading.get('bromine'), 2),
                         self._safe_format(reading.get('salt'), 0)
-                    )
+                    ),
+                    tags=('anomaly',) if (reading.get('date', ''), reading.get('time', '')) in anomalous else ()
                 )
+            self.readings_tree.tag_configure('anomaly', background='#ffcccc')
             
         except Exception as e:
             logger.error(f"Error updating recent readings table: {e}")
@@ -7114,9 +7335,8 @@ is strictly prohibited."""
             if not filename:
                 return
             
-            # Load readings
-            readings = self.chemical_readings if hasattr(self, "chemical_readings") else []
-            filtered_readings = self._filter_readings_by_range(readings, self.analytics_range_var.get())
+            # Slice the current pool's readings to the selected range
+            filtered_readings = self._analytics_view().readings
             
             if not filtered_readings:
                 messagebox.showwarning("No Data", "No readings to export")
@@ -7234,12 +7454,24 @@ is strictly prohibited."""
         self.predictions_display = tk.Text(parent, height=20, wrap="word", font=("Arial", 10))
         self.predictions_display.pack(fill="both", expand=True, padx=10, pady=10)
         
-        # Refresh button
+        # Refresh buttons
+        buttons = tk.Frame(parent)
+        buttons.pack(pady=10)
         ttk.Button(
-            parent,
+            buttons,
             text="Generate Predictions",
             command=self._update_predictions
-        ).pack(pady=10)
+        ).pack(side="left", padx=5)
+        ttk.Button(
+            buttons,
+            text="Forecast All Pools",
+            command=self._update_fleet_predictions
+        ).pack(side="left", padx=5)
+        ttk.Button(
+            buttons,
+            text="Backtest Models",
+            command=self._update_backtest
+        ).pack(side="left", padx=5)
         
     def _create_insights_section(self, parent):
         """Create insights section"""
@@ -7345,8 +7577,50 @@ is strictly prohibited."""
             command=self._update_anomalies
         ).pack(pady=10)
         
+    def _run_analytics_job(self, key, display, work, render):
+        """
+        Run engine work on the analytics worker and render its result on the Tk thread
+        
+        Args:
+            key: Job key; a new job with the same key supersedes the previous one
+            display: Text widget the result goes into (shows progress meanwhile)
+            work: Engine call to run off the Tk thread (must not touch widgets)
+            render: Called with work's result on the Tk thread
+        
+        Every PoolAnalyticsEngineV2 call from the UI goes through here, so the
+        engine's unlocked caches (forecaster state, ResultMemo, anomaly store)
+        are only ever used from the one worker thread.
+        """
+        display.delete(1.0, tk.END)
+        display.insert(tk.END, "Working... (results appear here when the analysis finishes)\n")
+        self._analytics_job_displays[key] = display
+        
+        def show_error(error):
+            display.delete(1.0, tk.END)
+            display.insert(tk.END, f"Error: {str(error)}")
+        
+        self.analytics_worker.submit(key, work, render, show_error)
+        if not self._analytics_polling:
+            self._analytics_polling = True
+            self.after(50, self._poll_analytics_worker)
+    
+    def _poll_analytics_worker(self):
+        """Deliver finished analytics jobs on the Tk thread, polling while any are outstanding"""
+        if self.analytics_worker.deliver_ready():
+            self.after(50, self._poll_analytics_worker)
+        else:
+            self._analytics_polling = False
+    
+    def _cancel_analytics_jobs(self):
+        """Cancel queued and running analytics jobs after the pool or time period changed"""
+        for key in self.analytics_worker.cancel_all():
+            display = self._analytics_job_displays.get(key)
+            if display is not None:
+                display.delete(1.0, tk.END)
+                display.insert(tk.END, "Cancelled: the pool or time period changed. Refresh to run again.")
+        
     def _update_predictions(self):
-        """Update predictions display"""
+        """Update predictions display (the forecast runs on the analytics worker)"""
         self.predictions_display.delete(1.0, tk.END)
         
         if not self.pool_analytics:
@@ -7361,11 +7635,19 @@ is strictly prohibited."""
             self.predictions_display.insert(tk.END, "Keep adding readings to enable predictive analytics!")
             return
             
+        # Use historical data for predictions (column view, validated when the columns were built)
+        pool_id = self.current_pool['id'] if self.current_pool else None
+        history = self._current_pool_columns().view().copy()
+        self._run_analytics_job(
+            'predictions', self.predictions_display,
+            lambda: self.pool_analytics.predict_next_readings(history, pool_id=pool_id),
+            self._show_predictions
+        )
+        
+    def _show_predictions(self, predictions):
+        """Render forecast results into the predictions display"""
+        self.predictions_display.delete(1.0, tk.END)
         try:
-            # Use historical data for predictions
-            predictions = self.pool_analytics.predict_next_readings(self.chemical_readings)
-            
-            
             if predictions:
                 self.predictions_display.insert(tk.END, "PREDICTED NEXT READINGS\n", "title")
                 self.predictions_display.insert(tk.END, "=" * 50 + "\n\n")
@@ -7399,28 +7681,142 @@ is strictly prohibited."""
         except Exception as e:
             self.predictions_display.insert(tk.END, f"Error: {str(e)}")
             
-        # Configure tags
+        # Configure tags
+        self.predictions_display.tag_config("title", font=("Arial", 12, "bold"), foreground="#27ae60")
+        self.predictions_display.tag_config("bold", font=("Arial", 10, "bold"))
+        
+    def _update_fleet_predictions(self):
+        """Forecast every pool at once, fitting models across all CPU cores"""
+        self.predictions_display.delete(1.0, tk.END)
+        
+        if not self.pool_analytics:
+            self.predictions_display.insert(tk.END, "ML Analytics Engine not available.")
+            return
+        
+        names = {pool['id']: pool.get('name', pool['id']) for pool in self.pools if pool.get('id')}
+        histories = {pool_id: self.reading_columns.pool(pool_id).view().copy() for pool_id in names}
+        
+        def forecast():
+            started = time.perf_counter()
+            return self.pool_analytics.predict_pools(histories), time.perf_counter() - started
+        
+        # Same key as the single-pool forecast: whichever was asked for last owns the pane
+        self._run_analytics_job('predictions', self.predictions_display, forecast,
+                                lambda result: self._show_fleet_predictions(names, *result))
+        
+    def _show_fleet_predictions(self, names, fleet, elapsed):
+        """Render fleet forecasts into the predictions display"""
+        self.predictions_display.delete(1.0, tk.END)
+        try:
+            self.predictions_display.insert(tk.END, "FLEET FORECAST - NEXT READINGS\n", "title")
+            self.predictions_display.insert(tk.END, "=" * 50 + "\n\n")
+            for pool_id, predictions in fleet.items():
+                self.predictions_display.insert(tk.END, f"{names[pool_id]} ({pool_id})\n", "bold")
+                if not predictions:
+                    self.predictions_display.insert(tk.END, "   Not enough readings\n\n")
+                    continue
+                for param, pred_data in predictions.items():
+                    param_name = param.replace('_', ' ').title()
+                    self.predictions_display.insert(
+                        tk.END,
+                        f"   {param_name}: {pred_data['value']:.2f} "
+                        f"({pred_data['lower_bound']:.2f} - {pred_data['upper_bound']:.2f})\n"
+                    )
+                self.predictions_display.insert(tk.END, "\n")
+            self.predictions_display.insert(tk.END, f"Forecast {len(fleet)} pools in {elapsed:.1f}s")
+        except Exception as e:
+            self.predictions_display.insert(tk.END, f"Error: {str(e)}")
+        
+        self.predictions_display.tag_config("title", font=("Arial", 12, "bold"), foreground="#27ae60")
+        self.predictions_display.tag_config("bold", font=("Arial", 10, "bold"))
+        
+    def _update_backtest(self):
+        """Show rolling-origin backtest accuracy of the current pool's forecasts"""
+        self.predictions_display.delete(1.0, tk.END)
+        
+        if not self.pool_analytics:
+            self.predictions_display.insert(tk.END, "ML Analytics Engine not available.")
+            return
+        
+        history = self._current_pool_columns().view().copy()
+        pool_id = self.current_pool['id'] if self.current_pool else None
+        
+        def backtest():
+            started = time.perf_counter()
+            accuracy = self.pool_analytics.evaluate_prediction_accuracy(history, pool_id)
+            return accuracy, time.perf_counter() - started
+        
+        self._run_analytics_job('predictions', self.predictions_display, backtest,
+                                lambda result: self._show_backtest(*result))
+        
+    def _show_backtest(self, accuracy, elapsed):
+        """Render backtest accuracy into the predictions display"""
+        self.predictions_display.delete(1.0, tk.END)
+        try:
+            if not accuracy:
+                self.predictions_display.insert(
+                    tk.END,
+                    f"Not enough readings to backtest (each parameter needs {MIN_BACKTEST_READINGS}+ valid readings)."
+                )
+                return
+            
+            self.predictions_display.insert(tk.END, "FORECAST BACKTEST - ONE STEP AHEAD\n", "title")
+            self.predictions_display.insert(tk.END, "=" * 50 + "\n\n")
+            for param, metrics in accuracy.items():
+                param_name = param.replace('_', ' ').title()
+                self.predictions_display.insert(tk.END, f"{param_name}\n", "bold")
+                self.predictions_display.insert(
+                    tk.END,
+                    f"   RMSE: {self._format_metric(metrics['rmse'], '.3f')}   "
+                    f"MAPE: {self._format_metric(metrics['mape'], '.1f', '%')}   "
+                    f"({metrics['test_points']} test readings, {metrics['seconds']:.2f}s)\n"
+                )
+                for i, fold in enumerate(metrics['folds'], 1):
+                    self.predictions_display.insert(
+                        tk.END,
+                        f"      Fold {i}: {fold['size']} readings from #{fold['origin'] + 1}, "
+                        f"RMSE {self._format_metric(fold['rmse'], '.3f')}, "
+                        f"MAPE {self._format_metric(fold['mape'], '.1f', '%')}, {fold['seconds']:.2f}s\n"
+                    )
+                self.predictions_display.insert(tk.END, "\n")
+            self.predictions_display.insert(tk.END, f"Backtested {len(accuracy)} parameters in {elapsed:.1f}s")
+        except Exception as e:
+            self.predictions_display.insert(tk.END, f"Error: {str(e)}")
+        
         self.predictions_display.tag_config("title", font=("Arial", 12, "bold"), foreground="#27ae60")
         self.predictions_display.tag_config("bold", font=("Arial", 10, "bold"))
+    
+    @staticmethod
+    def _format_metric(value, spec, suffix=''):
+        """Format a backtest metric, showing n/a where it is undefined (None)"""
+        return "n/a" if value is None else f"{value:{spec}}{suffix}"
         
     def _update_insights(self):
-        """Update insights display"""
+        """Update insights display (insights are computed on the analytics worker)"""
         self.insights_display.delete(1.0, tk.END)
         
         if not self.pool_analytics:
             self.insights_display.insert(tk.END, "ML Analytics Engine not available.")
             return
             
-        try:
-            current = self._get_readings_from_form(show_warnings=False)
-            if not current:
-                self.insights_display.insert(tk.END, "No readings available for analysis.")
-                return
-                
-            # Get historical data for insights
-            historical = self.chemical_readings[-10:] if len(self.chemical_readings) >= 10 else self.chemical_readings
-            insights = self.pool_analytics.get_insights(current, historical)
+        current = self._get_readings_from_form(show_warnings=False)
+        if not current:
+            self.insights_display.insert(tk.END, "No readings available for analysis.")
+            return
             
+        # Get historical data for insights (column view of the last 10 readings)
+        historical = self._current_pool_columns().view().tail(10).copy()
+        pool_id = self.current_pool['id'] if self.current_pool else None
+        self._run_analytics_job(
+            'insights', self.insights_display,
+            lambda: self.pool_analytics.get_insights(current, historical, pool_id),
+            self._show_insights
+        )
+        
+    def _show_insights(self, insights):
+        """Render insights into the insights display"""
+        self.insights_display.delete(1.0, tk.END)
+        try:
             if insights:
                 self.insights_display.insert(tk.END, "AI-POWERED INSIGHTS\n", "title")
                 self.insights_display.insert(tk.END, "=" * 50 + "\n\n")
@@ -7447,7 +7843,7 @@ is strictly prohibited."""
         self.insights_display.tag_config("priority_medium", foreground="#f39c12", font=("Arial", 10, "bold"))
         
     def _update_trends(self):
-        """Update trends display"""
+        """Update trends display (trends are fitted on the analytics worker)"""
         self.trends_display.delete(1.0, tk.END)
         
         if not self.pool_analytics:
@@ -7459,11 +7855,18 @@ is strictly prohibited."""
             self.trends_display.insert(tk.END, "Need at least 7 readings for trend analysis")
             return
             
+        # Get historical data for trends (column view of the last 10 readings)
+        historical = self._current_pool_columns().view().tail(10).copy()
+        self._run_analytics_job(
+            'trends', self.trends_display,
+            lambda: self.pool_analytics.analyze_trends(historical),
+            self._show_trends
+        )
+        
+    def _show_trends(self, trends):
+        """Render trend analysis into the trends display"""
+        self.trends_display.delete(1.0, tk.END)
         try:
-            # Get historical data for trends
-            historical = self.chemical_readings[-10:] if len(self.chemical_readings) >= 10 else self.chemical_readings
-            trends = self.pool_analytics.analyze_trends(historical)
-            
             if trends:
                 self.trends_display.insert(tk.END, "TREND ANALYSIS\n", "title")
                 self.trends_display.insert(tk.END, "=" * 50 + "\n\n")
@@ -7491,7 +7894,7 @@ is strictly prohibited."""
         self.trends_display.tag_config("bold", font=("Arial", 10, "bold"))
         
     def _update_optimization(self):
-        """Update optimization display"""
+        """Update optimization display (the optimization runs on the analytics worker)"""
         self.optimization_display.delete(1.0, tk.END)
         
         if not self.pool_analytics:
@@ -7506,45 +7909,73 @@ is strictly prohibited."""
                 
             # Get adjustments first
             adjustments = self._calculate_adjustments()
+            if not adjustments:
+                return
             
-            if adjustments:
-                   # Convert adjustments dict to list format
-                   adjustments_list = []
-                   for param, adj_data in adjustments.items():
-                       if isinstance(adj_data, dict):
-                           adj_dict = adj_data.copy()
-                           adj_dict["parameter"] = param
-                           if "chemical" not in adj_dict:
-                               adj_dict["chemical"] = param
-                           adjustments_list.append(adj_dict)
-                   
-                   optimization = self.pool_analytics.optimize_chemical_usage(current, adjustments_list)
-                
-                   if optimization:
-                       self.optimization_display.insert(tk.END, "COST OPTIMIZATION ANALYSIS\n", "title")
-                       self.optimization_display.insert(tk.END, "=" * 50 + "\n\n")
-                    
-                       self.optimization_display.insert(tk.END, f"Estimated Cost: ${optimization['total_cost']:.2f}\n", "cost")
-                       self.optimization_display.insert(tk.END, f"Savings Potential: ${optimization['savings_potential']:.2f}\n\n", "savings")
-                    
-                       self.optimization_display.insert(tk.END, "Recommendations:\n", "bold")
-                       for rec in optimization['recommendations']:
-                           if isinstance(rec, dict):
-                               # Format dictionary recommendations professionally
-                               category = rec.get('category', 'General')
-                               suggestion = rec.get('suggestion', '')
-                               savings = rec.get('potential_savings', 0)
-                               self.optimization_display.insert(tk.END, f"   • {category}: ", "bold")
-                               self.optimization_display.insert(tk.END, f"{suggestion}")
-                               if savings > 0:
-                                   self.optimization_display.insert(tk.END, f" (Save: ${savings:.2f})", "savings")
-                               self.optimization_display.insert(tk.END, "\n")
-                           else:
-                               # Handle string recommendations
-                               self.optimization_display.insert(tk.END, f"   • {rec}\n")
-                   else:
-                       self.optimization_display.insert(tk.END, "No adjustments needed.\n")
-                       self.optimization_display.insert(tk.END, "Pool chemistry is balanced!")
+            # Convert adjustments dict to list format
+            adjustments_list = []
+            for param, adj_data in adjustments.items():
+                if isinstance(adj_data, dict):
+                    adj_dict = adj_data.copy()
+                    adj_dict["parameter"] = param
+                    if "chemical" not in adj_dict:
+                        adj_dict["chemical"] = param
+                    adjustments_list.append(adj_dict)
+            
+            # Cost the pool's history too, for the monthly estimate and savings
+            history = self._current_pool_columns().view().copy()
+            pool_size = float(self.pool_size_entry.get()) if self.pool_size_entry.get() else 10000
+        except Exception as e:
+            self.optimization_display.insert(tk.END, f"Error: {str(e)}")
+            return
+        
+        self._run_analytics_job(
+            'optimization', self.optimization_display,
+            lambda: self.pool_analytics.optimize_chemical_usage(current, adjustments_list, history, pool_size),
+            self._show_optimization
+        )
+        
+    def _show_optimization(self, optimization):
+        """Render the cost optimization into the optimization display"""
+        self.optimization_display.delete(1.0, tk.END)
+        try:
+            if optimization:
+                self.optimization_display.insert(tk.END, "COST OPTIMIZATION ANALYSIS\n", "title")
+                self.optimization_display.insert(tk.END, "=" * 50 + "\n\n")
+
+                self.optimization_display.insert(tk.END, f"Estimated Cost: ${optimization['total_cost']:.2f}\n", "cost")
+                if optimization.get('estimate_source') == 'history':
+                    self.optimization_display.insert(
+                        tk.END, f"Monthly Estimate: ${optimization['monthly_estimate']:.2f} (from the doses your readings called for)\n"
+                    )
+                    self.optimization_display.insert(tk.END, f"Savings Potential: ${optimization['savings_potential']:.2f} per month\n\n", "savings")
+                    self.optimization_display.insert(tk.END, "Recent Monthly Costs:\n", "bold")
+                    for month in optimization['monthly_costs'][-6:]:
+                        self.optimization_display.insert(
+                            tk.END, f"   {month['month']}: ${month['cost']:.2f} ({month['doses']} doses, {month['readings']} readings)\n"
+                        )
+                    self.optimization_display.insert(tk.END, "\n")
+                else:
+                    self.optimization_display.insert(tk.END, f"Savings Potential: ${optimization['savings_potential']:.2f}\n\n", "savings")
+
+                self.optimization_display.insert(tk.END, "Recommendations:\n", "bold")
+                for rec in optimization['recommendations']:
+                    if isinstance(rec, dict):
+                        # Format dictionary recommendations professionally
+                        category = rec.get('category', 'General')
+                        suggestion = rec.get('suggestion', '')
+                        savings = rec.get('potential_savings', 0)
+                        self.optimization_display.insert(tk.END, f"   • {category}: ", "bold")
+                        self.optimization_display.insert(tk.END, f"{suggestion}")
+                        if savings > 0:
+                            self.optimization_display.insert(tk.END, f" (Save: ${savings:.2f})", "savings")
+                        self.optimization_display.insert(tk.END, "\n")
+                    else:
+                        # Handle string recommendations
+                        self.optimization_display.insert(tk.END, f"   • {rec}\n")
+            else:
+                self.optimization_display.insert(tk.END, "No adjustments needed.\n")
+                self.optimization_display.insert(tk.END, "Pool chemistry is balanced!")
                 
         except Exception as e:
             self.optimization_display.insert(tk.END, f"Error: {str(e)}")
@@ -7556,7 +7987,7 @@ is strictly prohibited."""
         self.optimization_display.tag_config("savings", font=("Arial", 11, "bold"), foreground="#27ae60")
         
     def _update_anomalies(self):
-        """Update anomalies display"""
+        """Update anomalies display (detection and history scoring run on the analytics worker)"""
         self.anomalies_display.delete(1.0, tk.END)
         
         if not self.pool_analytics:
@@ -7568,16 +7999,27 @@ is strictly prohibited."""
             self.anomalies_display.insert(tk.END, "Need at least 10 readings for anomaly detection")
             return
             
-        try:
-            current = self._get_readings_from_form(show_warnings=False)
-            if not current:
-                self.anomalies_display.insert(tk.END, "No readings available.")
-                return
-                
-            # Get historical data for anomaly detection
-            historical = self.chemical_readings[-10:] if len(self.chemical_readings) >= 10 else self.chemical_readings
-            anomalies = self.pool_analytics.detect_anomalies(current, historical)
+        current = self._get_readings_from_form(show_warnings=False)
+        if not current:
+            self.anomalies_display.insert(tk.END, "No readings available.")
+            return
             
+        # Score against the pool's whole history; its trained detector is reused between refreshes
+        historical = self._current_pool_columns().view().copy()
+        pool_id = self.current_pool['id'] if self.current_pool else None
+        
+        def detect():
+            anomalies = self.pool_analytics.detect_anomalies(current, historical, pool_id=pool_id)
+            # Every anomalous reading in the history, scored in one pass
+            return anomalies, self.pool_analytics.score_history(historical, pool_id)
+        
+        self._run_analytics_job('anomalies', self.anomalies_display, detect, self._show_anomalies)
+        
+    def _show_anomalies(self, result):
+        """Render detected anomalies and flagged history readings into the anomalies display"""
+        self.anomalies_display.delete(1.0, tk.END)
+        try:
+            anomalies, batch = result
             if anomalies:
                 self.anomalies_display.insert(tk.END, "ANOMALY DETECTION RESULTS\n", "title")
                 self.anomalies_display.insert(tk.END, "=" * 50 + "\n\n")
@@ -7592,7 +8034,28 @@ is strictly prohibited."""
                     self.anomalies_display.insert(tk.END, f"   This reading is unusual - verify accuracy\n\n")
             else:
                 self.anomalies_display.insert(tk.END, "NO ANOMALIES DETECTED\n", "title")
-                self.anomalies_display.insert(tk.END, "\nAll readings are within expected ranges.")
+                self.anomalies_display.insert(tk.END, "\nAll readings are within expected ranges.\n")
+            
+            rows = batch['data'].readings if isinstance(batch['data'], ColumnView) else batch['data']
+            flagged = np.flatnonzero(batch['flags'])
+            if len(flagged):
+                self.anomalies_display.insert(tk.END, "\nANOMALOUS READINGS IN HISTORY\n", "title")
+                self.anomalies_display.insert(
+                    tk.END, f"{len(flagged)} of {len(rows)} readings flagged ({batch['method']})\n\n"
+                )
+                if batch['scores'] is not None:
+                    flagged = flagged[np.argsort(batch['scores'][flagged])]  # most anomalous first
+                for row in flagged[:20]:
+                    reading = rows[row]
+                    z = np.nan_to_num(np.abs(batch['z_scores'][row]), nan=0.0)
+                    worst = int(np.argmax(z))
+                    param = batch['parameters'][worst]
+                    detail = f"{param.replace('_', ' ').title()} {batch['values'][row, worst]:.2f} (Z-score: {z[worst]:.2f})" if z[worst] else ""
+                    self.anomalies_display.insert(
+                        tk.END, f"   {reading.get('date', '--')} {reading.get('time', '')}  {detail}\n"
+                    )
+                if len(flagged) > 20:
+                    self.anomalies_display.insert(tk.END, f"   ... and {len(flagged) - 20} more\n")
                 
         except Exception as e:
             self.anomalies_display.insert(tk.END, f"Error: {str(e)}")
@@ -9232,11 +9695,11 @@ Keep calibration log in Arduino comments!"""
                 self.customer_info = load_json(self.customer_file)
                 self._populate_customer_info(self.customer_info)
 
-            if self.readings_file.exists():
-                readings_data = load_json(self.readings_file)
-                if "readings" in readings_data:
-                    self.chemical_readings = readings_data["readings"]
-                    self._refresh_analytics_dashboard()
+            # Only the current pool's partitions (plus untagged legacy readings) are read
+            self.reading_columns.reset()
+            self.chemical_readings = list(self._current_pool_columns().view().readings)
+            if self.chemical_readings:
+                self._refresh_analytics_dashboard()
 
             logger.info("Data loaded successfully")
         except Exception as e:
@@ -9970,12 +10433,12 @@ Keep calibration log in Arduino comments!"""
             readings['date'] = now.strftime('%Y-%m-%d')
             readings['time'] = now.strftime('%H:%M:%S')
             readings['timestamp'] = now.isoformat()
+            self._add_pool_id_to_data(readings)
 
-            self.chemical_readings.append(readings)
-
-            save_data = {'timestamp': now.isoformat(), 'readings': self.chemical_readings}
-
-            if save_json(save_data, self.readings_file):
+            # Append one line to the pool's current month partition instead of rewriting the history
+            if self.reading_partitions.append(readings):
+                self.chemical_readings.append(readings)
+                self.reading_columns.add(readings)
                 self.status_var.set("Readings saved successfully")
                 self._update_status("Readings saved successfully")
                 self._refresh_analytics_dashboard()
@@ -9987,7 +10450,6 @@ Keep calibration log in Arduino comments!"""
                 # Refresh Alert History tab if it exists
                 if hasattr(self, 'alerts_tree'):
                     self.after(100, self._update_alerts_history_table)  # Refresh after 100ms
-                self._save_to_database(readings)
                 
                 # Send notification for readings saved
                 health_score = self._calculate_pool_health_score(readings)
@@ -10013,19 +10475,6 @@ Keep calibration log in Arduino comments!"""
             self._update_status("Save failed")
 
 
-    def _save_to_database(self, readings):
-        """Save readings to database"""
-        try:
-            temperature = readings.get('temperature', 0)
-            ph = readings.get('ph', 0)
-            chlorine = readings.get('free_chlorine', 0)  # Or total_chlorine as needed
-            self.data_manager.insert_reading(temperature, ph, chlorine)
-            logger.info("Readings saved to database")
-        except Exception as e:
-            logger.error(f"Error saving to database: {str(e)}")
-            messagebox.showerror("Database Error", f"An error occurred saving to the database: {str(e)}")
-
-
     def _clear_readings(self):
         """Clear all reading inputs"""
         for field, entry in self.entries.items():
@@ -10915,11 +11364,15 @@ Important:
     def _save_settings(self):
         """Save application settings"""
         try:
-            settings = {
+            # Keep settings that have no widget (e.g. forecast_workers)
+            settings = dict(json_cache.load(self.settings_file, {}))
+            settings.update({
                 'theme': 'clam',
                 'auto_backup': self.auto_backup_var.get()
-            }
-            save_json(settings, self.settings_file)
+            })
+            if not save_json(settings, self.settings_file):
+                messagebox.showerror("Save Error", "Settings could not be written to disk; see the log for details.")
+                return
             self.status_var.set("Settings saved successfully")
             self._update_status("Settings saved successfully")
         except Exception as e:
@@ -10927,23 +11380,109 @@ Important:
             messagebox.showerror("Save Error", f"An error occurred: {str(e)}")
 
 
+    def _import_readings(self):
+        """Bulk import historical readings from JSON, JSONL or CSV files into the current pool"""
+        try:
+            from tkinter import filedialog
+            file_paths = filedialog.askopenfilenames(
+                title="Select Readings to Import",
+                filetypes=[("Readings", "*.json *.jsonl *.csv"), ("All files", "*.*")]
+            )
+            if not file_paths:
+                return
+
+            pool_id = self.current_pool['id'] if self.current_pool else None
+            self._show_loading("Importing readings...")
+            importer = ReadingImporter(self.reading_partitions)
+            reports = [importer.import_file(path, pool_id) for path in file_paths]
+            self._hide_loading()
+
+            # New partitions: bring the current pool's view up to date
+            self._load_data()
+
+            lines = [f"{Path(r['file']).name}: {r['imported']} imported, {r['duplicates']} duplicates, "
+                     f"{r['invalid']} invalid, {r['undated']} without a date "
+                     f"({r['readings_per_sec']:,} readings/sec)" for r in reports]
+            errors = [error for r in reports for error in r['errors']][:5]
+            if errors:
+                lines += ["", "First validation errors:"] + errors
+            self._update_status(f"Imported {sum(r['imported'] for r in reports)} readings")
+            messagebox.showinfo("Import Complete", "\n".join(lines))
+        except Exception as e:
+            self._hide_loading()
+            logger.error(f"Error importing readings: {str(e)}")
+            messagebox.showerror("Import Error", f"An error occurred: {str(e)}")
+
     def _backup_data(self):
-        """Create a backup of all data files"""
+        """Create an incremental backup of all data files"""
         try:
-            backup_dir = self.data_dir / "backups"
-            backup_dir.mkdir(exist_ok=True)
-            backup_file = backup_dir / f"backup_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.zip"
-            with zipfile.ZipFile(backup_file, 'w') as zip_file:
-                for file in self.data_dir.glob('*'):
-                    if file.is_file():
-                        zip_file.write(file, arcname=file.name)
-            self.status_var.set(f"Backup created at {backup_file}")
-            self._update_status(f"Backup created at {backup_file}")
-            logger.info(f"Backup created at {backup_file}")
+            # Pending JSON saves must reach disk before they can be backed up
+            if not json_cache.flush():
+                logger.warning("Backing up while some JSON saves are still failing to write")
+            manifest = BackupStore(self.data_dir).backup()
+            stats = manifest['stats']
+            message = (f"Backup {manifest['id']} created: {stats['files_read']} of {stats['files']} files changed, "
+                       f"{stats['bytes_written'] / 1024:.1f} KB written")
+            self.status_var.set(message)
+            self._update_status(message)
         except Exception as e:
             logger.error(f"Error creating backup: {str(e)}")
             messagebox.showerror("Backup Error", f"An error occurred: {str(e)}")
 
+    def _restore_backup(self):
+        """Restore data files from a backup snapshot"""
+        try:
+            store = BackupStore(self.data_dir)
+            snapshots = store.list_snapshots()
+            if not snapshots:
+                messagebox.showinfo("Restore Backup", "No backups found")
+                return
+            
+            dialog = tk.Toplevel(self)
+            dialog.title("Restore Backup")
+            dialog.geometry("360x320")
+            dialog.transient(self)
+            dialog.grab_set()
+            
+            ttk.Label(dialog, text="Select a backup to restore:").pack(pady=5)
+            listbox = tk.Listbox(dialog, height=12)
+            listbox.pack(fill="both", expand=True, padx=10, pady=5)
+            for snapshot_id in reversed(snapshots):
+                listbox.insert(tk.END, snapshot_id)
+            listbox.selection_set(0)
+            
+            def restore():
+                selection = listbox.curselection()
+                if not selection:
+                    return
+                snapshot_id = listbox.get(selection[0])
+                if not messagebox.askyesno("Confirm Restore",
+                                           f"Replace current data with backup {snapshot_id}?", parent=dialog):
+                    return
+                dialog.destroy()
+                
+                try:
+                    # Write out pending saves, restore, then reload everything from disk
+                    json_cache.flush()
+                    # Saves that still could not be written must not overwrite the restored files
+                    json_cache.discard_pending()
+                    count = store.restore(snapshot_id)
+                    json_cache.invalidate()
+                    # A backup from before partitioning brings back readings.json, which then replaces the partitions
+                    self._open_reading_partitions(replace_from_legacy=store.restores_legacy_readings(snapshot_id))
+                    self.alert_store.load()
+                    self._load_data()
+                    self._update_status(f"Restored {count} files from backup {snapshot_id}")
+                    messagebox.showinfo("Restore Complete", f"Restored {count} files from backup {snapshot_id}")
+                except Exception as e:
+                    logger.error(f"Error restoring backup {snapshot_id}: {str(e)}")
+                    messagebox.showerror("Restore Error", f"Could not restore backup {snapshot_id}: {str(e)}")
+            
+            ttk.Button(dialog, text="Restore", command=restore).pack(pady=5)
+        except Exception as e:
+            logger.error(f"Error restoring backup: {str(e)}")
+            messagebox.showerror("Restore Error", f"An error occurred: {str(e)}")
+
 
 
     def _save_alert_to_history(self, parameter, value, threshold_min, threshold_max, message, severity='warning'):
@@ -10980,24 +11519,8 @@ Important:
                 'notes': ''
             }
             
-            # Load existing alerts
-            alerts_file = self.data_dir / "alerts.json"
-            if alerts_file.exists():
-                with open(alerts_file, 'r') as f:
-                    alerts = json.load(f)
-            else:
-                alerts = []
-            
-            # Add new alert
-            alerts.append(alert)
-            
-            # Keep only last 1000 alerts
-            if len(alerts) > 1000:
-                alerts = alerts[-1000:]
-            
-            # Save to file
-            with open(alerts_file, 'w') as f:
-                json.dump(alerts, f, indent=2)
+            # Journal the new alert (old closed alerts move to the monthly archive)
+            self.alert_store.add(alert)
             
             logger.info(f"Alert saved to history: {alert['alert_id']} - {severity} - {parameter}")
             
@@ -11010,46 +11533,19 @@ Important:
         try:
             from datetime import datetime, timedelta
             
-            alerts_file = self.data_dir / "alerts.json"
-            if not alerts_file.exists():
-                return []
-            
-            with open(alerts_file, 'r') as f:
-                all_alerts = json.load(f)
+            if not pool_id and hasattr(self, 'active_pool_id') and self.active_pool_id:
+                pool_id = self.active_pool_id
+            since = datetime.now() - timedelta(days=days) if days else None
             
-            # Filter by pool
-            if pool_id:
-                all_alerts = [a for a in all_alerts if a.get('pool_id') == pool_id]
-            else:
-                # Filter by active pool, but if no active_pool_id, show all
-                if hasattr(self, 'active_pool_id') and self.active_pool_id:
-                    all_alerts = [a for a in all_alerts if a.get('pool_id') == self.active_pool_id]
+            # Hot alerts plus only the archive segments overlapping the window
+            # (pool_id was resolved to the active pool above)
+            all_alerts = self.alert_store.find_range(pool_id=pool_id or None, start=since)
+            if not pool_id:
                 # If no pool filtering possible, show all alerts
-                logger.info(f"Filtering alerts by pool: {self.active_pool_id if hasattr(self, 'active_pool_id') else 'ALL'}")
-            
-            # Filter by date range
-            if days:
-                cutoff_date = datetime.now() - timedelta(days=days)
-                filtered_alerts = []
-                for a in all_alerts:
-                    try:
-                        # Try standard format first
-                        timestamp = datetime.strptime(a['timestamp'], '%Y-%m-%d %H:%M:%S')
-                    except ValueError:
-                        try:
-                            # Try ISO format (for old alerts)
-                            timestamp = datetime.fromisoformat(a['timestamp'])
-                        except ValueError:
-                            # Skip alerts with invalid timestamps
-                            continue
-                    
-                    if timestamp >= cutoff_date:
-                        filtered_alerts.append(a)
-                
-                all_alerts = filtered_alerts
+                logger.info("Filtering alerts by pool: ALL")
             
             # Sort by timestamp (newest first)
-            all_alerts.sort(key=lambda x: x['timestamp'], reverse=True)
+            all_alerts = sorted(all_alerts, key=lambda x: x['timestamp'], reverse=True)
             
             return all_alerts
             
@@ -11325,23 +11821,17 @@ Important:
             item = self.alerts_tree.item(selection[0])
             timestamp = item['values'][0]
             
-            # Load alerts
-            alerts_file = self.data_dir / "alerts.json"
-            with open(alerts_file, 'r') as f:
-                alerts = json.load(f)
-            
             # Find and update alert
             from datetime import datetime
-            for alert in alerts:
-                if alert['timestamp'] == timestamp and alert.get('pool_id') == self.active_pool_id:
-                    alert['resolved'] = True
-                    alert['resolved_timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            for alert in self.alert_store.find(pool_id=self.active_pool_id):
+                if alert['timestamp'] == timestamp:
+                    self.alert_store.update(
+                        alert['alert_id'],
+                        resolved=True,
+                        resolved_timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    )
                     break
             
-            # Save updated alerts
-            with open(alerts_file, 'w') as f:
-                json.dump(alerts, f, indent=2)
-            
             # Refresh table
             self._update_alerts_history_table()
             
@@ -11448,21 +11938,12 @@ Important:
             def save_notes():
                 notes = notes_text.get("1.0", "end-1c")
                 
-                # Load alerts
-                alerts_file = self.data_dir / "alerts.json"
-                with open(alerts_file, 'r') as f:
-                    alerts = json.load(f)
-                
                 # Find and update alert
-                for alert in alerts:
-                    if alert['timestamp'] == timestamp and alert.get('pool_id') == self.active_pool_id:
-                        alert['notes'] = notes
+                for alert in self.alert_store.find(pool_id=self.active_pool_id):
+                    if alert['timestamp'] == timestamp:
+                        self.alert_store.update(alert['alert_id'], notes=notes)
                         break
                 
-                # Save
-                with open(alerts_file, 'w') as f:
-                    json.dump(alerts, f, indent=2)
-                
                 dialog.destroy()
                 messagebox.showinfo("Success", "Notes saved")
             
@@ -11485,15 +11966,10 @@ Important:
             item = self.alerts_tree.item(selection[0])
             timestamp = item['values'][0]
             
-            # Load alerts
-            alerts_file = self.data_dir / "alerts.json"
-            with open(alerts_file, 'r') as f:
-                alerts = json.load(f)
-            
             # Find alert
             alert = None
-            for a in alerts:
-                if a['timestamp'] == timestamp and a.get('pool_id') == self.active_pool_id:
+            for a in self.alert_store.find(pool_id=self.active_pool_id):
+                if a['timestamp'] == timestamp:
                     alert = a
                     break
             
@@ -11556,8 +12032,15 @@ Important:
     def _cleanup(self):
         """Clean up resources before exit"""
         try:
-            if self.data_manager:
-                self.data_manager.close_connection()
+            if self.alert_store.pending:
+                self.alert_store.compact()
+            self.analytics_worker.shutdown()
+            if self.pool_analytics:
+                self.pool_analytics.forecaster.shutdown()
+                self.pool_analytics.save_models()
+            # Write out any coalesced JSON saves still waiting in the background
+            json_cache.flush()
+            logger.info(f"JSON cache: {json_cache.stats()}")
             if self.arduino:
                 self.arduino.disconnect()
         except Exception as e:
@@ -12464,8 +12947,8 @@ Important:
 
             try:
                 if os.path.exists(config_file):
-                    with open(config_file, 'r') as f:
-                        config = json.load(f)
+                    # Copy: the alert settings dialog edits the returned config in place
+                    config = copy.deepcopy(json_cache.load(config_file, {}))
                     print(f"[Alert Config] Loaded configuration from {config_file}")
                     return config
                 else:
@@ -12493,8 +12976,7 @@ Important:
                     return False
 
                 # Save to file
-                with open(config_file, 'w') as f:
-                    json.dump(config, f, indent=2)
+                json_cache.save(config_file, config, indent=2, defer=False)
 
                 print(f"[Alert Config] Configuration saved successfully")
                 return True
@@ -12638,36 +13120,20 @@ Important:
     def _acknowledge_alert(self, alert_id):
             """
             Mark alert as acknowledged.
-            Updates status and timestamp in alerts.json.
+            Journals the status and timestamp change in the alert store.
             """
             try:
-                alerts_file = os.path.join(self.data_dir, "alerts.json")
-
-                if not os.path.exists(alerts_file):
-                    print(f"[Acknowledge] Alerts file not found")
-                    return False
-
-                # Load alerts
-                with open(alerts_file, 'r') as f:
-                    alerts = json.load(f)
-
-                # Find and update alert
-                alert_found = False
-                for alert in alerts:
-                    if alert.get('alert_id') == alert_id:
-                        alert['status'] = 'acknowledged'
-                        alert['acknowledged_at'] = datetime.now().isoformat()
-                        alert_found = True
-                        break
+                # Indexed lookup and journaled update
+                alert = self.alert_store.update(
+                    alert_id,
+                    status='acknowledged',
+                    acknowledged_at=datetime.now().isoformat()
+                )
 
-                if not alert_found:
+                if not alert:
                     print(f"[Acknowledge] Alert {alert_id} not found")
                     return False
 
-                # Save updated alerts
-                with open(alerts_file, 'w') as f:
-                    json.dump(alerts, f, indent=2)
-
                 print(f"[Acknowledge] Alert {alert_id} acknowledged")
                 return True
 
@@ -12701,25 +13167,14 @@ Important:
             Mark alert as reviewed and add optional notes.
             """
             try:
-                alerts_file = os.path.join(self.data_dir, "alerts.json")
-
-                if not os.path.exists(alerts_file):
-                    return False
-
-                with open(alerts_file, 'r') as f:
-                    alerts = json.load(f)
-
-                for alert in alerts:
-                    if alert.get('alert_id') == alert_id:
-                        alert['status'] = 'acknowledged'
-                        alert['acknowledged_at'] = datetime.now().isoformat()
-                        if notes:
-                            alert['notes'] = notes
-                        break
-
-                with open(alerts_file, 'w') as f:
-                    json.dump(alerts, f, indent=2)
+                changes = {
+                    'status': 'acknowledged',
+                    'acknowledged_at': datetime.now().isoformat()
+                }
+                if notes:
+                    changes['notes'] = notes
 
+                self.alert_store.update(alert_id, **changes)
                 return True
 
             except Exception as e:
@@ -12736,26 +13191,10 @@ Important:
             Updates snoozed_until timestamp.
             """
             try:
-                alerts_file = os.path.join(self.data_dir, "alerts.json")
-
-                if not os.path.exists(alerts_file):
-                    return False
-
-                with open(alerts_file, 'r') as f:
-                    alerts = json.load(f)
-
                 # Calculate snooze end time
                 snooze_until = (datetime.now() + timedelta(hours=hours)).isoformat()
 
-                # Find and update alert
-                for alert in alerts:
-                    if alert.get('alert_id') == alert_id:
-                        alert['snoozed_until'] = snooze_until
-                        alert['status'] = 'snoozed'
-                        break
-
-                with open(alerts_file, 'w') as f:
-                    json.dump(alerts, f, indent=2)
+                self.alert_store.update(alert_id, snoozed_until=snooze_until, status='snoozed')
 
                 print(f"[Snooze] Alert {alert_id} snoozed for {hours} hours")
                 return True
@@ -12770,23 +13209,12 @@ Important:
             Updates dismissed flag and timestamp.
             """
             try:
-                alerts_file = os.path.join(self.data_dir, "alerts.json")
-
-                if not os.path.exists(alerts_file):
-                    return False
-
-                with open(alerts_file, 'r') as f:
-                    alerts = json.load(f)
-
-                for alert in alerts:
-                    if alert.get('alert_id') == alert_id:
-                        alert['dismissed'] = True
-                        alert['dismissed_at'] = datetime.now().isoformat()
-                        alert['status'] = 'dismissed'
-                        break
-
-                with open(alerts_file, 'w') as f:
-                    json.dump(alerts, f, indent=2)
+                self.alert_store.update(
+                    alert_id,
+                    dismissed=True,
+                    dismissed_at=datetime.now().isoformat(),
+                    status='dismissed'
+                )
 
                 print(f"[Dismiss] Alert {alert_id} dismissed")
                 return True
@@ -12801,29 +13229,19 @@ Important:
             Returns list of reactivated alert IDs.
             """
             try:
-                alerts_file = os.path.join(self.data_dir, "alerts.json")
-
-                if not os.path.exists(alerts_file):
-                    return []
-
-                with open(alerts_file, 'r') as f:
-                    alerts = json.load(f)
-
                 current_time = datetime.now()
                 reactivated = []
 
-                for alert in alerts:
+                # Only snoozed alerts can carry a pending snooze
+                for alert in self.alert_store.find(status='snoozed'):
                     snooze_until = alert.get('snoozed_until')
                     if snooze_until:
                         snooze_time = datetime.fromisoformat(snooze_until)
                         if current_time >= snooze_time:
-                            alert['snoozed_until'] = None
-                            alert['status'] = 'unacknowledged'
+                            self.alert_store.update(alert['alert_id'], snoozed_until=None, status='unacknowledged')
                             reactivated.append(alert['alert_id'])
 
                 if reactivated:
-                    with open(alerts_file, 'w') as f:
-                        json.dump(alerts, f, indent=2)
                     print(f"[Snooze] Reactivated {len(reactivated)} alerts")
 
                 return reactivated
@@ -12837,24 +13255,12 @@ Important:
             Restore a dismissed alert.
             """
             try:
-                alerts_file = os.path.join(self.data_dir, "alerts.json")
-
-                if not os.path.exists(alerts_file):
-                    return False
-
-                with open(alerts_file, 'r') as f:
-                    alerts = json.load(f)
-
-                for alert in alerts:
-                    if alert.get('alert_id') == alert_id:
-                        alert['dismissed'] = False
-                        alert['dismissed_at'] = None
-                        alert['status'] = 'unacknowledged'
-                        break
-
-                with open(alerts_file, 'w') as f:
-                    json.dump(alerts, f, indent=2)
-
+                self.alert_store.update(
+                    alert_id,
+                    dismissed=False,
+                    dismissed_at=None,
+                    status='unacknowledged'
+                )
                 return True
 
             except Exception as e:
@@ -13006,8 +13412,14 @@ Important:
                 # Load alerts for date range
                 alerts = self._load_alerts_for_range(pool_id, start_date, end_date)
 
-                # Calculate statistics
-                statistics = self._calculate_all_statistics(readings)
+                # Calculate statistics over the same window in columnar form; long
+                # windows combine the pool's daily/weekly rollups instead
+                start_epoch, end_epoch = day_range_epochs(start_date, end_date)
+                resolution = choose_resolution(start_epoch, end_epoch, len(readings))
+                if resolution == 'raw':
+                    statistics = self._calculate_all_statistics(ColumnView.from_readings(readings))
+                else:
+                    statistics = self._calculate_rollup_statistics(pool_id, start_epoch, end_epoch, resolution)
 
                 # Aggregate maintenance data
                 maintenance = self._aggregate_maintenance_data(pool_id, start_date, end_date)
@@ -13024,6 +13436,7 @@ Important:
                         'end': end_date.strftime('%Y-%m-%d')
                     },
                     'readings': readings,
+                    'resolution': resolution,
                     'statistics': statistics,
                     'alerts': {
                         'total': len(alerts),
@@ -13046,69 +13459,13 @@ Important:
     def _load_readings_for_range(self, pool_id, start_date, end_date):
         """Load readings for a pool within date range"""
         try:
-            readings_file = self.data_dir / "readings.json"
-            if not readings_file.exists():
-                print(f"[PDF] Readings file not found: {readings_file}")
-                return []
-
-            with open(readings_file, 'r') as f:
-                data = json.load(f)
-
-            # Handle different data structures
-            all_readings = []
-            
-            # Structure 1: Direct array [{"date": "...", ...}, ...]
-            if isinstance(data, list):
-                all_readings = data
-                print(f"[PDF] Data structure: Direct array with {len(data)} items")
-            
-            # Structure 2: Dictionary with 'readings' key {"readings": [...]}
-            elif isinstance(data, dict):
-                if 'readings' in data:
-                    all_readings = data['readings']
-                    print(f"[PDF] Data structure: Dictionary with 'readings' key, {len(all_readings)} items")
-                else:
-                    # Structure 3: Dictionary where each key is a pool_id
-                    if pool_id in data:
-                        all_readings = data[pool_id]
-                        print(f"[PDF] Data structure: Dictionary with pool_id keys, {len(all_readings)} items for {pool_id}")
-                    else:
-                        print(f"[PDF] Data structure: Dictionary but no 'readings' key or pool_id key found")
-                        print(f"[PDF] Available keys: {list(data.keys())[:10]}")
-                        return []
+            if self.reading_columns.is_materialized(pool_id):
+                # Binary search on the pool's sorted timestamps
+                readings = self.reading_columns.pool(pool_id).between_dates(start_date, end_date).readings
             else:
-                print(f"[PDF] Unknown data structure type: {type(data)}")
-                return []
-
-            # Filter by pool and date range
-            filtered = []
-            for reading in all_readings:
-                # Handle both dict and string readings
-                if isinstance(reading, str):
-                    # Skip string entries (like "timestamp", "readings", etc.)
-                    continue
-                
-                if not isinstance(reading, dict):
-                    continue
-                
-                # If reading has pool_id, check it matches
-                reading_pool_id = reading.get('pool_id', pool_id)  # Default to requested pool_id if not present
-                if reading_pool_id != pool_id:
-                    continue
-
-                # Check date range
-                try:
-                    reading_date = datetime.strptime(reading['date'], '%Y-%m-%d')
-                    if start_date <= reading_date <= end_date:
-                        # Add pool_id if missing
-                        if 'pool_id' not in reading:
-                            reading['pool_id'] = pool_id
-                        filtered.append(reading)
-                except (KeyError, ValueError) as e:
-                    continue
-
-            # Sort by date
-            filtered.sort(key=lambda x: x.get('date', ''))
+                # Read only the pool's partitions for the months the window overlaps
+                readings = self.reading_partitions.load(pool_id, start_date, end_date)
+            filtered = [dict(reading, pool_id=reading.get('pool_id') or pool_id) for reading in readings]
 
             print(f"[PDF] Loaded {len(filtered)} readings for {pool_id} in date range {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
             return filtered
@@ -13123,59 +13480,8 @@ Important:
     def _load_alerts_for_range(self, pool_id, start_date, end_date):
         """Load alerts for a pool within date range"""
         try:
-            alerts_file = self.data_dir / "alerts.json"
-            if not alerts_file.exists():
-                print(f"[PDF] Alerts file not found: {alerts_file}")
-                return []
-
-            with open(alerts_file, 'r') as f:
-                data = json.load(f)
-
-            # Handle different data structures
-            all_alerts = []
-            
-            # Structure 1: Direct array
-            if isinstance(data, list):
-                all_alerts = data
-                print(f"[PDF] Alerts structure: Direct array with {len(data)} items")
-            
-            # Structure 2: Dictionary with 'alerts' key
-            elif isinstance(data, dict):
-                if 'alerts' in data:
-                    all_alerts = data['alerts']
-                    print(f"[PDF] Alerts structure: Dictionary with 'alerts' key, {len(all_alerts)} items")
-                else:
-                    # Structure 3: Dictionary where each key is a pool_id
-                    if pool_id in data:
-                        all_alerts = data[pool_id]
-                        print(f"[PDF] Alerts structure: Dictionary with pool_id keys, {len(all_alerts)} items for {pool_id}")
-                    else:
-                        print(f"[PDF] Alerts structure: Dictionary but no 'alerts' key or pool_id key found")
-                        return []
-            else:
-                print(f"[PDF] Unknown alerts structure type: {type(data)}")
-                return []
-
-            # Filter by pool and date range
-            filtered = []
-            for alert in all_alerts:
-                # Handle both dict and string alerts
-                if isinstance(alert, str):
-                    continue
-                
-                if not isinstance(alert, dict):
-                    continue
-                
-                # If alert has pool_id, check it matches
-                alert_pool_id = alert.get('pool_id', pool_id)  # Default to requested pool_id if not present
-                if alert_pool_id != pool_id:
-                    continue
-
-                alert_date = datetime.fromisoformat(alert['timestamp'])
-                if start_date <= alert_date <= end_date:
-                    filtered.append(alert)
-
-            return filtered
+            # Hot alerts plus only the archive segments overlapping the report window
+            return self.alert_store.find_range(pool_id=pool_id, start=start_date, end=end_date)
 
         except Exception as e:
             print(f"[PDF] Error loading alerts: {e}")
@@ -13183,9 +13489,11 @@ Important:
 
 
     def _calculate_all_statistics(self, readings):
-        """Calculate statistics for all parameters"""
+        """Calculate statistics for all parameters from a column view (or list of readings)"""
         try:
-            if not readings:
+            if not isinstance(readings, ColumnView):
+                readings = ColumnView.from_readings(readings or [])
+            if not len(readings):
                 return {}
 
             parameters = ['ph', 'free_chlorine', 'total_chlorine', 'alkalinity', 
@@ -13194,8 +13502,8 @@ Important:
             statistics = {}
 
             for param in parameters:
-                values = [r.get(param) for r in readings if r.get(param) is not None]
-                if values:
+                values = readings.values(param)
+                if len(values):
                     statistics[param] = self._calculate_parameter_statistics(values, param)
 
             return statistics
@@ -13205,44 +13513,67 @@ Important:
             return {}
 
 
+    def _calculate_rollup_statistics(self, pool_id, start_epoch, end_epoch, resolution):
+        """
+        Calculate the same statistics as _calculate_all_statistics from a pool's rollups.
+        
+        Count, average, min, max, standard deviation and in-range share are exact
+        (whole buckets plus the raw readings at the window's edges); the median is
+        the count-weighted median of the bucket means.
+        """
+        try:
+            columns = self.reading_columns.pool(pool_id)
+            combined = columns.range_statistics(start_epoch, end_epoch, resolution)
+            table = columns.rollup(resolution).table(start_epoch, end_epoch)
+
+            statistics = {}
+            for param in REPORT_RANGES:
+                stats = combined.get(param)
+                if not stats:
+                    continue
+                means = table.field(param, 'mean')
+                counts = table.field(param, 'count')
+                present = counts > 0
+                order = np.argsort(means[present])
+                cumulative = np.cumsum(counts[present][order])
+                median = means[present][order][np.searchsorted(cumulative, cumulative[-1] / 2.0)]
+                statistics[param] = {
+                    'avg': round(stats['mean'], 2),
+                    'min': round(stats['min'], 2),
+                    'max': round(stats['max'], 2),
+                    'median': round(float(median), 2),
+                    'std_dev': round(float(np.sqrt(stats['m2'] / stats['count'])), 2),
+                    'in_range_percent': round(stats['in_range'] / stats['count'] * 100, 1),
+                    'count': stats['count']
+                }
+
+            return statistics
+
+        except Exception as e:
+            print(f"[PDF] Error calculating rollup statistics: {e}")
+            return {}
+
+
     def _calculate_parameter_statistics(self, values, parameter):
         """Calculate statistics for a single parameter"""
         try:
-            if not values:
+            values = np.asarray(values, dtype=float)
+            if not len(values):
                 return {}
 
             # Basic statistics
-            avg = sum(values) / len(values)
-            sorted_values = sorted(values)
-            min_val = sorted_values[0]
-            max_val = sorted_values[-1]
-
-            # Median
-            n = len(sorted_values)
-            if n % 2 == 0:
-                median = (sorted_values[n//2 - 1] + sorted_values[n//2]) / 2
-            else:
-                median = sorted_values[n//2]
+            avg = float(values.mean())
+            min_val = float(values.min())
+            max_val = float(values.max())
+            median = float(np.median(values))
 
-            # Standard deviation
-            variance = sum((x - avg) ** 2 for x in values) / len(values)
-            std_dev = variance ** 0.5
+            # Standard deviation (population)
+            std_dev = float(values.std())
 
             # In-range percentage (using default ranges)
-            ranges = {
-                'ph': (7.2, 7.8),
-                'free_chlorine': (1.0, 3.0),
-                'total_chlorine': (1.0, 3.0),
-                'alkalinity': (80, 120),
-                'calcium_hardness': (200, 400),
-                'cyanuric_acid': (30, 50),
-                'salt': (2700, 3400),
-                'temperature': (78, 104)
-            }
-
-            if parameter in ranges:
-                min_range, max_range = ranges[parameter]
-                in_range = sum(1 for v in values if min_range <= v <= max_range)
+            if parameter in REPORT_RANGES:
+                min_range, max_range = REPORT_RANGES[parameter]
+                in_range = int(np.count_nonzero((values >= min_range) & (values <= max_range)))
                 in_range_percent = (in_range / len(values)) * 100
             else:
                 in_range_percent = 0
@@ -13582,31 +13913,38 @@ Important:
 
 
     def _generate_chemical_trend_chart(self, pool_data):
-        """Generate chemical trend chart for a pool"""
+        """Generate chemical trend chart for a pool (daily/weekly means for long ranges)"""
         try:
             readings = pool_data.get('readings', [])
             if not readings:
                 return None
 
-            # Extract dates and values
-            dates = [r['date'] for r in readings]
-            ph_values = [r.get('ph') for r in readings if r.get('ph') is not None]
-            chlorine_values = [r.get('free_chlorine') for r in readings if r.get('free_chlorine') is not None]
-            alkalinity_values = [r.get('alkalinity') for r in readings if r.get('alkalinity') is not None]
+            # One point per reading, or per bucket of the pool's rollup; series share
+            # the dates and are NaN where a point has no value
+            resolution = pool_data.get('resolution', 'raw')
+            if resolution == 'raw':
+                points = ColumnView.from_readings(readings)
+                series = {'pH': points.column('ph'), 'Chlorine': points.column('free_chlorine')}
+            else:
+                date_range = pool_data['date_range']
+                points = self.reading_columns.pool(pool_data['pool_id']).rollup(resolution).table(
+                    *day_range_epochs(datetime.strptime(date_range['start'], '%Y-%m-%d').date(),
+                                      datetime.strptime(date_range['end'], '%Y-%m-%d').date()))
+                series = {'pH': points.field('ph'), 'Chlorine': points.field('free_chlorine')}
+            if not len(points):
+                return None
 
             # Prepare data
             data = {
-                'dates': dates[:len(ph_values)],  # Match shortest series
-                'series': {}
+                'dates': points.datetimes(),
+                'series': {label: values for label, values in series.items() if not np.isnan(values).all()}
             }
 
-            if ph_values:
-                data['series']['pH'] = ph_values
-            if chlorine_values:
-                data['series']['Chlorine'] = chlorine_values
-
+            title = f"Chemical Trends - {pool_data['pool_name']}"
+            if resolution != 'raw':
+                title += f" ({resolution.title()} Mean)"
             options = {
-                'title': f"Chemical Trends - {pool_data['pool_name']}",
+                'title': title,
                 'xlabel': 'Date',
                 'ylabel': 'Value',
                 'range': (7.2, 7.8)  # pH range
@@ -14349,10 +14687,7 @@ Important:
         """Load email configuration from file."""
         try:
             config_file = self.data_dir / "email_config.json"
-            if config_file.exists():
-                with open(config_file, 'r') as f:
-                    return json.load(f)
-            return None
+            return json_cache.load(config_file, None)
         except Exception as e:
             print(f"[EMAIL] Error loading email config: {e}")
             return None
@@ -14362,8 +14697,7 @@ Important:
         """Save email configuration to file."""
         try:
             config_file = self.data_dir / "email_config.json"
-            with open(config_file, 'w') as f:
-                json.dump(config, f, indent=2)
+            json_cache.save(config_file, config, indent=2, defer=False)
             print("[EMAIL] Email configuration saved")
             return True
         except Exception as e:
@@ -14578,18 +14912,13 @@ Important:
 
             # Load existing schedules
             schedules_file = self.data_dir / "report_schedules.json"
-            if schedules_file.exists():
-                with open(schedules_file, 'r') as f:
-                    schedules = json.load(f)
-            else:
-                schedules = []
+            schedules = copy.deepcopy(json_cache.load(schedules_file, []))
 
             # Add new schedule
             schedules.append(schedule)
 
             # Save schedules
-            with open(schedules_file, 'w') as f:
-                json.dump(schedules, f, indent=2)
+            json_cache.save(schedules_file, schedules, indent=2, defer=False)
 
             print(f"[Schedule] Created schedule: {schedule_id} - {schedule['name']}")
             return schedule_id
@@ -14654,8 +14983,7 @@ Important:
             if not schedules_file.exists():
                 return []
 
-            with open(schedules_file, 'r') as f:
-                schedules = json.load(f)
+            schedules = copy.deepcopy(json_cache.load(schedules_file, []))
 
             now = datetime.now()
             generated_reports = []
@@ -14719,8 +15047,7 @@ Important:
                         ).isoformat()
 
             # Save updated schedules
-            with open(schedules_file, 'w') as f:
-                json.dump(schedules, f, indent=2)
+            json_cache.save(schedules_file, schedules, indent=2)
 
             return generated_reports
 
@@ -14739,8 +15066,7 @@ Important:
             if not schedules_file.exists():
                 return False
 
-            with open(schedules_file, 'r') as f:
-                schedules = json.load(f)
+            schedules = copy.deepcopy(json_cache.load(schedules_file, []))
 
             # Find and update schedule
             schedule_found = False
@@ -14765,8 +15091,7 @@ Important:
                 return False
 
             # Save updated schedules
-            with open(schedules_file, 'w') as f:
-                json.dump(schedules, f, indent=2)
+            json_cache.save(schedules_file, schedules, indent=2, defer=False)
 
             print(f"[Schedule] Updated schedule: {schedule_id}")
             return True
@@ -14786,8 +15111,7 @@ Important:
             if not schedules_file.exists():
                 return False
 
-            with open(schedules_file, 'r') as f:
-                schedules = json.load(f)
+            schedules = copy.deepcopy(json_cache.load(schedules_file, []))
 
             # Filter out the schedule to delete
             original_count = len(schedules)
@@ -14798,8 +15122,7 @@ Important:
                 return False
 
             # Save updated schedules
-            with open(schedules_file, 'w') as f:
-                json.dump(schedules, f, indent=2)
+            json_cache.save(schedules_file, schedules, indent=2, defer=False)
 
             print(f"[Schedule] Deleted schedule: {schedule_id}")
             return True
@@ -14819,8 +15142,7 @@ Important:
             if not schedules_file.exists():
                 return []
 
-            with open(schedules_file, 'r') as f:
-                schedules = json.load(f)
+            schedules = json_cache.load(schedules_file, [])
 
             return schedules
 
@@ -15881,8 +16203,7 @@ Important:
             
             # Save config
             config_file = branding_dir / "branding_config.json"
-            with open(config_file, 'w') as f:
-                json.dump(branding_config, f, indent=4)
+            json_cache.save(config_file, branding_config, indent=4, defer=False)
             
             messagebox.showinfo("Success", "Branding configuration saved successfully!")
             
@@ -15898,8 +16219,7 @@ Important:
             config_file = self.data_dir / "branding" / "branding_config.json"
             
             if config_file.exists():
-                with open(config_file, 'r') as f:
-                    branding_config = json.load(f)
+                branding_config = json_cache.load(config_file, {})
                 
                 # Load values
                 self.company_name_var.set(branding_config.get('company_name', ''))
@@ -17003,17 +17323,17 @@ def _load_branding_config(self):
     
     try:
         if os.path.exists(config_file):
-            with open(config_file, 'r') as f:
-                config = json.load(f)
-                # Merge with defaults to ensure all keys exist
-                for key in default_config:
-                    if key not in config:
-                        config[key] = default_config[key]
-                    elif isinstance(default_config[key], dict):
-                        for subkey in default_config[key]:
-                            if subkey not in config[key]:
-                                config[key][subkey] = default_config[key][subkey]
-                return config
+            # Copy: the merge below must not change the cached object
+            config = copy.deepcopy(json_cache.load(config_file, {}))
+            # Merge with defaults to ensure all keys exist
+            for key in default_config:
+                if key not in config:
+                    config[key] = default_config[key]
+                elif isinstance(default_config[key], dict):
+                    for subkey in default_config[key]:
+                        if subkey not in config[key]:
+                            config[key][subkey] = default_config[key][subkey]
+            return config
         else:
             return default_config
     except Exception as e:
@@ -17025,8 +17345,7 @@ def _save_branding_config(self):
     try:
         config_file = os.path.join(self.data_dir, 'branding_config.json')
         
-        with open(config_file, 'w') as f:
-            json.dump(self.branding_config, f, indent=2)
+        json_cache.save(config_file, self.branding_config, indent=2, defer=False)
         
         messagebox.showinfo("Success", "Branding configuration saved successfully!")
         self._apply_branding()
@@ -17667,8 +17986,7 @@ def _save_branding_preset(self):
             os.makedirs(presets_dir, exist_ok=True)
             
             preset_file = os.path.join(presets_dir, f"{preset_name}.json")
-            with open(preset_file, 'w') as f:
-                json.dump(self.branding_config, f, indent=2)
+            json_cache.save(preset_file, self.branding_config, indent=2, defer=False)
             
             messagebox.showinfo("Success", f"Preset '{preset_name}' saved successfully!")
         except Exception as e:
@@ -17680,8 +17998,8 @@ def _load_branding_preset(self, preset_name):
         preset_file = os.path.join(self.data_dir, 'branding_presets', f"{preset_name}.json")
         
         if os.path.exists(preset_file):
-            with open(preset_file, 'r') as f:
-                self.branding_config = json.load(f)
+            # Copy: edits to the active branding must not change the cached preset
+            self.branding_config = copy.deepcopy(json_cache.load(preset_file, {}))
             
             self._save_branding_config()
             self._apply_branding()
@@ -18740,6 +19058,7 @@ def _apply_branding_to_all_styles(self):
 
 def main():
     """Main entry point for the application"""
+    startup_timer.mark("modules imported")
     app = PoolApp()
     app.mainloop()
 
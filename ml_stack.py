@@ -0,0 +1,78 @@
+"""
+Deep Blue Pool Chemistry - Lazy ML Stack
+Copyright (c) 2024 Michael Hayes. All rights reserved.
+
+scikit-learn, statsmodels and joblib take well over a second to import,
+which used to be paid on every start before the main window appeared.
+This module imports them on first use instead: call load() (or check
+available()) before touching StandardScaler, IsolationForest,
+LinearRegression, ARIMA or joblib, and the import runs once, under a lock,
+in whichever thread asks first. The application also calls load() from a
+background warm-up thread after the main window appears, so the import
+is normally finished before the first analytics or report call needs it.
+"""
+
+import threading
+import time
+import logging
+from typing import Dict, Optional
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Filled in by load()
+StandardScaler = None
+IsolationForest = None
+LinearRegression = None
+ARIMA = None
+joblib = None
+
+_lock = threading.Lock()
+_loaded = False
+_error: Optional[str] = None
+_seconds: Optional[float] = None
+
+
+def load() -> bool:
+    """
+    Import the ML libraries if that has not happened yet.
+
+    Returns:
+        True if they are available
+    """
+    global StandardScaler, IsolationForest, LinearRegression, ARIMA, joblib
+    global _loaded, _error, _seconds
+    if _loaded:
+        return _error is None
+    with _lock:
+        if _loaded:
+            return _error is None
+        started = time.perf_counter()
+        try:
+            from sklearn.preprocessing import StandardScaler
+            from sklearn.ensemble import IsolationForest
+            from sklearn.linear_model import LinearRegression
+            from statsmodels.tsa.arima.model import ARIMA
+            import joblib
+            logger.info(f"ML libraries loaded in {time.perf_counter() - started:.2f}s")
+        except ImportError as e:
+            _error = str(e)
+            logger.warning(f"ML libraries not available ({e}); ML Analytics will use fallback mode")
+        _seconds = time.perf_counter() - started
+        _loaded = True
+    return _error is None
+
+
+def available() -> bool:
+    """Return whether the ML libraries can be used, importing them on first call."""
+    return load()
+
+
+def is_loaded() -> bool:
+    """Return whether load() has finished (successfully or not), without triggering it."""
+    return _loaded
+
+
+def status() -> Dict[str, object]:
+    """Return whether the stack is loaded, any import error and the import time in seconds."""
+    return {'loaded': _loaded, 'error': _error, 'seconds': _seconds}
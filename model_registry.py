@@ -0,0 +1,179 @@
+"""
+Deep Blue Pool Chemistry - Model Registry
+Copyright (c) 2024 Michael Hayes. All rights reserved.
+
+This module stores fitted models per pool instead of in one flat models/
+directory that every pool overwrote. Each entry is addressed by
+(pool_id, parameter, model type) and tagged with the fingerprint of the
+data it was fitted on, which callers compare before reusing it. Entries
+are laid out as
+
+    <root>/<pool>/<model type>/<parameter>.pkl
+
+and written when they change. They are read from disk only when first
+asked for. At most max_in_memory entries stay loaded; the least recently
+used ones are dropped from memory (their files stay), so many pools do not
+keep every model resident.
+
+What an entry holds is up to its model type. ARIMA entries keep only the
+coefficients and the Kalman filter state needed to forecast and to append
+new observations (see arima_forecaster), not the training data.
+"""
+
+import threading
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+import ml_stack
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+RegistryKey = Tuple[Optional[Hashable], str, str]
+
+
+class ModelRegistry:
+    """
+    Per-pool model entries with on-demand loading and LRU eviction from memory.
+    """
+
+    def __init__(self, root=None, max_in_memory: int = 64):
+        """
+        Initialize the registry.
+
+        Args:
+            root: Directory holding one sub-directory per pool (None keeps entries in memory only)
+            max_in_memory: Entries kept loaded before the least recently used are dropped
+        """
+        self.root = Path(root) if root is not None else None
+        self.max_in_memory = max_in_memory
+        self._entries: "OrderedDict[RegistryKey, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.loads = 0
+        self.saves = 0
+        self.evictions = 0
+
+    # ==================== STORAGE ====================
+
+    def _path(self, key: RegistryKey) -> Path:
+        pool_id, parameter, model_type = key
+        return (self.root / quote(str(pool_id), safe='') / quote(model_type, safe='')
+                / f"{quote(parameter, safe='')}.pkl")
+
+    def _load(self, key: RegistryKey) -> Optional[Dict[str, Any]]:
+        if self.root is None:
+            return None
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            ml_stack.load()
+            entry = ml_stack.joblib.load(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable model {path}: {e}")
+            return None
+        self.loads += 1
+        return entry
+
+    def _save(self, key: RegistryKey, entry: Dict[str, Any]):
+        if self.root is None:
+            return
+        try:
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(path.name + ".tmp")
+            ml_stack.load()
+            ml_stack.joblib.dump(entry, tmp_path)
+            tmp_path.replace(path)
+            self.saves += 1
+        except Exception as e:
+            logger.warning(f"Could not save {key[2]} model for {key[0]}/{key[1]}: {e}")
+
+    def _remember(self, key: RegistryKey, entry: Dict[str, Any]):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_in_memory:
+            evicted, _ = self._entries.popitem(last=False)
+            self.evictions += 1
+            logger.debug(f"Model registry evicted {evicted} from memory")
+
+    # ==================== ENTRIES ====================
+
+    def get(self, pool_id: Optional[Hashable], parameter: str, model_type: str) -> Optional[Dict[str, Any]]:
+        """
+        Return an entry, loading it from disk on first use.
+
+        Returns:
+            The stored state (with its 'fingerprint'), or None if there is none
+        """
+        key = (pool_id, parameter, model_type)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            entry = self._load(key)
+            if entry is not None:
+                self._remember(key, entry)
+            return entry
+
+    def put(self, pool_id: Optional[Hashable], parameter: str, model_type: str,
+            fingerprint: str, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Store an entry (in memory and on disk), replacing the previous one.
+
+        Args:
+            pool_id: Pool the model belongs to
+            parameter: Parameter it models (or e.g. 'all' for multivariate models)
+            model_type: Kind of model, such as 'arima' or 'isolation_forest'
+            fingerprint: Fingerprint of the data the model was fitted on
+            state: What the model type needs to be reused
+
+        Returns:
+            The stored entry (state plus fingerprint)
+        """
+        key = (pool_id, parameter, model_type)
+        entry = dict(state, fingerprint=fingerprint)
+        with self._lock:
+            self._remember(key, entry)
+            self._save(key, entry)
+        return entry
+
+    def remove(self, pool_id: Optional[Hashable] = None, model_type: Optional[str] = None):
+        """Forget (and delete) the entries of one pool and/or model type, or all entries."""
+        with self._lock:
+            for key in [k for k in self._entries if self._matches(k, pool_id, model_type)]:
+                del self._entries[key]
+            for key in self.stored(pool_id, model_type):
+                path = self._path(key)
+                if path.exists():
+                    path.unlink()
+
+    @staticmethod
+    def _matches(key: RegistryKey, pool_id: Optional[Hashable], model_type: Optional[str]) -> bool:
+        return (pool_id is None or str(key[0]) == str(pool_id)) and (model_type is None or key[2] == model_type)
+
+    def stored(self, pool_id: Optional[Hashable] = None, model_type: Optional[str] = None) -> List[RegistryKey]:
+        """
+        List the entries on disk (of one pool and/or model type), without loading them.
+
+        Pool ids are returned as the strings they were stored under.
+        """
+        if self.root is None or not self.root.exists():
+            return []
+        keys = []
+        for path in sorted(self.root.glob("*/*/*.pkl")):
+            key = (unquote(path.parent.parent.name), unquote(path.stem), unquote(path.parent.name))
+            if self._matches(key, pool_id, model_type):
+                keys.append(key)
+        return keys
+
+    def stats(self) -> Dict[str, int]:
+        """Return counts of loaded entries, memory hits, disk loads, saves and evictions."""
+        return {'loaded': len(self._entries), 'hits': self.hits, 'loads': self.loads,
+                'saves': self.saves, 'evictions': self.evictions}
@@ -0,0 +1,375 @@
+"""
+Deep Blue Pool Chemistry - Columnar Reading Cache
+Copyright (c) 2024 Michael Hayes. All rights reserved.
+
+This module keeps pool readings in columnar NumPy form: per pool, a sorted
+int64 epoch-seconds array plus one float64 array per chemistry parameter
+(NaN where a reading has no value) and the validation error codes of each
+row. It is built once at load time and updated incrementally on save, so
+the dashboard, analytics engine and reports can take array views instead
+of re-extracting and re-validating values from dicts. Daily and weekly
+rollups (see reading_rollups) are kept alongside the columns once asked for.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from data_manager import normalize_timestamp
+from reading_validation import PARAMETERS, validate_batch
+from reading_rollups import Rollup, bucket_summary, combine
+from running_stats import PoolRunningStats
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+
+def reading_epoch(reading: Dict[str, Any]) -> Optional[int]:
+    """
+    Parse a reading's timestamp to epoch seconds.
+
+    Returns:
+        Epoch seconds, or None if the reading has no usable date
+    """
+    try:
+        return int(datetime.fromisoformat(normalize_timestamp(reading)).timestamp())
+    except (TypeError, ValueError):
+        return None
+
+
+def day_range_epochs(start_date, end_date):
+    """
+    Convert an inclusive date range to [start, end) epoch seconds.
+
+    Args:
+        start_date: First day (date, datetime or None for unbounded)
+        end_date: Last day (date, datetime or None for unbounded)
+    """
+    start = end = None
+    if start_date is not None:
+        day = start_date.date() if isinstance(start_date, datetime) else start_date
+        start = int(datetime.combine(day, datetime.min.time()).timestamp())
+    if end_date is not None:
+        day = end_date.date() if isinstance(end_date, datetime) else end_date
+        end = int((datetime.combine(day, datetime.min.time()) + timedelta(days=1)).timestamp())
+    return start, end
+
+
+def _to_float(value: Any) -> float:
+    """Convert a raw reading value to float, NaN when missing or non-numeric."""
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class ColumnView:
+    """
+    Read-only window over a pool's columns. Arrays are views, not copies.
+    """
+
+    def __init__(self, timestamps: np.ndarray, columns: Dict[str, np.ndarray], readings: List[Dict],
+                 codes: Optional[np.ndarray] = None):
+        self.timestamps = timestamps
+        self.columns = columns
+        self.readings = readings
+        self.codes = codes
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def column(self, param: str) -> np.ndarray:
+        """Return the float64 values for a parameter (NaN where missing)."""
+        col = self.columns.get(param)
+        if col is None:
+            return np.full(len(self.timestamps), np.nan)
+        return col
+
+    def values(self, param: str) -> np.ndarray:
+        """Return the non-missing values for a parameter, oldest first."""
+        col = self.column(param)
+        return col[~np.isnan(col)]
+
+    def error_codes(self) -> np.ndarray:
+        """Return the validation error bit set of each row (0 for a valid reading)."""
+        if self.codes is None:
+            self.codes = validate_batch(self.readings)[1]
+        return self.codes
+
+    def valid_mask(self) -> np.ndarray:
+        """Return a boolean mask of the rows that pass validate_reading's rules."""
+        return self.error_codes() == 0
+
+    def take(self, rows: np.ndarray) -> 'ColumnView':
+        """Return a view of the selected rows (a copy, since rows need not be contiguous)."""
+        return ColumnView(
+            self.timestamps[rows],
+            {p: col[rows] for p, col in self.columns.items()},
+            [self.readings[i] for i in rows],
+            None if self.codes is None else self.codes[rows]
+        )
+
+    def copy(self) -> 'ColumnView':
+        """Return a copy that later inserts into the pool's columns cannot change (e.g. for a worker thread)."""
+        return ColumnView(
+            self.timestamps.copy(),
+            {p: col.copy() for p, col in self.columns.items()},
+            list(self.readings),
+            None if self.codes is None else self.codes.copy()
+        )
+
+    def datetimes(self) -> List[datetime]:
+        """Return the timestamps as local datetimes (for chart axes)."""
+        return [datetime.fromtimestamp(epoch) for epoch in self.timestamps.tolist()]
+
+    def tail(self, count: int) -> 'ColumnView':
+        """Return a view of the most recent readings."""
+        start = max(0, len(self) - count)
+        return ColumnView(
+            self.timestamps[start:],
+            {p: c[start:] for p, c in self.columns.items()},
+            self.readings[start:],
+            None if self.codes is None else self.codes[start:]
+        )
+
+    @classmethod
+    def from_readings(cls, readings: Iterable[Dict], parameters: List[str] = PARAMETERS) -> 'ColumnView':
+        """Build a standalone view from a list of reading dictionaries."""
+        columns = PoolColumns(parameters)
+        columns.extend(readings)
+        return columns.view()
+
+
+class PoolColumns:
+    """
+    Columnar readings for one pool, kept sorted by timestamp.
+    """
+
+    def __init__(self, parameters: List[str] = PARAMETERS, capacity: int = 64):
+        self.parameters = list(parameters)
+        self._size = 0
+        self._ts = np.empty(capacity, dtype=np.int64)
+        self._cols = {p: np.empty(capacity, dtype=np.float64) for p in self.parameters}
+        self._codes = np.empty(capacity, dtype=np.int64)
+        self._readings: List[Dict] = []
+        self._stats: Optional[PoolRunningStats] = None
+        self._rollups: Dict[str, Rollup] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _reserve(self, needed: int):
+        """Grow storage geometrically so appends stay amortized O(1)."""
+        capacity = len(self._ts)
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2)
+        ts = np.empty(new_capacity, dtype=np.int64)
+        ts[:self._size] = self._ts[:self._size]
+        self._ts = ts
+        for p in self.parameters:
+            col = np.empty(new_capacity, dtype=np.float64)
+            col[:self._size] = self._cols[p][:self._size]
+            self._cols[p] = col
+        codes = np.empty(new_capacity, dtype=np.int64)
+        codes[:self._size] = self._codes[:self._size]
+        self._codes = codes
+
+    def add(self, reading: Dict[str, Any]) -> bool:
+        """
+        Add one reading, keeping timestamp order.
+
+        Returns:
+            False if the reading has no usable timestamp
+        """
+        epoch = reading_epoch(reading)
+        if epoch is None:
+            return False
+
+        _, codes, values = validate_batch([reading])
+        self._reserve(self._size + 1)
+        n = self._size
+        if n == 0 or epoch >= self._ts[n - 1]:
+            pos = n
+        else:
+            # Out-of-order insert (e.g. back-dated import): shift the tail
+            pos = int(np.searchsorted(self._ts[:n], epoch, side='right'))
+            self._ts[pos + 1:n + 1] = self._ts[pos:n]
+            self._codes[pos + 1:n + 1] = self._codes[pos:n]
+            for p in self.parameters:
+                self._cols[p][pos + 1:n + 1] = self._cols[p][pos:n]
+
+        self._ts[pos] = epoch
+        self._codes[pos] = codes[0]
+        for p in self.parameters:
+            self._cols[p][pos] = values[p][0] if p in values else _to_float(reading.get(p))
+        self._readings.insert(pos, reading)
+        self._size = n + 1
+        if self._stats is not None:
+            self._stats.add(epoch, [self._cols[p][pos] for p in self.parameters])
+        if self._rollups:
+            row = {p: float(self._cols[p][pos]) for p in self.parameters}
+            for rollup in self._rollups.values():
+                rollup.add(epoch, row)
+        return True
+
+    def extend(self, readings: Iterable[Dict]) -> int:
+        """
+        Bulk-load readings with a single sort and a single validation pass.
+
+        Returns:
+            Number of readings skipped for lack of a timestamp
+        """
+        rows = []
+        skipped = 0
+        for reading in readings:
+            epoch = reading_epoch(reading)
+            if epoch is None:
+                skipped += 1
+                continue
+            rows.append((epoch, reading))
+        if not rows:
+            return skipped
+
+        rows.extend(zip(self._ts[:self._size].tolist(), self._readings))
+        rows.sort(key=lambda row: row[0])
+
+        n = len(rows)
+        self._size = 0
+        self._stats = None
+        self._rollups = {}
+        self._reserve(n)
+        self._ts[:n] = [epoch for epoch, _ in rows]
+        self._readings = [reading for _, reading in rows]
+        _, codes, values = validate_batch(self._readings)
+        self._codes[:n] = codes
+        for p in self.parameters:
+            self._cols[p][:n] = values[p] if p in values else [_to_float(r.get(p)) for r in self._readings]
+        self._size = n
+        return skipped
+
+    def view(self, start: int = 0, stop: Optional[int] = None) -> ColumnView:
+        """Return a view over rows [start, stop)."""
+        stop = self._size if stop is None else min(stop, self._size)
+        return ColumnView(
+            self._ts[start:stop],
+            {p: self._cols[p][start:stop] for p in self.parameters},
+            self._readings[start:stop],
+            self._codes[start:stop]
+        )
+
+    def running_stats(self) -> PoolRunningStats:
+        """Return the running per-window statistics, loading them from the columns on first use."""
+        if self._stats is None or self._stats.stale:
+            n = self._size
+            values = np.column_stack([self._cols[p][:n] for p in self.parameters])
+            self._stats = PoolRunningStats(self.parameters)
+            self._stats.load(self._ts[:n], values)
+        return self._stats
+
+    def rollup(self, resolution: str) -> Rollup:
+        """Return the daily or weekly rollup, building it from the columns on first use."""
+        if resolution not in self._rollups:
+            n = self._size
+            rollup = Rollup(resolution, self.parameters)
+            rollup.load(self._ts[:n], {p: self._cols[p][:n] for p in self.parameters})
+            self._rollups[resolution] = rollup
+        return self._rollups[resolution]
+
+    def range_statistics(self, start_epoch: Optional[int], end_epoch: Optional[int],
+                         resolution: str) -> Dict[str, Dict[str, float]]:
+        """
+        Compute exact per-parameter statistics over [start_epoch, end_epoch) from a rollup.
+
+        Buckets entirely inside the range come from the rollup; readings in the
+        partial buckets at either edge are read from the columns.
+
+        Returns:
+            {param: {'count', 'mean', 'm2', 'min', 'max', 'in_range'}} for parameters with values
+        """
+        rollup = self.rollup(resolution)
+        lo, hi = rollup.bounds(start_epoch, end_epoch, whole=True)
+        # Raw rows before the first and after the last whole bucket
+        edges = []
+        if lo < hi:
+            edges.append(self.slice_bounds(start_epoch, int(rollup.starts[lo])))
+            edges.append(self.slice_bounds(int(rollup.ends[hi - 1]), end_epoch))
+        else:
+            edges.append(self.slice_bounds(start_epoch, end_epoch))
+
+        result = {}
+        for p in self.parameters:
+            parts = [{name: values[lo:hi] for name, values in rollup.fields[p].items()}]
+            parts += [bucket_summary(self._cols[p][a:b], p) for a, b in edges]
+            stats = combine(parts)
+            if stats['count']:
+                result[p] = stats
+        return result
+
+    def slice_bounds(self, start_epoch: Optional[int] = None, end_epoch: Optional[int] = None):
+        """
+        Resolve a time window to row bounds with binary search.
+
+        Returns:
+            (lo, hi) such that rows [lo, hi) have start_epoch <= timestamp < end_epoch
+        """
+        ts = self._ts[:self._size]
+        lo = 0 if start_epoch is None else int(np.searchsorted(ts, start_epoch, side='left'))
+        hi = self._size if end_epoch is None else int(np.searchsorted(ts, end_epoch, side='left'))
+        return lo, max(lo, hi)
+
+    def between(self, start_epoch: Optional[int] = None, end_epoch: Optional[int] = None) -> ColumnView:
+        """Return a view of readings with start_epoch <= timestamp < end_epoch."""
+        return self.view(*self.slice_bounds(start_epoch, end_epoch))
+
+    def between_dates(self, start_date, end_date) -> ColumnView:
+        """Return a view of readings from start_date through end_date (inclusive, whole days)."""
+        return self.between(*day_range_epochs(start_date, end_date))
+
+
+class ReadingColumnStore:
+    """
+    Per-pool columnar cache for all readings.
+
+    Readings saved before pools were tracked have no pool_id; like the JSON
+    loader, the source includes them in every pool's readings. Each pool's
+    columns are loaded from the source (e.g. ReadingPartitions.load) on
+    first use.
+    """
+
+    def __init__(self, source: Callable[[Optional[str]], List[Dict]], parameters: List[str] = PARAMETERS):
+        self.parameters = list(parameters)
+        self.source = source
+        self._pools: Dict[str, PoolColumns] = {}
+
+    def reset(self):
+        """Drop every materialized pool so the next use reloads it from the source."""
+        self._pools = {}
+
+    def is_materialized(self, pool_id: Optional[str]) -> bool:
+        """Return True if a pool's columns are already in memory."""
+        return pool_id in self._pools
+
+    def add(self, reading: Dict[str, Any]):
+        """Add a newly saved reading to every materialized pool it belongs to."""
+        pool_id = reading.get('pool_id')
+        if pool_id:
+            if pool_id in self._pools:
+                self._pools[pool_id].add(reading)
+        else:
+            for columns in self._pools.values():
+                columns.add(reading)
+
+    def pool(self, pool_id: Optional[str]) -> PoolColumns:
+        """Return the columns for a pool, materializing them on first use."""
+        if pool_id not in self._pools:
+            columns = PoolColumns(self.parameters)
+            skipped = columns.extend(self.source(pool_id))
+            if skipped:
+                logger.debug(f"Skipped {skipped} readings without a valid date for pool {pool_id}")
+            self._pools[pool_id] = columns
+        return self._pools[pool_id]
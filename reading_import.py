@@ -0,0 +1,294 @@
+"""
+Deep Blue Pool Chemistry - Bulk Reading Import
+Copyright (c) 2024 Michael Hayes. All rights reserved.
+
+This module imports historical readings from JSON, JSONL or CSV files into
+the partitioned reading store without loading the whole file:
+
+- JSON is decoded incrementally, one reading object at a time, from any of
+  the readings.json layouts (a list, {"readings": [...]} or a dict keyed by
+  pool_id); JSONL is read line by line; CSV is read in pandas chunks.
+- Each batch is validated at once with NumPy masks (reading_validation).
+- Readings are deduplicated on (pool_id, timestamp) against the file itself
+  and against the partitions they would be written to.
+- Accepted readings are written one batch at a time, so each partition
+  file and the manifest are written once per batch.
+
+Command line:
+    python reading_import.py <file> [--pool POOL_ID] [--data-dir DIR]
+"""
+
+import argparse
+import json
+import sys
+import time
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_manager import normalize_timestamp
+from reading_columns import PARAMETERS
+from reading_journal import ReadingJournal
+from reading_partitions import ReadingPartitions, reading_month, UNDATED
+from reading_validation import validate_batch, describe_errors
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+READ_SIZE = 1024 * 1024
+MAX_REPORTED_ERRORS = 20
+
+
+# ==================== STREAMING PARSERS ====================
+
+class _JsonStream:
+    """
+    Incremental JSON reader over a text file.
+
+    Values are decoded with json.JSONDecoder.raw_decode from a buffer that is
+    refilled as needed, so memory is bounded by the largest single value.
+    """
+
+    def __init__(self, f, read_size: int = READ_SIZE):
+        self.f = f
+        self.read_size = read_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.read_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ('' at end of file)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' in JSON input, found '{self.peek()}'")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number or literal cut off at the buffer edge decodes "successfully"
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def array_items(self) -> Iterator[Any]:
+        """Yield the items of the array starting at the current position."""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError(f"Expected ',' or ']' in JSON array, found '{char}'")
+
+
+def iter_json_readings(path, read_size: int = READ_SIZE) -> Iterator[Tuple[Optional[str], Any]]:
+    """
+    Stream readings from a JSON or JSONL file.
+
+    Yields:
+        (pool_id from the file layout or None, reading)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = _JsonStream(f, read_size)
+        first = stream.peek()
+        if first == '[':
+            for item in stream.array_items():
+                yield None, item
+        elif first == '{' and Path(path).suffix.lower() != '.jsonl':
+            stream.expect('{')
+            while stream.peek() not in ('}', ''):
+                key = stream.value()
+                stream.expect(':')
+                if stream.peek() == '[':
+                    pool_id = None if key == 'readings' else key
+                    for item in stream.array_items():
+                        yield pool_id, item
+                else:
+                    stream.value()  # e.g. the snapshot's "timestamp"
+                if stream.peek() == ',':
+                    stream.pos += 1
+        else:
+            # JSON Lines: one reading object per line
+            while stream.peek():
+                yield None, stream.value()
+
+
+def iter_csv_readings(path, batch_size: int = BATCH_SIZE) -> Iterator[Tuple[Optional[str], Dict[str, Any]]]:
+    """
+    Stream readings from a CSV file with a header row.
+
+    Empty cells are left out of the reading, as if the field were absent.
+
+    Yields:
+        (None, reading)
+    """
+    for frame in pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=batch_size):
+        columns = list(frame.columns)
+        for row in frame.itertuples(index=False, name=None):
+            yield None, {column: value for column, value in zip(columns, row) if value != ''}
+
+
+# ==================== IMPORTER ====================
+
+class ReadingImporter:
+    """
+    Validates, deduplicates and writes readings into ReadingPartitions in batches.
+    """
+
+    def __init__(self, partitions: ReadingPartitions, batch_size: int = BATCH_SIZE):
+        """
+        Initialize the importer.
+
+        Args:
+            partitions: Opened partition store to write into
+            batch_size: Readings validated and written per batch
+        """
+        self.partitions = partitions
+        self.batch_size = batch_size
+        self._seen: Dict[Tuple[str, str], Set[str]] = {}
+
+    def _known_timestamps(self, pool_key: str, month: str) -> Set[str]:
+        """Timestamps already stored (or imported) in one partition, loaded on first use."""
+        key = (pool_key, month)
+        if key not in self._seen:
+            self._seen[key] = {normalize_timestamp(r) for r in self.partitions.read_partition(pool_key, month)}
+        return self._seen[key]
+
+    def _process(self, batch: List[Tuple[Optional[str], Any]], pool_id: Optional[str],
+                 numeric_strings: bool, report: Dict[str, Any]):
+        readings = [reading for _, reading in batch]
+        valid, codes, values = validate_batch(readings)
+
+        for i in np.flatnonzero(~valid)[:max(0, MAX_REPORTED_ERRORS - len(report['errors']))]:
+            report['errors'].append(f"Reading {report['read'] + i + 1}: {', '.join(describe_errors(int(codes[i])))}")
+        report['invalid'] += int((~valid).sum())
+
+        accepted = []
+        for i in np.flatnonzero(valid).tolist():
+            layout_pool, reading = batch[i]
+            pool_key = reading.get('pool_id') or layout_pool or pool_id or ''
+            if pool_key:
+                reading['pool_id'] = pool_key
+            month = reading_month(reading)
+            if month == UNDATED:
+                report['undated'] += 1
+                continue
+            known = self._known_timestamps(pool_key, month)
+            ts = normalize_timestamp(reading)
+            # Readings without a pool_id (the shared partition) belong to every pool too
+            if ts in known or (pool_key and ts in self._known_timestamps('', month)):
+                report['duplicates'] += 1
+                continue
+            known.add(ts)
+            if numeric_strings:
+                for param in PARAMETERS:
+                    if param in reading:
+                        value = values[param][i]
+                        reading[param] = None if np.isnan(value) else float(value)
+            accepted.append(reading)
+
+        report['imported'] += self.partitions.extend(accepted)
+        report['read'] += len(batch)
+
+    def import_file(self, path, pool_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Import a JSON, JSONL or CSV file of readings.
+
+        Args:
+            path: File to import
+            pool_id: Pool for readings that carry no pool_id (None leaves them shared)
+
+        Returns:
+            Report with counts (read, imported, invalid, duplicates, undated),
+            elapsed seconds, readings_per_sec and the first validation errors
+        """
+        path = Path(path)
+        started = time.perf_counter()
+        report = {'file': str(path), 'read': 0, 'imported': 0, 'invalid': 0,
+                  'duplicates': 0, 'undated': 0, 'errors': []}
+
+        is_csv = path.suffix.lower() == '.csv'
+        source = iter_csv_readings(path, self.batch_size) if is_csv else iter_json_readings(path)
+        batch: List[Tuple[Optional[str], Any]] = []
+        for item in source:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._process(batch, pool_id, is_csv, report)
+                batch = []
+        if batch:
+            self._process(batch, pool_id, is_csv, report)
+
+        report['seconds'] = round(time.perf_counter() - started, 3)
+        report['readings_per_sec'] = round(report['read'] / report['seconds']) if report['seconds'] else report['read']
+        logger.info(f"Imported {report['imported']} of {report['read']} readings from {path.name} "
+                    f"({report['invalid']} invalid, {report['duplicates']} duplicates, {report['undated']} undated) "
+                    f"in {report['seconds']}s, {report['readings_per_sec']} readings/sec")
+        return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point for bulk imports."""
+    parser = argparse.ArgumentParser(description="Import historical pool readings (JSON, JSONL or CSV)")
+    parser.add_argument("files", nargs="+", help="Files to import")
+    parser.add_argument("--pool", help="Pool id for readings without a pool_id")
+    parser.add_argument("--data-dir", default="data", help="Data directory (default: data)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Readings per batch")
+    args = parser.parse_args(argv)
+
+    partitions = ReadingPartitions(Path(args.data_dir) / "readings")
+    partitions.open()
+    legacy = ReadingJournal(Path(args.data_dir) / "readings.json")
+    if partitions.needs_migration([legacy.snapshot_path, legacy.journal_path]):
+        partitions.migrate(legacy)
+    importer = ReadingImporter(partitions, args.batch_size)
+    for path in args.files:
+        report = importer.import_file(path, args.pool)
+        print(f"{path}: {report['imported']} imported, {report['duplicates']} duplicates, "
+              f"{report['invalid']} invalid, {report['undated']} undated "
+              f"({report['readings_per_sec']} readings/sec)")
+        for error in report['errors']:
+            print(f"  {error}")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Deep Blue Pool Chemistry - Reading Journal
+Copyright (c) 2024 Michael Hayes. All rights reserved.
+
+This module reads the legacy reading store: the readings.json snapshot
+plus the append-only JSONL journal that older versions saved new readings
+to. Readings now live in per-pool monthly partitions (see
+reading_partitions), which migrate these files with read_all().
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+
+class ReadingJournal:
+    """
+    Read-only view of a legacy JSON snapshot plus its JSONL journal.
+    """
+
+    def __init__(self, snapshot_path, journal_path=None):
+        """
+        Initialize the reader.
+
+        Args:
+            snapshot_path: Path to the readings.json snapshot
+            journal_path: Path to the JSONL journal (defaults to <snapshot>.journal.jsonl)
+        """
+        self.snapshot_path = Path(snapshot_path)
+        if journal_path is None:
+            journal_path = self.snapshot_path.with_name(self.snapshot_path.stem + ".journal.jsonl")
+        self.journal_path = Path(journal_path)
+
+    # ==================== LOADING ====================
+
+    def read_all(self) -> List[Dict]:
+        """
+        Read the snapshot and replay the journal on top of it.
+
+        Returns:
+            List of readings in save order
+        """
+        readings = self._read_snapshot()
+        journaled = self._read_journal()
+        readings.extend(journaled)
+        logger.info(f"Read {len(readings)} legacy readings ({len(journaled)} replayed from journal)")
+        return readings
+
+    def _read_snapshot(self) -> List[Dict]:
+        """Read the snapshot file, accepting every legacy readings.json layout."""
+        if not self.snapshot_path.exists():
+            return []
+
+        try:
+            with open(self.snapshot_path, 'r') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, PermissionError, IOError) as e:
+            logger.error(f"Error reading snapshot {self.snapshot_path}: {e}")
+            return []
+
+        # Structure 1: Direct array [{"date": "...", ...}, ...]
+        if isinstance(data, list):
+            return [r for r in data if isinstance(r, dict)]
+
+        if isinstance(data, dict):
+            # Structure 2: Dictionary with 'readings' key {"readings": [...]}
+            if 'readings' in data:
+                return [r for r in data['readings'] if isinstance(r, dict)]
+
+            # Structure 3: Dictionary where each key is a pool_id
+            readings = []
+            for pool_id, pool_readings in data.items():
+                if not isinstance(pool_readings, list):
+                    continue
+                for reading in pool_readings:
+                    if isinstance(reading, dict):
+                        reading.setdefault('pool_id', pool_id)
+                        readings.append(reading)
+            return readings
+
+        logger.warning(f"Unknown readings structure in {self.snapshot_path}: {type(data)}")
+        return []
+
+    def _read_journal(self) -> List[Dict]:
+        """Read journaled readings, ignoring a torn final line from an interrupted write."""
+        if not self.journal_path.exists():
+            return []
+
+        readings = []
+        with open(self.journal_path, 'r') as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    reading = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping corrupt journal record at {self.journal_path}:{line_no}")
+                    continue
+                if isinstance(reading, dict):
+                    readings.append(reading)
+        return readings
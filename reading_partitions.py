@@ -0,0 +1,342 @@
+"""
+Deep Blue Pool Chemistry - Partitioned Reading Store
+Copyright (c) 2024 Michael Hayes. All rights reserved.
+
+This module stores chemical readings in per-pool, per-month JSONL
+partitions:
+
+    data/readings/<pool_id>/<YYYY-MM>.jsonl
+    data/readings/manifest.json
+
+The manifest records, for every partition, its reading count, first and
+last timestamp and byte size, so loading one pool or one date range opens
+only the partitions that can contain matching readings. Readings saved
+before pools were tracked have no pool_id; they live under _shared/ and,
+like everywhere else in the application, belong to every pool.
+
+migrate() merges the legacy readings.json snapshot (any of its three
+layouts) plus its journal into the partitions, skipping readings that are
+already there, then renames them aside. Only an explicit restore of a
+pre-partition backup replaces the partitions with the legacy file.
+"""
+
+import json
+import os
+import shutil
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+from data_manager import normalize_timestamp, _day_bounds
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+SHARED_DIR = "_shared"
+UNDATED = "undated"
+MIGRATED_SUFFIX = ".migrated"
+
+
+def reading_month(reading: Dict[str, Any]) -> str:
+    """Return the YYYY-MM partition of a reading ('undated' without a usable timestamp)."""
+    ts = normalize_timestamp(reading)
+    try:
+        datetime.fromisoformat(ts)
+    except (TypeError, ValueError):
+        return UNDATED
+    return ts[:7]
+
+
+class ReadingPartitions:
+    """
+    Readings partitioned by pool and month, with a manifest of partition ranges.
+    """
+
+    def __init__(self, root):
+        """
+        Initialize the partition store.
+
+        Args:
+            root: Directory holding the pool partition directories (e.g. data/readings)
+        """
+        self.root = Path(root)
+        self.manifest_path = self.root / MANIFEST_NAME
+        self._manifest: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    # ==================== PATHS ====================
+
+    @staticmethod
+    def _pool_key(reading: Dict[str, Any]) -> str:
+        return reading.get('pool_id') or ''
+
+    def _pool_dir(self, pool_key: str) -> Path:
+        return self.root / (quote(pool_key, safe='') if pool_key else SHARED_DIR)
+
+    def _partition_path(self, pool_key: str, month: str) -> Path:
+        return self._pool_dir(pool_key) / f"{month}.jsonl"
+
+    # ==================== MANIFEST ====================
+
+    def open(self) -> int:
+        """
+        Load the manifest and reconcile it with the partition files on disk.
+
+        Partitions whose size differs from the manifest (an append that
+        landed before its manifest update, or a restored backup) are
+        rescanned; the directory walk itself only stats files.
+
+        Returns:
+            Total number of readings
+        """
+        manifest = {}
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, 'r') as f:
+                    manifest = json.load(f).get('partitions', {})
+            except (json.JSONDecodeError, OSError, AttributeError) as e:
+                logger.warning(f"Rebuilding unreadable reading manifest {self.manifest_path}: {e}")
+                manifest = {}
+
+        on_disk: Dict[Tuple[str, str], int] = {}
+        if self.root.exists():
+            for pool_dir in self.root.iterdir():
+                if not pool_dir.is_dir():
+                    continue
+                pool_key = '' if pool_dir.name == SHARED_DIR else unquote(pool_dir.name)
+                for path in pool_dir.glob("*.jsonl"):
+                    on_disk[(pool_key, path.stem)] = path.stat().st_size
+
+        self._manifest = {}
+        rescanned = 0
+        for (pool_key, month), size in on_disk.items():
+            entry = manifest.get(pool_key, {}).get(month)
+            if entry is None or entry.get('bytes') != size:
+                entry = self._scan_partition(pool_key, month)
+                rescanned += 1
+            self._manifest.setdefault(pool_key, {})[month] = entry
+
+        stale = sum(len(months) for months in manifest.values()) != len(on_disk)
+        if rescanned or stale:
+            self._write_manifest()
+        total = self.count()
+        logger.info(f"Reading partitions: {len(on_disk)} files, {total} readings ({rescanned} rescanned)")
+        return total
+
+    def _scan_partition(self, pool_key: str, month: str) -> Dict[str, Any]:
+        readings = self.read_partition(pool_key, month)
+        entry = {'count': 0, 'first': None, 'last': None, 'bytes': 0}
+        self._update_entry(entry, readings)
+        entry['bytes'] = self._partition_path(pool_key, month).stat().st_size
+        return entry
+
+    @staticmethod
+    def _update_entry(entry: Dict[str, Any], readings: List[Dict[str, Any]]):
+        for reading in readings:
+            ts = normalize_timestamp(reading)
+            entry['count'] += 1
+            if entry['first'] is None or ts < entry['first']:
+                entry['first'] = ts
+            if entry['last'] is None or ts > entry['last']:
+                entry['last'] = ts
+
+    def _write_manifest(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': 1, 'partitions': self._manifest}, f, indent=1, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.manifest_path)
+
+    def pools(self) -> List[str]:
+        """Return the pool ids that have readings (excluding untagged readings)."""
+        return sorted(pool_key for pool_key in self._manifest if pool_key)
+
+    def count(self, pool_id: Optional[str] = None) -> int:
+        """Return the number of readings for a pool (including shared readings), or in total."""
+        keys = self._manifest.keys() if pool_id is None else ('', pool_id)
+        return sum(entry['count'] for key in keys for entry in self._manifest.get(key, {}).values())
+
+    def partitions(self, pool_id: Optional[str] = None, start_date=None,
+                   end_date=None) -> List[Tuple[str, str]]:
+        """
+        List the (pool, month) partitions that can hold readings in a window.
+
+        Args:
+            pool_id: Pool to select (its own plus shared partitions), None for every pool
+            start_date: First day (date, datetime or None for unbounded)
+            end_date: Last day (date, datetime or None for unbounded)
+        """
+        start = start_date.strftime('%Y-%m') if start_date is not None else None
+        end = end_date.strftime('%Y-%m') if end_date is not None else None
+        keys = sorted(self._manifest) if pool_id is None else ['', pool_id]
+
+        selected = []
+        for pool_key in keys:
+            for month in sorted(self._manifest.get(pool_key, {})):
+                if month == UNDATED:
+                    if start is None and end is None:
+                        selected.append((pool_key, month))
+                elif (start is None or month >= start) and (end is None or month <= end):
+                    selected.append((pool_key, month))
+        return selected
+
+    # ==================== LOADING ====================
+
+    def read_partition(self, pool_key: str, month: str) -> List[Dict[str, Any]]:
+        """Read one partition, ignoring a torn final line from an interrupted write."""
+        path = self._partition_path(pool_key, month)
+        if not path.exists():
+            return []
+
+        readings = []
+        with open(path, 'r') as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    reading = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping corrupt reading at {path}:{line_no}")
+                    continue
+                if isinstance(reading, dict):
+                    readings.append(reading)
+        return readings
+
+    def load(self, pool_id: Optional[str] = None, start_date=None, end_date=None) -> List[Dict[str, Any]]:
+        """
+        Load readings for a pool and inclusive date range.
+
+        Args:
+            pool_id: Pool to load (its own plus shared readings), None for every pool
+            start_date: First day (date, datetime or None for unbounded)
+            end_date: Last day (date, datetime or None for unbounded)
+
+        Returns:
+            Readings sorted oldest first
+        """
+        readings = []
+        for pool_key, month in self.partitions(pool_id, start_date, end_date):
+            readings.extend(self.read_partition(pool_key, month))
+
+        if start_date is not None or end_date is not None:
+            start = _day_bounds(start_date, start_date)[0] if start_date is not None else ''
+            end = _day_bounds(end_date, end_date)[1] if end_date is not None else '\uffff'
+            readings = [r for r in readings if start <= normalize_timestamp(r) < end]
+
+        readings.sort(key=normalize_timestamp)
+        return readings
+
+    # ==================== APPENDING ====================
+
+    def extend(self, readings: Iterable[Dict[str, Any]]) -> int:
+        """
+        Durably append readings to their partitions and update the manifest once.
+
+        Args:
+            readings: Reading dictionaries to persist
+
+        Returns:
+            Number of readings written
+        """
+        groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for reading in readings:
+            if isinstance(reading, dict):
+                groups.setdefault((self._pool_key(reading), reading_month(reading)), []).append(reading)
+
+        written = 0
+        try:
+            for (pool_key, month), group in sorted(groups.items()):
+                path = self._partition_path(pool_key, month)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                payload = "".join(json.dumps(r, separators=(',', ':'), default=str) + "\n" for r in group)
+                with open(path, 'a') as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                entry = self._manifest.setdefault(pool_key, {}).setdefault(
+                    month, {'count': 0, 'first': None, 'last': None, 'bytes': 0})
+                self._update_entry(entry, group)
+                entry['bytes'] = path.stat().st_size
+                written += len(group)
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Error appending readings to partitions: {e}")
+        finally:
+            if written:
+                self._write_manifest()
+        return written
+
+    def append(self, reading: Dict[str, Any]) -> bool:
+        """
+        Durably append a single reading.
+
+        Returns:
+            True if the reading reached disk
+        """
+        return self.extend([reading]) == 1
+
+    # ==================== MIGRATION ====================
+
+    def needs_migration(self, legacy_paths: Iterable[Path]) -> bool:
+        """A legacy file still in place means it has not been migrated (or was restored)."""
+        return any(Path(path).exists() for path in legacy_paths)
+
+    def migrate(self, journal, replace: bool = False) -> int:
+        """
+        Merge the legacy readings.json snapshot and its journal into partitions.
+
+        Readings whose (pool, timestamp) is already partitioned are skipped, so
+        a legacy file that reappears (copied back in, or extracted from an old
+        backup) never removes readings saved since the first migration, and an
+        interrupted migration simply runs again. The legacy files are renamed
+        to *.migrated only after the manifest is written.
+
+        Args:
+            journal: ReadingJournal over the legacy snapshot
+            replace: Delete the existing partitions first (only for an explicit
+                     restore of a backup taken before partitioning)
+
+        Returns:
+            Number of readings migrated
+        """
+        readings = journal.read_all()
+
+        if replace:
+            if self.root.exists():
+                for pool_dir in self.root.iterdir():
+                    if pool_dir.is_dir():
+                        shutil.rmtree(pool_dir, ignore_errors=True)
+            self._manifest = {}
+
+        # (pool, timestamp) of every reading already in the partitions the legacy readings fall into
+        seen = set()
+        for pool_key, month in {(self._pool_key(r), reading_month(r)) for r in readings if isinstance(r, dict)}:
+            if month in self._manifest.get(pool_key, {}):
+                seen.update((pool_key, normalize_timestamp(r)) for r in self.read_partition(pool_key, month))
+        fresh = []
+        for reading in readings:
+            if not isinstance(reading, dict):
+                continue
+            key = (self._pool_key(reading), normalize_timestamp(reading))
+            if key in seen:
+                continue
+            seen.add(key)
+            fresh.append(reading)
+
+        written = self.extend(fresh)
+        if written != len(fresh):
+            raise OSError(f"Migrated only {written} of {len(fresh)} readings")
+        if not written:
+            self._write_manifest()
+
+        for path in (journal.snapshot_path, journal.journal_path):
+            if path.exists():
+                os.replace(path, path.with_name(path.name + MIGRATED_SUFFIX))
+        logger.info(f"Migrated {written} legacy readings into {len(self.partitions())} partitions "
+                    f"({len(readings) - written} already present)")
+        return written
@@ -0,0 +1,328 @@
+"""
+Deep Blue Pool Chemistry - Daily and Weekly Reading Rollups
+Copyright (c) 2024 Michael Hayes. All rights reserved.
+
+This module keeps downsampled tables of a pool's readings: one row per
+local day (or per week starting Monday) with, for every parameter, the
+count, mean, min, max, standard deviation, first and last value of the
+readings in that bucket. A Rollup is loaded from the pool's sorted columns
+in one vectorized pass and then updated in O(1) per saved reading, so long
+ranges ("All Time", multi-year reports) can be charted and summarized from
+a few hundred bucket rows instead of every raw reading.
+
+choose_resolution() picks raw readings, daily or weekly buckets for a
+requested span, and combine() merges bucket rows (and raw edge rows) into
+exact count/mean/variance/min/max over any range.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Days per bucket of each resolution
+RESOLUTIONS = {'daily': 1, 'weekly': 7}
+
+# Most points a chart should draw before a coarser resolution is used
+MAX_POINTS = 400
+
+# Ranges whose in-range share reports show (per-bucket 'in_range' counts use them)
+REPORT_RANGES = {
+    'ph': (7.2, 7.8),
+    'free_chlorine': (1.0, 3.0),
+    'total_chlorine': (1.0, 3.0),
+    'alkalinity': (80, 120),
+    'calcium_hardness': (200, 400),
+    'cyanuric_acid': (30, 50),
+    'salt': (2700, 3400),
+    'temperature': (78, 104)
+}
+
+# Per-parameter arrays of a rollup (std is derived from m2)
+FIELDS = ('count', 'mean', 'm2', 'min', 'max', 'first', 'last', 'first_ts', 'last_ts', 'in_range')
+
+
+def _midnight(day) -> int:
+    return int(datetime.combine(day, datetime.min.time()).timestamp())
+
+
+def _bucket_day(epoch: float, resolution: str):
+    day = datetime.fromtimestamp(epoch).date()
+    if resolution == 'weekly':
+        day -= timedelta(days=day.weekday())
+    return day
+
+
+def bucket_start(epoch: float, resolution: str) -> int:
+    """Return the epoch of the local midnight starting epoch's day (or Monday for weekly)."""
+    return _midnight(_bucket_day(epoch, resolution))
+
+
+def bucket_edges(first_epoch: float, last_epoch: float, resolution: str) -> np.ndarray:
+    """Return the start of every bucket from first_epoch's through last_epoch's, plus the end of the last."""
+    step = timedelta(days=RESOLUTIONS[resolution])
+    day = _bucket_day(first_epoch, resolution)
+    last_day = _bucket_day(last_epoch, resolution)
+    edges = []
+    while day <= last_day:
+        edges.append(_midnight(day))
+        day += step
+    edges.append(_midnight(day))
+    return np.asarray(edges, dtype=np.int64)
+
+
+def choose_resolution(start_epoch: float, end_epoch: float, rows: int, max_points: int = MAX_POINTS) -> str:
+    """
+    Pick the finest resolution that keeps a range within max_points.
+
+    Args:
+        start_epoch: Start of the requested span
+        end_epoch: End of the requested span
+        rows: Raw readings in the span
+        max_points: Most points wanted
+
+    Returns:
+        'raw', 'daily' or 'weekly'
+    """
+    if rows <= max_points:
+        return 'raw'
+    days = max(0.0, end_epoch - start_epoch) / 86400.0
+    for resolution, bucket_days in RESOLUTIONS.items():
+        if days / bucket_days <= max_points:
+            return resolution
+    return 'weekly'
+
+
+def bucket_summary(values: np.ndarray, parameter: Optional[str] = None) -> Dict[str, float]:
+    """Return one bucket-style part (count, mean, m2, min, max, in_range) for raw values."""
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return {'count': 0, 'mean': 0.0, 'm2': 0.0, 'min': np.nan, 'max': np.nan, 'in_range': 0}
+    mean = float(values.mean())
+    in_range = 0
+    if parameter in REPORT_RANGES:
+        low, high = REPORT_RANGES[parameter]
+        in_range = int(np.count_nonzero((values >= low) & (values <= high)))
+    return {'count': len(values), 'mean': mean, 'm2': float(((values - mean) ** 2).sum()),
+            'min': float(values.min()), 'max': float(values.max()), 'in_range': in_range}
+
+
+def combine(parts: List[Dict[str, np.ndarray]]) -> Dict[str, float]:
+    """
+    Merge bucket rows into count, mean, m2, min, max and in_range (Chan et al.).
+
+    Args:
+        parts: Dicts of equally long arrays (or scalars) with 'count', 'mean', 'm2',
+               'min', 'max' and 'in_range'; rows with a zero count are ignored
+    """
+    count = np.concatenate([np.atleast_1d(p['count']) for p in parts]).astype(np.float64)
+    keep = count > 0
+    count = count[keep]
+    if not len(count):
+        return {'count': 0, 'mean': np.nan, 'm2': 0.0, 'min': np.nan, 'max': np.nan, 'in_range': 0}
+
+    def stack(field: str) -> np.ndarray:
+        return np.concatenate([np.atleast_1d(p[field]) for p in parts]).astype(np.float64)[keep]
+
+    means = stack('mean')
+    total = count.sum()
+    mean = float((count * means).sum() / total)
+    # Within-bucket sums of squares plus the spread of the bucket means
+    m2 = float(stack('m2').sum() + (count * (means - mean) ** 2).sum())
+    return {
+        'count': int(total),
+        'mean': mean,
+        'm2': m2,
+        'min': float(np.nanmin(stack('min'))),
+        'max': float(np.nanmax(stack('max'))),
+        'in_range': int(stack('in_range').sum())
+    }
+
+
+class RollupTable:
+    """
+    Bucket rows of a rollup over a range, oldest first.
+    """
+
+    def __init__(self, resolution: str, starts: np.ndarray, ends: np.ndarray,
+                 fields: Dict[str, Dict[str, np.ndarray]]):
+        self.resolution = resolution
+        self.starts = starts
+        self.ends = ends
+        self.fields = fields
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def datetimes(self) -> List[datetime]:
+        """Return each bucket's start as a local datetime."""
+        return [datetime.fromtimestamp(ts) for ts in self.starts.tolist()]
+
+    def field(self, param: str, name: str = 'mean') -> np.ndarray:
+        """
+        Return one field of one parameter for every bucket (NaN where the bucket has no value).
+
+        Args:
+            param: Parameter name
+            name: 'count', 'mean', 'min', 'max', 'std' (sample), 'first' or 'last'
+        """
+        fields = self.fields.get(param)
+        if fields is None:
+            return np.full(len(self.starts), np.nan)
+        if name == 'std':
+            count = fields['count']
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return np.where(count > 1, np.sqrt(fields['m2'] / (count - 1)),
+                                np.where(count == 1, 0.0, np.nan))
+        if name == 'count':
+            return fields['count']
+        return np.where(fields['count'] > 0, fields[name], np.nan)
+
+
+class Rollup:
+    """
+    Daily or weekly buckets of one pool's readings, updated incrementally.
+    """
+
+    def __init__(self, resolution: str, parameters: List[str]):
+        """
+        Initialize an empty rollup.
+
+        Args:
+            resolution: 'daily' or 'weekly'
+            parameters: Parameters to keep per bucket
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown rollup resolution: {resolution}")
+        self.resolution = resolution
+        self.parameters = list(parameters)
+        self.starts = np.empty(0, dtype=np.int64)
+        self.ends = np.empty(0, dtype=np.int64)
+        self.fields = {p: self._empty(0) for p in self.parameters}
+
+    @staticmethod
+    def _empty(size: int) -> Dict[str, np.ndarray]:
+        fields = {name: np.full(size, np.nan) for name in ('mean', 'min', 'max', 'first', 'last')}
+        fields.update({name: np.zeros(size, dtype=np.int64) for name in ('count', 'in_range')})
+        fields.update({name: np.zeros(size, dtype=np.int64) for name in ('first_ts', 'last_ts')})
+        fields['m2'] = np.zeros(size)
+        return fields
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def load(self, timestamps: np.ndarray, columns: Dict[str, np.ndarray]):
+        """
+        Build every bucket from sorted history in one vectorized pass.
+
+        Args:
+            timestamps: Epoch seconds, ascending
+            columns: Parameter -> float64 values per row (NaN where missing)
+        """
+        if not len(timestamps):
+            self.__init__(self.resolution, self.parameters)
+            return
+        edges = bucket_edges(timestamps[0], timestamps[-1], self.resolution)
+        used, rows_bucket = np.unique(np.searchsorted(edges, timestamps, side='right') - 1, return_inverse=True)
+        self.starts = edges[used]
+        self.ends = edges[used + 1]
+        size = len(used)
+
+        for p in self.parameters:
+            fields = self._empty(size)
+            col = columns[p]
+            present = ~np.isnan(col)
+            x = col[present]
+            if len(x):
+                b = rows_bucket[present]
+                t = timestamps[present]
+                count = np.bincount(b, minlength=size)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    mean = np.bincount(b, weights=x, minlength=size) / count
+                fields['count'] = count
+                fields['mean'] = mean
+                fields['m2'] = np.bincount(b, weights=(x - mean[b]) ** 2, minlength=size)
+                # Rows are sorted, so each bucket's values are contiguous
+                group_starts = np.flatnonzero(np.r_[True, b[1:] != b[:-1]])
+                group_ends = np.r_[group_starts[1:], len(x)] - 1
+                groups = b[group_starts]
+                fields['min'][groups] = np.minimum.reduceat(x, group_starts)
+                fields['max'][groups] = np.maximum.reduceat(x, group_starts)
+                fields['first'][groups] = x[group_starts]
+                fields['first_ts'][groups] = t[group_starts]
+                fields['last'][groups] = x[group_ends]
+                fields['last_ts'][groups] = t[group_ends]
+                if p in REPORT_RANGES:
+                    low, high = REPORT_RANGES[p]
+                    fields['in_range'] = np.bincount(b, weights=(x >= low) & (x <= high),
+                                                     minlength=size).astype(np.int64)
+            self.fields[p] = fields
+
+    def _bucket(self, epoch: float) -> int:
+        """Index of epoch's bucket, inserting an empty bucket if needed."""
+        start = bucket_start(epoch, self.resolution)
+        i = int(np.searchsorted(self.starts, start))
+        if i < len(self.starts) and self.starts[i] == start:
+            return i
+        end = int(bucket_edges(start, start, self.resolution)[-1])
+        self.starts = np.insert(self.starts, i, start)
+        self.ends = np.insert(self.ends, i, end)
+        empty = self._empty(1)
+        for p in self.parameters:
+            self.fields[p] = {name: np.insert(values, i, empty[name][0]) for name, values in self.fields[p].items()}
+        return i
+
+    def add(self, epoch: int, values: Dict[str, float]):
+        """Add one reading (any timestamp order) to its bucket."""
+        i = self._bucket(epoch)
+        for p, x in values.items():
+            if p not in self.fields or x != x:  # NaN
+                continue
+            fields = self.fields[p]
+            count = int(fields['count'][i])
+            if count == 0:
+                fields['mean'][i], fields['m2'][i] = x, 0.0
+                fields['min'][i] = fields['max'][i] = x
+                fields['first'][i] = fields['last'][i] = x
+                fields['first_ts'][i] = fields['last_ts'][i] = epoch
+            else:
+                delta = x - fields['mean'][i]
+                fields['mean'][i] += delta / (count + 1)
+                fields['m2'][i] += delta * (x - fields['mean'][i])
+                fields['min'][i] = min(fields['min'][i], x)
+                fields['max'][i] = max(fields['max'][i], x)
+                if epoch < fields['first_ts'][i]:
+                    fields['first'][i], fields['first_ts'][i] = x, epoch
+                if epoch >= fields['last_ts'][i]:
+                    fields['last'][i], fields['last_ts'][i] = x, epoch
+            fields['count'][i] = count + 1
+            if p in REPORT_RANGES:
+                low, high = REPORT_RANGES[p]
+                fields['in_range'][i] += int(low <= x <= high)
+
+    def bounds(self, start_epoch: Optional[float] = None, end_epoch: Optional[float] = None,
+               whole: bool = False) -> Tuple[int, int]:
+        """
+        Resolve a time window to bucket indices [lo, hi).
+
+        Args:
+            whole: Only buckets entirely inside the window (otherwise every overlapping bucket)
+        """
+        if whole:
+            lo = 0 if start_epoch is None else int(np.searchsorted(self.starts, start_epoch, side='left'))
+            hi = len(self) if end_epoch is None else int(np.searchsorted(self.ends, end_epoch, side='right'))
+        else:
+            lo = 0 if start_epoch is None else int(np.searchsorted(self.ends, start_epoch, side='right'))
+            hi = len(self) if end_epoch is None else int(np.searchsorted(self.starts, end_epoch, side='left'))
+        return lo, max(lo, hi)
+
+    def table(self, start_epoch: Optional[float] = None, end_epoch: Optional[float] = None) -> RollupTable:
+        """Return the buckets overlapping [start_epoch, end_epoch)."""
+        lo, hi = self.bounds(start_epoch, end_epoch)
+        return RollupTable(self.resolution, self.starts[lo:hi], self.ends[lo:hi],
+                           {p: {name: values[lo:hi] for name, values in fields.items()}
+                            for p, fields in self.fields.items()})
@@ -0,0 +1,177 @@
+"""
+Deep Blue Pool Chemistry - Batch Reading Validation
+Copyright (c) 2024 Michael Hayes. All rights reserved.
+
+This module applies the rules of PoolAnalyticsEngineV2.validate_reading to
+a whole batch of readings at once. Each parameter is converted to a
+float64 column with pandas, the range rules become NumPy masks, and every
+row gets an int64 bit set of error codes. The same pass yields the column
+block used by the columnar reading cache, so cached views carry their
+validity with them. Error messages (with the same wording as
+validate_reading) are only built for rows that are actually displayed.
+"""
+
+import logging
+from collections.abc import Sequence as SequenceABC
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+PARAMETERS = [
+    'ph', 'free_chlorine', 'total_chlorine',
+    'alkalinity', 'calcium_hardness', 'cyanuric_acid',
+    'temperature', 'bromine', 'salt'
+]
+
+REQUIRED_FIELDS = ('ph', 'free_chlorine', 'total_chlorine')
+MAX_VALUE = 10000
+
+# Three bits per parameter (in PARAMETERS order), then the row-level checks
+NOT_NUMERIC, NEGATIVE, TOO_LARGE = 0, 1, 2
+PH_RANGE = 1 << (3 * len(PARAMETERS))
+TEMPERATURE_RANGE = PH_RANGE << 1
+BAD_DATE = PH_RANGE << 2
+NOT_A_DICT = PH_RANGE << 3
+MISSING_SHIFT = 3 * len(PARAMETERS) + 4
+
+
+def param_bit(param: str, kind: int) -> int:
+    """Return the error bit for one parameter check (NOT_NUMERIC, NEGATIVE or TOO_LARGE)."""
+    return 1 << (3 * PARAMETERS.index(param) + kind)
+
+
+def missing_bit(field: str) -> int:
+    """Return the error bit for a missing required field."""
+    return 1 << (MISSING_SHIFT + REQUIRED_FIELDS.index(field))
+
+
+def describe_errors(code: int) -> List[str]:
+    """
+    Expand an error code into validate_reading's messages, in its order.
+
+    Args:
+        code: Bit set returned by validate_batch for one row
+
+    Returns:
+        List of error messages (empty for a valid row)
+    """
+    if code & NOT_A_DICT:
+        return ["Reading must be a dictionary"]
+
+    errors = [f"Missing required field: {field}" for field in REQUIRED_FIELDS if code & missing_bit(field)]
+    for param in PARAMETERS:
+        if code & param_bit(param, NOT_NUMERIC):
+            errors.append(f"{param}: Invalid type (must be numeric)")
+            continue
+        if code & param_bit(param, NEGATIVE):
+            errors.append(f"{param}: Negative value not allowed")
+        elif code & param_bit(param, TOO_LARGE):
+            errors.append(f"{param}: Value too large (max 10000)")
+        if param == 'ph' and code & PH_RANGE:
+            errors.append("pH must be between 0 and 14")
+        elif param == 'temperature' and code & TEMPERATURE_RANGE:
+            errors.append("Temperature must be between 32°F and 120°F")
+    if code & BAD_DATE:
+        errors.append("Invalid date format (use YYYY-MM-DD)")
+    return errors
+
+
+def _numeric_column(raw: List[Any], present: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert one parameter to float64.
+
+    Returns:
+        (values, not_numeric) where values is NaN wherever the parameter is
+        absent or not convertible by float()
+    """
+    values = pd.to_numeric(pd.Series(raw, dtype=object), errors='coerce').to_numpy(dtype=np.float64)
+    not_numeric = present & np.isnan(values)
+    if not_numeric.any():
+        # A NaN float is numeric as far as validate_reading is concerned
+        for i in np.flatnonzero(not_numeric):
+            value = raw[i]
+            if isinstance(value, (int, float)) or (isinstance(value, str) and value.strip().lower() == 'nan'):
+                not_numeric[i] = False
+    return values, not_numeric
+
+
+def validate_batch(readings: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Validate many readings at once with the rules of validate_reading.
+
+    Args:
+        readings: Reading dictionaries (other objects are flagged NOT_A_DICT)
+
+    Returns:
+        (valid, codes, values): a boolean mask, an int64 error bit set per
+        row, and the float64 column of every parameter (NaN where absent)
+    """
+    n = len(readings)
+    codes = np.zeros(n, dtype=np.int64)
+    is_dict = np.fromiter((isinstance(r, dict) for r in readings), dtype=bool, count=n)
+    codes[~is_dict] |= NOT_A_DICT
+    rows = [r if isinstance(r, dict) else {} for r in readings]
+
+    for field in REQUIRED_FIELDS:
+        present = np.fromiter((field in r for r in rows), dtype=bool, count=n)
+        codes[is_dict & ~present] |= missing_bit(field)
+
+    values: Dict[str, np.ndarray] = {}
+    for param in PARAMETERS:
+        present = np.fromiter((param in r for r in rows), dtype=bool, count=n)
+        if not present.any():
+            values[param] = np.full(n, np.nan)
+            continue
+        column, not_numeric = _numeric_column([r.get(param) for r in rows], present)
+        values[param] = column
+        codes[not_numeric] |= param_bit(param, NOT_NUMERIC)
+
+        checked = present & ~not_numeric
+        with np.errstate(invalid='ignore'):
+            codes[checked & (column < 0)] |= param_bit(param, NEGATIVE)
+            codes[checked & (column > MAX_VALUE)] |= param_bit(param, TOO_LARGE)
+            if param == 'ph':
+                codes[checked & ((column < 0) | (column > 14))] |= PH_RANGE
+            elif param == 'temperature':
+                codes[checked & ((column < 32) | (column > 120))] |= TEMPERATURE_RANGE
+
+    dates = [r.get('date') for r in rows]
+    is_str = np.fromiter((isinstance(d, str) for d in dates), dtype=bool, count=n)
+    if is_str.any():
+        parsed = pd.to_datetime(pd.Series([d if isinstance(d, str) else None for d in dates], dtype=object),
+                                format='%Y-%m-%d', errors='coerce')
+        codes[is_str & parsed.isna().to_numpy()] |= BAD_DATE
+
+    return codes == 0, codes, values
+
+
+class ValidationErrors(SequenceABC):
+    """
+    Lazy list of "Reading N: ..." messages for the invalid rows of a batch.
+
+    Behaves like the list of strings clean_and_validate_data used to
+    return, but a message is only formatted when it is read.
+    """
+
+    def __init__(self, codes: np.ndarray):
+        self.codes = codes
+        self.rows = np.flatnonzero(codes)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        row = int(self.rows[index])
+        return f"Reading {row + 1}: {', '.join(describe_errors(int(self.codes[row])))}"
+
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"ValidationErrors({len(self)} invalid readings)"
@@ -0,0 +1,257 @@
+"""
+Deep Blue Pool Chemistry - Running Window Statistics
+Copyright (c) 2024 Michael Hayes. All rights reserved.
+
+This module keeps the analytics dashboard's per-parameter statistics
+(count, current, min, max, mean and standard deviation) for the fixed
+windows Today, Last 7/30/90 Days and All Time, without rescanning the
+history on every refresh:
+
+- mean and variance use Welford's running update (count, mean, M2), which
+  can also be reversed to remove a value when it leaves the window;
+- min and max use monotonic queues, so eviction stays amortized O(1);
+- readings are evicted from the front of each window as "now" moves on.
+
+A WindowStats is first loaded from the pool's columns in one vectorized
+pass; after that each new reading costs O(1) per window.
+"""
+
+import math
+import time
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+DAY = 86400
+
+
+def _start_of_today(now: float) -> float:
+    return datetime.combine(datetime.fromtimestamp(now).date(), datetime.min.time()).timestamp()
+
+
+# Window name (as shown in the analytics range selector) -> first epoch inside it, given now
+WINDOWS: Dict[str, Optional[Callable[[float], float]]] = {
+    "Today": _start_of_today,
+    "Last 7 Days": lambda now: int(now - 7 * DAY),
+    "Last 30 Days": lambda now: int(now - 30 * DAY),
+    "Last 90 Days": lambda now: int(now - 90 * DAY),
+    "All Time": None
+}
+
+
+class RunningStats:
+    """
+    Welford accumulator for count, mean and M2 that supports removals.
+    """
+
+    __slots__ = ('count', 'mean', 'm2')
+
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, x: float):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def remove(self, x: float):
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        delta = x - self.mean
+        self.count -= 1
+        self.mean -= delta / self.count
+        self.m2 = max(0.0, self.m2 - delta * (x - self.mean))
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (0 for fewer than two values)."""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+class WindowStats:
+    """
+    Running statistics of every parameter over one time window.
+    """
+
+    def __init__(self, parameters: Sequence[str], start_of: Optional[Callable[[float], float]]):
+        """
+        Initialize an empty window.
+
+        Args:
+            parameters: Parameter names, in the order values are passed
+            start_of: Returns the window's first epoch for a given now (None: never evict)
+        """
+        self.parameters = list(parameters)
+        self.start_of = start_of
+        self.stats = [RunningStats() for _ in self.parameters]
+        self.last = [math.nan] * len(self.parameters)
+        # (seq, value) with increasing values for min / decreasing values for max
+        self.mins = [deque() for _ in self.parameters]
+        self.maxs = [deque() for _ in self.parameters]
+        # (epoch, seq, values) of every row still inside the window
+        self.rows = deque()
+        self.seq = 0
+
+    def load(self, timestamps: np.ndarray, values: np.ndarray, now: float):
+        """
+        Fill the window from sorted history in one vectorized pass.
+
+        Args:
+            timestamps: Epoch seconds, ascending
+            values: (rows x parameters) float64, NaN where missing
+            now: Current epoch seconds
+        """
+        if self.start_of is not None:
+            first = int(np.searchsorted(timestamps, self.start_of(now), side='left'))
+            timestamps, values = timestamps[first:], values[first:]
+        seqs = np.arange(self.seq, self.seq + len(timestamps))
+        self.seq += len(timestamps)
+        if self.start_of is not None:
+            self.rows.extend(zip(timestamps.tolist(), seqs.tolist(), values.tolist()))
+
+        for i in range(len(self.parameters)):
+            col = values[:, i]
+            present = np.flatnonzero(~np.isnan(col))
+            if not len(present):
+                continue
+            x = col[present]
+            mean = float(x.mean())
+            self.stats[i] = RunningStats(len(x), mean, float(((x - mean) ** 2).sum()))
+            self.last[i] = float(x[-1])
+            # Monotonic queues hold the values that are a strict min (max) of everything after them
+            after_min = np.append(np.minimum.accumulate(x[::-1])[::-1][1:], np.inf)
+            after_max = np.append(np.maximum.accumulate(x[::-1])[::-1][1:], -np.inf)
+            keep = np.flatnonzero(x < after_min)
+            self.mins[i] = deque(zip(seqs[present[keep]].tolist(), x[keep].tolist()))
+            keep = np.flatnonzero(x > after_max)
+            self.maxs[i] = deque(zip(seqs[present[keep]].tolist(), x[keep].tolist()))
+
+    def add(self, epoch: float, values: Sequence[float]):
+        """Add the newest reading (values in parameter order, NaN where missing)."""
+        seq = self.seq
+        self.seq += 1
+        if self.start_of is not None:
+            self.rows.append((epoch, seq, list(values)))
+        for i, x in enumerate(values):
+            if x != x:  # NaN
+                continue
+            self.stats[i].add(x)
+            self.last[i] = x
+            mins, maxs = self.mins[i], self.maxs[i]
+            while mins and mins[-1][1] >= x:
+                mins.pop()
+            mins.append((seq, x))
+            while maxs and maxs[-1][1] <= x:
+                maxs.pop()
+            maxs.append((seq, x))
+
+    def evict(self, now: float):
+        """Drop readings that are older than the window's start."""
+        if self.start_of is None:
+            return
+        start = self.start_of(now)
+        while self.rows and self.rows[0][0] < start:
+            _, seq, values = self.rows.popleft()
+            for i, x in enumerate(values):
+                if x != x:
+                    continue
+                self.stats[i].remove(x)
+                if self.mins[i] and self.mins[i][0][0] == seq:
+                    self.mins[i].popleft()
+                if self.maxs[i] and self.maxs[i][0][0] == seq:
+                    self.maxs[i].popleft()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Return statistics for every parameter with at least one value in the window.
+
+        Returns:
+            {param: {'count', 'current', 'min', 'max', 'mean', 'std'}}
+        """
+        result = {}
+        for i, param in enumerate(self.parameters):
+            stats = self.stats[i]
+            if not stats.count:
+                continue
+            result[param] = {
+                'count': stats.count,
+                'current': self.last[i],
+                'min': self.mins[i][0][1],
+                'max': self.maxs[i][0][1],
+                'mean': stats.mean,
+                'std': stats.std
+            }
+        return result
+
+
+class PoolRunningStats:
+    """
+    WindowStats for each of the dashboard's fixed windows.
+    """
+
+    def __init__(self, parameters: Sequence[str], windows: Dict[str, Optional[Callable[[float], float]]] = WINDOWS):
+        self.parameters = list(parameters)
+        self.windows = {name: WindowStats(self.parameters, start_of) for name, start_of in windows.items()}
+        self.last_epoch = -math.inf
+        # Set when a back-dated reading arrives; the owner reloads from history
+        self.stale = False
+
+    def load(self, timestamps: np.ndarray, values: np.ndarray, now: Optional[float] = None):
+        """Fill every window from sorted history (see WindowStats.load)."""
+        now = time.time() if now is None else now
+        for window in self.windows.values():
+            window.load(timestamps, values, now)
+        if len(timestamps):
+            self.last_epoch = float(timestamps[-1])
+
+    def add(self, epoch: float, values: Sequence[float], now: Optional[float] = None):
+        """Add a reading; one older than the newest seen so far marks the stats stale."""
+        if epoch < self.last_epoch:
+            self.stale = True
+            return
+        self.last_epoch = epoch
+        now = time.time() if now is None else now
+        for window in self.windows.values():
+            if window.start_of is None or epoch >= window.start_of(now):
+                window.add(epoch, values)
+
+    def summary(self, window: str, now: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        """Evict aged-out readings and return one window's statistics (see WindowStats.summary)."""
+        stats = self.windows[window]
+        stats.evict(time.time() if now is None else now)
+        return stats.summary()
+
+
+def summarize_values(columns: Dict[str, np.ndarray], parameters: List[str]) -> Dict[str, Dict[str, float]]:
+    """
+    Compute the same statistics as WindowStats.summary directly from columns.
+
+    Used for ranges that are not one of the fixed windows (custom dates).
+    """
+    result = {}
+    for param in parameters:
+        col = columns.get(param)
+        if col is None:
+            continue
+        values = col[~np.isnan(col)]
+        if not len(values):
+            continue
+        result[param] = {
+            'count': len(values),
+            'current': float(values[-1]),
+            'min': float(values.min()),
+            'max': float(values.max()),
+            'mean': float(values.mean()),
+            'std': float(values.std(ddof=1)) if len(values) > 1 else 0.0
+        }
+    return result
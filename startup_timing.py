@@ -0,0 +1,108 @@
+"""
+Deep Blue Pool Chemistry - Startup Timing
+Copyright (c) 2024 Michael Hayes. All rights reserved.
+
+This module records how long each startup phase takes, measured from the
+moment main_app began importing, and the work that was moved off the
+startup path (the ML import and saved-model loading, now done by a
+background warm-up). The report compares the time until the main window
+was ready with the cold start the application had when that work still
+ran before the window: the ready time plus the deferred work.
+
+Each report is appended to logs/startup_timing.json so successive starts
+can be compared.
+"""
+
+import json
+import os
+import time
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Reports kept in the history file
+HISTORY_LIMIT = 20
+
+
+class StartupTimer:
+    """
+    Startup phase marks plus the background work deferred past the first window.
+    """
+
+    def __init__(self, started: Optional[float] = None):
+        """
+        Initialize the timer.
+
+        Args:
+            started: time.perf_counter() value at process start (defaults to now)
+        """
+        self.started = time.perf_counter() if started is None else started
+        self.marks: Dict[str, float] = {}
+        self.deferred: Dict[str, float] = {}
+
+    def mark(self, phase: str):
+        """Record that a startup phase finished (seconds since start)."""
+        self.marks[phase] = time.perf_counter() - self.started
+        logger.info(f"Startup: {phase} at {self.marks[phase]:.2f}s")
+
+    def defer(self, work: str, seconds: float):
+        """Record work that now runs after startup and how long it took."""
+        self.deferred[work] = seconds
+
+    def report(self, ready_phase: str) -> Dict[str, Any]:
+        """
+        Summarize startup against the eager cold start.
+
+        Args:
+            ready_phase: Mark at which the main window was ready for use
+
+        Returns:
+            'phases', 'deferred', 'ready' seconds, 'eager_estimate' seconds
+            (ready plus all deferred work), 'saved' seconds and 'saved_pct'
+        """
+        ready = self.marks.get(ready_phase, 0.0)
+        deferred = sum(self.deferred.values())
+        eager = ready + deferred
+        return {
+            'recorded_at': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'phases': {phase: round(seconds, 3) for phase, seconds in self.marks.items()},
+            'deferred': {work: round(seconds, 3) for work, seconds in self.deferred.items()},
+            'ready': round(ready, 3),
+            'eager_estimate': round(eager, 3),
+            'saved': round(deferred, 3),
+            'saved_pct': round(100.0 * deferred / eager, 1) if eager > 0 else 0.0
+        }
+
+    @staticmethod
+    def format(report: Dict[str, Any]) -> str:
+        """Render a report as plain text for logs and dialogs."""
+        lines = ["Startup phases (seconds since launch):"]
+        lines += [f"  {phase:<28} {seconds:6.2f}s" for phase, seconds in report['phases'].items()]
+        if report['deferred']:
+            lines.append("Deferred to background warm-up:")
+            lines += [f"  {work:<28} {seconds:6.2f}s" for work, seconds in report['deferred'].items()]
+        lines.append(f"Main window ready after {report['ready']:.2f}s; "
+                     f"with eager ML loading it would take ~{report['eager_estimate']:.2f}s "
+                     f"(saved {report['saved']:.2f}s, {report['saved_pct']:.0f}%)")
+        return "\n".join(lines)
+
+    def save(self, report: Dict[str, Any], path):
+        """Append a report to a JSON history file, keeping the latest HISTORY_LIMIT entries."""
+        path = Path(path)
+        try:
+            history = json.loads(path.read_text()) if path.exists() else []
+            if not isinstance(history, list):
+                history = []
+        except (json.JSONDecodeError, OSError):
+            history = []
+        history = (history + [report])[-HISTORY_LIMIT:]
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(path.name + ".tmp")
+            tmp_path.write_text(json.dumps(history, indent=2))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write startup timing to {path}: {e}")
@@ -0,0 +1,148 @@
+"""
+Deep Blue Pool Chemistry - Closed-Form Trend Regression
+Copyright (c) 2024 Michael Hayes. All rights reserved.
+
+This module fits straight-line trends with the least-squares formulas
+
+    slope     = (n*Sxy - Sx*Sy) / (n*Sxx - Sx^2)
+    intercept = (Sy - slope*Sx) / n
+    R^2       = 1 - SS_res / SS_tot
+
+computed from column sums of a (readings x parameters) array, so every
+parameter is fitted in one NumPy pass and missing values (NaN) are simply
+masked out of the sums.
+
+rolling_trends() fits one line per window ending at each row. The sums of
+every window come from prefix sums, so a whole trend series costs O(n)
+however many windows it has, instead of one regression per window.
+"""
+
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+
+def _solve(n, sx, sy, sxx, sxy, syy) -> Dict[str, np.ndarray]:
+    """Slope, intercept and R^2 from regression sums (any matching shapes)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sxx_c = sxx - sx * sx / n
+        sxy_c = sxy - sx * sy / n
+        syy_c = syy - sy * sy / n
+        slope = np.where(sxx_c > 0, sxy_c / sxx_c, 0.0)
+        intercept = (sy - slope * sx) / n
+        ss_res = np.maximum(syy_c - slope * sxy_c, 0.0)
+        # A constant series is fitted perfectly (r2_score gives 1.0 there too)
+        r2 = np.where(syy_c > 1e-12 * np.maximum(syy, 1.0), 1.0 - ss_res / syy_c, 1.0)
+    return {'slope': slope, 'intercept': intercept, 'r2': r2}
+
+
+def fit_trends(Y: np.ndarray, horizon: int = 7) -> Dict[str, np.ndarray]:
+    """
+    Fit a linear trend to every column of Y against its valid-value index.
+
+    Each column is regressed on 0, 1, 2, ... over its own non-NaN values
+    (exactly as if the column's valid values were fitted on their own).
+
+    Args:
+        Y: (readings x parameters) array, oldest first, NaN where missing
+        horizon: Steps ahead to forecast
+
+    Returns:
+        Per column: 'n', 'slope', 'intercept', 'r2', 'current' (last valid
+        value) and 'forecast' (horizon x columns); NaN for columns with
+        fewer than two values
+    """
+    Y = np.asarray(Y, dtype=np.float64)
+    if Y.ndim == 1:
+        Y = Y[:, None]
+    mask = np.isfinite(Y)
+    n = mask.sum(axis=0).astype(np.float64)
+    x = np.where(mask, np.cumsum(mask, axis=0) - 1, 0).astype(np.float64)
+    y = np.where(mask, Y, 0.0)
+
+    # Centre y on its column mean so the sums stay well conditioned
+    offset = y.sum(axis=0) / np.maximum(n, 1)
+    yc = np.where(mask, y - offset, 0.0)
+
+    fit = _solve(n, x.sum(axis=0), yc.sum(axis=0), (x * x).sum(axis=0),
+                 (x * yc).sum(axis=0), (yc * yc).sum(axis=0))
+    fit['intercept'] = fit['intercept'] + offset
+
+    current = np.full(Y.shape[1], np.nan)
+    if len(Y):
+        last_row = len(Y) - 1 - np.argmax(mask[::-1], axis=0)
+        current = np.where(n > 0, Y[last_row, np.arange(Y.shape[1])], np.nan)
+
+    steps = n[None, :] + np.arange(horizon)[:, None]
+    forecast = fit['intercept'][None, :] + fit['slope'][None, :] * steps
+
+    too_few = n < 2
+    for key in ('slope', 'intercept', 'r2'):
+        fit[key] = np.where(too_few, np.nan, fit[key])
+    fit['forecast'] = np.where(too_few[None, :], np.nan, forecast)
+    fit['n'] = n.astype(int)
+    fit['current'] = current
+    return fit
+
+
+def rolling_trends(Y: np.ndarray, x: Optional[np.ndarray] = None, window: int = 7,
+                   span: Optional[float] = None, min_points: int = 3) -> Dict[str, np.ndarray]:
+    """
+    Fit a linear trend over the window ending at every row.
+
+    Args:
+        Y: (readings x parameters) array (or one column), oldest first, NaN where missing
+        x: Position of each row, ascending (e.g. days since the first reading); defaults to 0..n-1
+        window: Rows per window when span is None
+        span: Width of each window in x units (rows with x > x_i - span); overrides window
+        min_points: Fewest valid values for a window to be fitted
+
+    Returns:
+        'slope', 'intercept', 'r2', 'n' and 'fitted' (the trend line's value
+        at each row's x), shaped like Y; NaN where a window has too few values
+    """
+    Y = np.asarray(Y, dtype=np.float64)
+    squeeze = Y.ndim == 1
+    if squeeze:
+        Y = Y[:, None]
+    rows = len(Y)
+    x = np.arange(rows, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+
+    if span is None:
+        starts = np.maximum(np.arange(rows) - window + 1, 0)
+    else:
+        starts = np.searchsorted(x, x - span, side='right')
+    ends = np.arange(1, rows + 1)
+
+    mask = np.isfinite(Y)
+    # Centre x and y so the prefix-sum differences keep their precision
+    xc = (x - x.mean()) if rows else x
+    xc = np.where(mask, xc[:, None], 0.0)
+    count = mask.sum(axis=0)
+    offset = np.where(mask, Y, 0.0).sum(axis=0) / np.maximum(count, 1)
+    yc = np.where(mask, Y - offset, 0.0)
+
+    def window_sums(values: np.ndarray) -> np.ndarray:
+        prefix = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)])
+        return prefix[ends] - prefix[starts]
+
+    n = window_sums(mask.astype(np.float64))
+    fit = _solve(n, window_sums(xc), window_sums(yc), window_sums(xc * xc),
+                 window_sums(xc * yc), window_sums(yc * yc))
+
+    x_shift = x.mean() if rows else 0.0
+    fitted = fit['intercept'] + fit['slope'] * (x[:, None] - x_shift) + offset
+    # Back to the caller's x origin
+    fit['intercept'] = fit['intercept'] - fit['slope'] * x_shift + offset
+
+    too_few = n < max(min_points, 2)
+    result = {key: np.where(too_few, np.nan, fit[key]) for key in ('slope', 'intercept', 'r2')}
+    result['fitted'] = np.where(too_few, np.nan, fitted)
+    result['n'] = n.astype(int)
+    if squeeze:
+        result = {key: value[:, 0] for key, value in result.items()}
+    return result